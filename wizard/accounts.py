@@ -1,10 +1,11 @@
 from pathlib import Path
-from typing import Optional, Protocol
+from typing import Iterator, Optional, Protocol
 
 from multiversx_sdk import Account, Address, LedgerAccount, Message
 from multiversx_sdk.core.interfaces import IAccount
 
 from wizard import ux
+from wizard.addresses import ADDRESS_TABLE
 from wizard.errors import BadConfigurationError, KnownError
 from wizard.wallets_configuration import (KeystoresWalletEntry,
                                           KeystoreWalletEntry,
@@ -24,29 +25,36 @@ class IMyAccount(IAccount, Protocol):
 
 
 class AccountWrapper:
+    __slots__ = ("wallet_name", "account", "guardian", "address")
+
     def __init__(self, wallet_name: str, account: IMyAccount, guardian: Optional[Address] = None) -> None:
         self.wallet_name = wallet_name
         self.account = account
         self.guardian = guardian
+        # Interned, thus cheap to convert to bech32, over and over again.
+        self.address = ADDRESS_TABLE.intern(account.address)
 
 
 def load_accounts(wallets_configuration_file: Path) -> list[AccountWrapper]:
+    wrappers = list(iterate_accounts(wallets_configuration_file))
+    return deduplicate_accounts(wrappers)
+
+
+# Accounts are yielded as soon as they are loaded (e.g. keystores are decrypted one by one),
+# so that callers can start network requests for the first accounts while the rest are still loading.
+def iterate_accounts(wallets_configuration_file: Path) -> Iterator[AccountWrapper]:
     configuration = WalletsConfiguration.new_from_file(wallets_configuration_file)
-    wrappers: list[AccountWrapper] = []
 
     for index, entry in enumerate(configuration.entries):
         ux.show_message(f"Loading accounts from wallet entry #{index} [yellow]{entry.name}[/yellow]...")
         try:
-            accounts = load_accounts_from_wallet_entry(entry)
-            wrappers.extend([AccountWrapper(entry.name, account) for account in accounts])
+            for account in load_accounts_from_wallet_entry(entry):
+                yield AccountWrapper(entry.name, account)
         except Exception as error:
             raise KnownError(f"could not load accounts from wallet entry #{index} [yellow]{entry.name}[/yellow]", error)
 
-    wrappers = deduplicate_accounts(wrappers)
-    return wrappers
 
-
-def load_accounts_from_wallet_entry(entry: WalletEntry) -> list[IMyAccount]:
+def load_accounts_from_wallet_entry(entry: WalletEntry) -> Iterator[IMyAccount]:
     if isinstance(entry, MnemonicWalletEntry):
         return load_accounts_from_mnemonic(entry)
     if isinstance(entry, KeystoreWalletEntry):
@@ -61,7 +69,7 @@ def load_accounts_from_wallet_entry(entry: WalletEntry) -> list[IMyAccount]:
     raise KnownError(f"unknown wallet entry: {entry.kind}")
 
 
-def load_accounts_from_mnemonic(entry: MnemonicWalletEntry) -> list[IMyAccount]:
+def load_accounts_from_mnemonic(entry: MnemonicWalletEntry) -> Iterator[IMyAccount]:
     print("Loading accounts from mnemonic...")
 
     mnemonic = entry.mnemonic
@@ -80,18 +88,13 @@ def load_accounts_from_mnemonic(entry: MnemonicWalletEntry) -> list[IMyAccount]:
     if not mnemonic:
         raise BadConfigurationError("mnemonic is empty")
 
-    accounts: list[IMyAccount] = []
-
     for index in address_indices:
         account = Account.new_from_mnemonic(mnemonic, index)
-        accounts.append(account)
-
         print(f"\t{account.address}")
-
-    return accounts
+        yield account
 
 
-def load_accounts_from_keystore(entry: KeystoreWalletEntry) -> list[IMyAccount]:
+def load_accounts_from_keystore(entry: KeystoreWalletEntry) -> Iterator[IMyAccount]:
     file = entry.file
     password = entry.password
     password_file = entry.password_file
@@ -112,25 +115,20 @@ def load_accounts_from_keystore(entry: KeystoreWalletEntry) -> list[IMyAccount]:
         raise BadConfigurationError("password is empty")
 
     file_path = Path(file).expanduser().resolve()
-    accounts: list[IMyAccount] = []
 
     if address_indices:
         for index in address_indices:
             account = Account.new_from_keystore(file_path, password, index)
-            accounts.append(account)
-
             print(f"\t{account.address}")
+            yield account
     else:
         # Maybe legacy keystores (with kind = secretKey)
         account = Account.new_from_keystore(file_path, password)
-        accounts.append(account)
-
         print(f"\t{account.address}")
+        yield account
 
-    return accounts
 
-
-def load_accounts_from_keystores(entry: KeystoresWalletEntry) -> list[IMyAccount]:
+def load_accounts_from_keystores(entry: KeystoresWalletEntry) -> Iterator[IMyAccount]:
     folder = entry.folder
     unique_password = entry.unique_password
     unique_password_file = entry.unique_password_file
@@ -151,47 +149,33 @@ def load_accounts_from_keystores(entry: KeystoresWalletEntry) -> list[IMyAccount
 
     folder_path = Path(folder).expanduser().resolve()
     keystore_paths = folder_path.glob("*.json")
-    accounts: list[IMyAccount] = []
 
     for path in keystore_paths:
         account = Account.new_from_keystore(path, unique_password)
-        accounts.append(account)
-
         print(f"\t{account.address}")
-
-    return accounts
+        yield account
 
 
-def load_accounts_from_pem(entry: PEMWalletEntry) -> list[IMyAccount]:
+def load_accounts_from_pem(entry: PEMWalletEntry) -> Iterator[IMyAccount]:
     file = entry.file
     address_indices = entry.address_indices or [0]
 
     if not file:
         raise BadConfigurationError("'file' must be set")
 
-    accounts: list[IMyAccount] = []
-
     for index in address_indices:
         account = Account.new_from_pem(Path(file), index)
-        accounts.append(account)
-
         print(f"\t{account.address}")
+        yield account
 
-    return accounts
 
-
-def load_accounts_from_ledger(entry: LedgerWalletEntry) -> list[IMyAccount]:
+def load_accounts_from_ledger(entry: LedgerWalletEntry) -> Iterator[IMyAccount]:
     address_indices = entry.address_indices or [0]
 
-    accounts: list[IMyAccount] = []
-
     for index in address_indices:
         account = LedgerAccount(index)
-        accounts.append(account)
-
         print(f"\t{account.address}")
-
-    return accounts
+        yield account
 
 
 def deduplicate_accounts(wrappers: list[AccountWrapper]) -> list[AccountWrapper]:
@@ -199,7 +183,7 @@ def deduplicate_accounts(wrappers: list[AccountWrapper]) -> list[AccountWrapper]
     addresses: set[str] = set()
 
     for wrapper in wrappers:
-        address = wrapper.account.address.to_bech32()
+        address = wrapper.address.to_bech32()
 
         if address in addresses:
             continue
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from multiversx_sdk import Address, LibraryConfig
+
+
+# An address that computes its bech32 representation only once.
+# Also hashable (by public key), so that it can be used in sets and as a dictionary key.
+class CachedAddress(Address):
+    def __init__(self, pubkey: bytes, hrp: Optional[str] = None, bech32: str = "") -> None:
+        super().__init__(pubkey, hrp)
+        self._bech32 = bech32
+
+    def to_bech32(self) -> str:
+        if not self._bech32:
+            self._bech32 = super().to_bech32()
+        return self._bech32
+
+    def __hash__(self) -> int:
+        return hash(self.pubkey)
+
+
+# Interns addresses, so that each distinct address is decoded (and encoded) only once, and shared by all records.
+class AddressTable:
+    def __init__(self) -> None:
+        self._by_bech32: dict[str, CachedAddress] = {}
+        # Keyed by (public key, hrp): the same public key under another hrp is another address.
+        self._by_pubkey: dict[tuple[bytes, str], CachedAddress] = {}
+
+    def get_by_bech32(self, value: str) -> CachedAddress:
+        address = self._by_bech32.get(value)
+        if address is not None:
+            return address
+
+        decoded = Address.new_from_bech32(value)
+        return self._learn(CachedAddress(decoded.pubkey, decoded.hrp, value))
+
+    def get_by_pubkey(self, pubkey: bytes) -> CachedAddress:
+        address = self._by_pubkey.get((pubkey, LibraryConfig.default_address_hrp))
+        if address is not None:
+            return address
+
+        return self._learn(CachedAddress(pubkey))
+
+    def intern(self, address: Address) -> CachedAddress:
+        if isinstance(address, CachedAddress):
+            return address
+
+        existing = self._by_pubkey.get((address.pubkey, address.hrp))
+        if existing is not None:
+            return existing
+
+        return self._learn(CachedAddress(address.pubkey, address.hrp))
+
+    def _learn(self, address: CachedAddress) -> CachedAddress:
+        # "setdefault()" is atomic: if two threads race, both get the same (first) instance.
+        address = self._by_pubkey.setdefault((address.pubkey, address.hrp), address)
+        self._by_bech32.setdefault(address.to_bech32(), address)
+        return address
+
+    def __len__(self) -> int:
+        return len(self._by_pubkey)
+
+
+ADDRESS_TABLE = AddressTable()
+
+
+def address_from_bech32(value: str) -> CachedAddress:
+    return ADDRESS_TABLE.get_by_bech32(value)
@@ -0,0 +1,72 @@
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Any, Callable
+
+from multiversx_sdk import Account, KeyPair, VoteType
+from multiversx_sdk.abi import BigUIntValue, BytesValue, StringValue, U64Value
+from rich import print
+
+from wizard.accounts import AccountWrapper
+from wizard.addresses import address_from_bech32
+from wizard.configuration import CONFIGURATIONS
+from wizard.entrypoint import MyEntrypoint
+from wizard.signing import defer_signing
+
+
+def main(cli_args: list[str] = sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument("--num-transactions", type=int, default=10_000, help="number of transactions to build")
+    parser.add_argument("--num-senders", type=int, default=100, help="number of distinct senders")
+    args = parser.parse_args(cli_args)
+
+    num_transactions = args.num_transactions
+    num_senders = args.num_senders
+
+    configuration = CONFIGURATIONS["devnet"]
+    entrypoint = MyEntrypoint(configuration)
+    contract = configuration.legacy_delegation_contract
+    proposal = 42
+    vote = VoteType.YES
+    gas_price = 1_000_000_000
+    proof = bytes(range(32)) * 8
+
+    # Signing is deferred (thus, not measured): here, we are only interested in building the transactions.
+    senders = [AccountWrapper(f"sender {i}", Account(KeyPair.generate().get_secret_key())) for i in range(num_senders)]
+    defer_signing(senders)
+    senders_of_transactions = [senders[i % num_senders] for i in range(num_transactions)]
+
+    # Replica of the former builder: a new controller for each transaction, arguments encoded for each transaction.
+    def build_one_by_one():
+        for sender in senders_of_transactions:
+            controller = entrypoint.network_entrypoint.create_smart_contract_controller()
+            controller.create_transaction_for_execute(
+                sender=sender.account,
+                nonce=sender.account.get_nonce_then_increment(),
+                contract=address_from_bech32(contract),
+                gas_limit=100_000_000,
+                function="delegate_vote",
+                arguments=[U64Value(proposal), StringValue(vote.value), BigUIntValue(1_000_000), BytesValue(proof)],
+                gas_price=gas_price,
+                guardian=sender.guardian
+            )
+
+    def build_batch():
+        items = [(sender, 1_000_000, proof) for sender in senders_of_transactions]
+        entrypoint.vote_via_liquid_staking_many(items, contract, proposal, vote, gas_price)
+
+    print(f"Transactions: {num_transactions}, distinct senders: {num_senders}")
+    _measure("one by one (new controller, arguments encoded each time)", num_transactions, build_one_by_one)
+    _measure("batch (cached controller, constant arguments encoded once)", num_transactions, build_batch)
+
+
+def _measure(title: str, num_transactions: int, func: Callable[[], Any]):
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+
+    print(f"{title}: [yellow]{duration:.3f} s[/yellow], [yellow]{duration / num_transactions * 1_000_000:.1f} µs[/yellow] per transaction")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from typing import Any, Callable
+
+from multiversx_sdk import Address, Token, TokenTransfer
+from rich import print
+
+from wizard.addresses import AddressTable
+from wizard.transfers import MyTransfer
+
+
+# Replica of the former (plain, "__dict__" based) representation, used as a reference.
+class PlainTransfer:
+    def __init__(self, sender: Address, label: str, token_transfer: TokenTransfer) -> None:
+        self.sender = sender
+        self.label = label
+        self.token_transfer = token_transfer
+
+
+def main(cli_args: list[str] = sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument("--num-entries", type=int, default=100_000, help="number of records")
+    parser.add_argument("--num-senders", type=int, default=10_000, help="number of distinct senders")
+    args = parser.parse_args(cli_args)
+
+    num_entries = args.num_entries
+    num_senders = args.num_senders
+
+    senders = [Address(os.urandom(32)).to_bech32() for _ in range(num_senders)]
+    data = [{"sender": senders[i % num_senders], "label": "foo", "amount": i} for i in range(num_entries)]
+
+    def load_plain():
+        transfers = [PlainTransfer(Address.new_from_bech32(item["sender"]), item["label"], TokenTransfer(Token("EGLD-000000"), item["amount"])) for item in data]
+        by_sender = {item.sender.to_bech32(): item for item in transfers}
+        return transfers, by_sender
+
+    def load_compact():
+        table = AddressTable()
+        transfers = [MyTransfer(table.get_by_bech32(item["sender"]), item["label"], TokenTransfer(Token("EGLD-000000"), item["amount"])) for item in data]
+        by_sender = {item.sender.to_bech32(): item for item in transfers}
+        return transfers, by_sender
+
+    print(f"Records: {num_entries}, distinct senders: {num_senders}")
+    _measure("plain records, addresses decoded & encoded each time", load_plain)
+    _measure("slotted records, interned addresses", load_compact)
+
+
+def _measure(title: str, func: Callable[[], Any]):
+    # Tracing allocations slows things down considerably, thus we time a separate (untraced) run.
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{title}: [yellow]{duration:.3f} s[/yellow], retained memory [yellow]{retained / 1024 / 1024:.1f} MB[/yellow], peak memory [yellow]{peak / 1024 / 1024:.1f} MB[/yellow]")
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,66 @@
+import json
+import sys
+import traceback
+from argparse import ArgumentParser
+from pathlib import Path
+
+from rich import print
+
+from wizard import errors, ux
+from wizard.bundles import iterate_bundle, load_bundle_header
+from wizard.configuration import CONFIGURATIONS
+from wizard.constants import (BUNDLE_BROADCAST_WINDOW,
+                              DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS)
+from wizard.entrypoint import MyEntrypoint
+from wizard.errors import UsageError
+
+
+def main(cli_args: list[str] = sys.argv[1:]):
+    try:
+        _do_main(cli_args)
+    except errors.KnownError as err:
+        ux.show_critical_error(traceback.format_exc())
+        ux.show_critical_error(err.get_pretty())
+        return 1
+
+
+def _do_main(cli_args: list[str]):
+    parser = ArgumentParser()
+    parser.add_argument("--network", choices=CONFIGURATIONS.keys(), required=True, help="network name")
+    parser.add_argument("--infile", required=True, help="bundle of signed transactions (see '--bundle' of the other commands)")
+    parser.add_argument("--window", type=int, default=BUNDLE_BROADCAST_WINDOW, help="max. number of transactions in flight (sent, but not yet completed)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS, help="number of transactions sent at once")
+    parser.add_argument("--outfile", help="where to save the outcome (status of each transaction), as JSON")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
+    args = parser.parse_args(cli_args)
+
+    network = args.network
+    configuration = CONFIGURATIONS[network]
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
+
+    infile_path = Path(args.infile).expanduser().resolve()
+    outfile_path = Path(args.outfile).expanduser().resolve() if args.outfile else None
+    if outfile_path and outfile_path.exists():
+        raise UsageError("'output file' should not be an existing file")
+
+    header = load_bundle_header(infile_path)
+    if header.get("chainID") != configuration.chain_id:
+        raise UsageError(f"bundle is for chain {header.get('chainID')}, not for {configuration.chain_id}")
+
+    ux.confirm_continuation(f"Ready to broadcast [green]{header.get('numTransactions')}[/green] transaction(s), from {infile_path}?")
+
+    statuses = entrypoint.broadcast_bundle(iterate_bundle(infile_path), args.window, args.chunk_size)
+    num_successful = sum(1 for _, status in statuses if status == "success")
+
+    print(f"Completed: {len(statuses)}, successful: [green]{num_successful}[/green], not successful: [red]{len(statuses) - num_successful}[/red].")
+
+    if outfile_path:
+        outfile_path.parent.mkdir(parents=True, exist_ok=True)
+        data = [{"hash": entry.hash, "label": entry.label, "status": status} for entry, status in statuses]
+        outfile_path.write_text(json.dumps(data, indent=4))
+        ux.show_message(f"File saved: {outfile_path}")
+
+
+if __name__ == "__main__":
+    ret = main(sys.argv[1:])
+    sys.exit(ret)
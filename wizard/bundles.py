@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+from multiversx_sdk import Transaction, TransactionComputer
+
+from wizard.errors import KnownError
+from wizard.transactions import TransactionWrapper
+
+# A bundle holds signed (and cosigned, if necessary) transactions, ready to be broadcasted (possibly, by another machine).
+# Format: JSON lines; a header, followed by one line per transaction (with its hash precomputed).
+BUNDLE_FORMAT = "mx-bulk-ops-wizard/bundle/v1"
+
+
+class BundleEntry:
+    __slots__ = ("transaction", "label", "hash")
+
+    def __init__(self, transaction: Transaction, label: str, hash: str) -> None:
+        self.transaction = transaction
+        self.label = label
+        self.hash = hash
+
+    @classmethod
+    def new_from_dictionary(cls, data: dict[str, Any]):
+        transaction = Transaction.new_from_dictionary(data["transaction"])
+        label = data.get("label", "")
+        hash = data["hash"]
+
+        return cls(transaction, label, hash)
+
+    def to_dictionary(self) -> dict[str, Any]:
+        return {
+            "hash": self.hash,
+            "label": self.label,
+            "transaction": self.transaction.to_dictionary()
+        }
+
+
+def save_bundle(path: Path, chain_id: str, wrappers: list[TransactionWrapper]):
+    header = {"format": BUNDLE_FORMAT, "chainID": chain_id, "numTransactions": len(wrappers)}
+
+    with open(path, "w") as file:
+        file.write(json.dumps(header) + "\n")
+
+        for wrapper in wrappers:
+            entry = BundleEntry(wrapper.transaction, wrapper.label, wrapper.get_hash())
+            file.write(json.dumps(entry.to_dictionary()) + "\n")
+
+
+def load_bundle_header(path: Path) -> dict[str, Any]:
+    with open(path) as file:
+        header = json.loads(file.readline() or "{}")
+
+    if header.get("format") != BUNDLE_FORMAT:
+        raise KnownError(f"not a bundle (or unsupported format): {path}")
+
+    return header
+
+
+def iterate_bundle(path: Path, verify_hashes: bool = True) -> Iterator[BundleEntry]:
+    load_bundle_header(path)
+    transaction_computer = TransactionComputer()
+
+    with open(path) as file:
+        # Skip the header.
+        file.readline()
+
+        for line_number, line in enumerate(file, start=2):
+            if not line.strip():
+                continue
+
+            entry = BundleEntry.new_from_dictionary(json.loads(line))
+
+            if verify_hashes and transaction_computer.compute_transaction_hash(entry.transaction).hex() != entry.hash:
+                raise KnownError(f"bad hash in bundle {path}, line {line_number}: {entry.hash}")
+
+            yield entry
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+from multiversx_sdk import Address, Transaction
+
+from wizard.bundles import iterate_bundle, load_bundle_header, save_bundle
+from wizard.errors import KnownError
+from wizard.transactions import TransactionWrapper
+
+
+def create_wrappers() -> list[TransactionWrapper]:
+    sender = Address(bytes([1]) * 32)
+    receiver = Address(bytes([2]) * 32)
+
+    return [
+        TransactionWrapper(Transaction(sender=sender, receiver=receiver, gas_limit=50_000, chain_id="D", nonce=nonce, value=nonce, signature=bytes([nonce]) * 64), f"transfer #{nonce}")
+        for nonce in range(5)
+    ]
+
+
+def test_save_then_iterate(tmp_path: Path):
+    path = tmp_path / "bundle.jsonl"
+    wrappers = create_wrappers()
+    save_bundle(path, "D", wrappers)
+
+    assert load_bundle_header(path)["numTransactions"] == len(wrappers)
+
+    entries = list(iterate_bundle(path))
+    assert [entry.label for entry in entries] == [wrapper.label for wrapper in wrappers]
+    assert [entry.hash for entry in entries] == [wrapper.get_hash() for wrapper in wrappers]
+    assert [entry.transaction.signature for entry in entries] == [wrapper.transaction.signature for wrapper in wrappers]
+
+
+def test_iterate_with_bad_hash(tmp_path: Path):
+    path = tmp_path / "bundle.jsonl"
+    save_bundle(path, "D", create_wrappers())
+
+    lines = path.read_text().splitlines()
+    entry = json.loads(lines[2])
+    entry["transaction"]["value"] = "1000"
+    lines[2] = json.dumps(entry)
+    path.write_text("\n".join(lines) + "\n")
+
+    with pytest.raises(KnownError):
+        list(iterate_bundle(path))
+
+    assert len(list(iterate_bundle(path, verify_hashes=False))) == 5
+
+
+def test_load_not_a_bundle(tmp_path: Path):
+    path = tmp_path / "bundle.jsonl"
+    path.write_text('{"format": "something else"}\n')
+
+    with pytest.raises(KnownError):
+        load_bundle_header(path)
@@ -3,14 +3,17 @@ import traceback
 from argparse import ArgumentParser
 from pathlib import Path
 
+from multiversx_sdk import Address
 from rich import print
 
 from wizard import errors, ux
-from wizard.accounts import load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DEFAULT_GAS_PRICE
 from wizard.entrypoint import MyEntrypoint
 from wizard.guardians import AuthApp
+from wizard.rewards import ClaimableRewards
+from wizard.signing import defer_signing, sign_transactions
 from wizard.transactions import TransactionWrapper
 from wizard.utils import format_native_amount
 
@@ -31,41 +34,55 @@ def _do_main(cli_args: list[str]):
     parser.add_argument("--threshold", type=int, default=0, help="claim rewards larger than this amount")
     parser.add_argument("--gas-price", type=int, default=DEFAULT_GAS_PRICE, help="gas price")
     parser.add_argument("--auth", required=True, help="auth registration file")
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
     configuration = CONFIGURATIONS[network]
-    entrypoint = MyEntrypoint(configuration)
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
+
+    claimable_rewards_by_address: dict[str, list[ClaimableRewards]] = {}
+
+    def prefetch_claimable_rewards(wrapper: AccountWrapper):
+        address = wrapper.account.address
+        claimable_rewards_by_address[address.to_bech32()] = entrypoint.get_claimable_rewards(address)
+
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets), prefetch=prefetch_claimable_rewards)
     threshold = args.threshold
     gas_price = args.gas_price
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
-    transactions_wrappers: list[TransactionWrapper] = []
+    defer_signing(accounts_wrappers)
+    claims: list[tuple[AccountWrapper, Address]] = []
 
     ux.show_message("Looking for rewards to claim...")
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
-        label = account_wrapper.wallet_name
+        address = account_wrapper.address
 
         print(address.to_bech32(), f"([yellow]{account_wrapper.wallet_name}[/yellow])")
 
-        claimable_rewards = entrypoint.get_claimable_rewards(address)
+        claimable_rewards = claimable_rewards_by_address[address.to_bech32()]
 
         for item in claimable_rewards:
             if item.amount < threshold:
                 continue
 
             print(f"\tClaim {format_native_amount(item.amount)} from {item.staking_provider.to_bech32()}")
-            transaction = entrypoint.claim_rewards(account_wrapper, item.staking_provider, gas_price)
-            transactions_wrappers.append(TransactionWrapper(transaction, label))
+            claims.append((account_wrapper, item.staking_provider))
+
+    transactions = entrypoint.claim_rewards_many(claims, gas_price)
+    transactions_wrappers = [TransactionWrapper(transaction, delegator.wallet_name) for transaction, (delegator, _) in zip(transactions, claims)]
+
+    sign_transactions(accounts_wrappers, transactions_wrappers)
 
     ux.confirm_continuation(f"Ready to claim rewards, by sending [green]{len(transactions_wrappers)}[/green] transactions?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ from pathlib import Path
 from rich import print
 
 from wizard import errors, ux
-from wizard.accounts import load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DEFAULT_GAS_PRICE
 from wizard.entrypoint import MyEntrypoint
@@ -31,30 +31,37 @@ def _do_main(cli_args: list[str]):
     parser.add_argument("--threshold", type=int, default=0, help="claim rewards larger than this amount")
     parser.add_argument("--gas-price", type=int, default=DEFAULT_GAS_PRICE, help="gas price")
     parser.add_argument("--auth", required=True, help="auth registration file")
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
     configuration = CONFIGURATIONS[network]
-    entrypoint = MyEntrypoint(configuration)
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
+
+    claimable_rewards_by_address: dict[str, int] = {}
+
+    def prefetch_claimable_rewards(wrapper: AccountWrapper):
+        address = wrapper.account.address
+        claimable_rewards_by_address[address.to_bech32()] = entrypoint.get_claimable_rewards_legacy(address)
+
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets), prefetch=prefetch_claimable_rewards)
     threshold = args.threshold
     gas_price = args.gas_price
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
     transactions_wrappers: list[TransactionWrapper] = []
 
     ux.show_message("Looking for rewards to claim...")
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
 
         print(address.to_bech32(), f"([yellow]{label}[/yellow])")
 
-        claimable_rewards = entrypoint.get_claimable_rewards_legacy(address)
+        claimable_rewards = claimable_rewards_by_address[address.to_bech32()]
 
         if claimable_rewards < threshold:
             continue
@@ -64,7 +71,10 @@ def _do_main(cli_args: list[str]):
         transactions_wrappers.append(TransactionWrapper(transaction, label))
 
     ux.confirm_continuation(f"Ready to claim rewards, by sending [green]{len(transactions_wrappers)}[/green] transactions?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_multiple(auth_app, transactions_wrappers, preflight=args.preflight)
 
 
 if __name__ == "__main__":
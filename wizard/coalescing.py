@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from wizard.constants import REQUEST_CACHE_TTL_RULES
+
+
+# Identical requests (same URL) issued concurrently (e.g. by the workers of a pool) share a single network call ("singleflight").
+# Some results are also reused for a short while (see "REQUEST_CACHE_TTL_RULES"); others are only shared while in flight.
+# Results are shared as they are: callers must not mutate them.
+class RequestCoalescer:
+    def __init__(self) -> None:
+        self.num_requests = 0
+        self.num_coalesced = 0
+        self.num_cache_hits = 0
+
+        self._in_flight: dict[str, Future[Any]] = {}
+        self._cache: dict[str, tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, fetch: Callable[[], Any], ttl_seconds: float = 0) -> Any:
+        with self._lock:
+            self.num_requests += 1
+            now = time.monotonic()
+
+            cached = self._cache.get(key)
+            if cached is not None and now < cached[1]:
+                self.num_cache_hits += 1
+                return cached[0]
+
+            future = self._in_flight.get(key)
+            is_leader = future is None
+
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.num_coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as error:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            if ttl_seconds:
+                self._cache[key] = (value, time.monotonic() + ttl_seconds)
+
+        future.set_result(value)
+        return value
+
+    def get_num_saved(self) -> int:
+        return self.num_coalesced + self.num_cache_hits
+
+
+def get_request_cache_ttl(route: str) -> float:
+    # E.g. "tokens/WEGLD-bd4d79" matches, "accounts/erd1.../tokens/WEGLD-bd4d79" does not.
+    for prefix, ttl_seconds in REQUEST_CACHE_TTL_RULES:
+        if route.startswith(prefix):
+            return ttl_seconds
+
+    return 0
+
+
+REQUEST_COALESCER = RequestCoalescer()
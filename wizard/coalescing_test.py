@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from wizard.coalescing import RequestCoalescer, get_request_cache_ttl
+
+
+def test_concurrent_requests_share_one_call():
+    coalescer = RequestCoalescer()
+    num_calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        nonlocal num_calls
+        num_calls += 1
+        started.set()
+        release.wait()
+        return {"value": 42}
+
+    results: list[object] = []
+    leader = threading.Thread(target=lambda: results.append(coalescer.get("a", fetch)))
+    leader.start()
+    started.wait()
+
+    followers = [threading.Thread(target=lambda: results.append(coalescer.get("a", fetch))) for _ in range(8)]
+    for follower in followers:
+        follower.start()
+
+    # Give the followers the chance to join the call in flight.
+    time.sleep(0.1)
+    release.set()
+
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert num_calls == 1
+    assert results == [{"value": 42}] * 9
+    assert coalescer.num_coalesced == 8
+
+
+def test_results_are_cached_only_with_ttl():
+    coalescer = RequestCoalescer()
+
+    assert coalescer.get("a", lambda: 1) == 1
+    assert coalescer.get("a", lambda: 2) == 2
+    assert coalescer.get("a", lambda: 3, ttl_seconds=60) == 3
+    assert coalescer.get("a", lambda: 4, ttl_seconds=60) == 3
+    assert coalescer.num_cache_hits == 1
+
+
+def test_errors_are_not_cached():
+    coalescer = RequestCoalescer()
+
+    def fail():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        coalescer.get("a", fail, ttl_seconds=60)
+
+    assert coalescer.get("a", lambda: 1, ttl_seconds=60) == 1
+
+
+def test_get_request_cache_ttl():
+    assert get_request_cache_ttl("tokens/WEGLD-bd4d79") > 0
+    assert get_request_cache_ttl("network/config") > 0
+    assert get_request_cache_ttl("accounts/erd1qqqqqqqqqqqqqpgq/tokens/WEGLD-bd4d79") == 0
@@ -11,6 +11,7 @@ from wizard.accounts import load_accounts
 from wizard.configuration import CONFIGURATIONS
 from wizard.entrypoint import MyEntrypoint
 from wizard.errors import UsageError
+from wizard.planner import PrefetchPlan
 from wizard.rewards import ReceivedRewardsOfAccount
 from wizard.utils import format_time
 
@@ -60,23 +61,27 @@ def _do_main(cli_args: list[str]):
 
     ux.show_message("Looking for previously received (claimed) rewards...")
 
+    # All reads are declared (and fetched concurrently) first; then, accounts are handled one by one.
+    plan = PrefetchPlan()
+
+    for account_wrapper in accounts_wrappers:
+        address = account_wrapper.address
+        plan.add(("claimed", address.to_bech32()), lambda address=address: entrypoint.get_claimed_rewards(address, after_time))
+        plan.add(("claimedLegacy", address.to_bech32()), lambda address=address: entrypoint.get_claimed_rewards_legacy(address, after_time))
+        plan.add(("staking", address.to_bech32()), lambda address=address: entrypoint.get_received_staking_rewards(address, after_time))
+
+    results = plan.run()
     all_rewards: list[ReceivedRewardsOfAccount] = []
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         rewards_of_account: ReceivedRewardsOfAccount = ReceivedRewardsOfAccount(address, account_wrapper.wallet_name, [])
 
         print(address.to_bech32(), f"([yellow]{account_wrapper.wallet_name}[/yellow])")
 
-        rewards = entrypoint.get_claimed_rewards(address, after_time)
-        rewards_of_account.rewards.extend(rewards)
-
-        rewards = entrypoint.get_claimed_rewards_legacy(address, after_time)
-        rewards_of_account.rewards.extend(rewards)
-
-        rewards = entrypoint.get_received_staking_rewards(address, after_time)
-        rewards_of_account.rewards.extend(rewards)
+        rewards_of_account.rewards.extend(results[("claimed", address.to_bech32())])
+        rewards_of_account.rewards.extend(results[("claimedLegacy", address.to_bech32())])
+        rewards_of_account.rewards.extend(results[("staking", address.to_bech32())])
 
         rewards_of_account.sort_rewards()
         all_rewards.append(rewards_of_account)
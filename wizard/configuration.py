@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 DEFAULT_MAINNET_PROXY_URL = "https://gateway.multiversx.com"
 DEFAULT_MAINNET_API_URL = "https://api.multiversx.com"
@@ -26,22 +27,41 @@ ENV_TESTNET_DEEP_HISTORY_URL = os.environ.get("TESTNET_DEEP_HISTORY_URL")
 @dataclass
 class Configuration:
     chain_id: str
-    proxy_url: str
-    api_url: str
-    deep_history_url: str
+    # Several (equivalent) endpoints can be given per role: requests fail over (see "endpoints.py").
+    proxy_urls: list[str]
+    api_urls: list[str]
+    deep_history_urls: list[str]
     explorer_url: str
     legacy_delegation_contract: str
     system_governance_contract: str
     cosigner_url: str
     liquid_staking_contracts: list[str]
 
+    @property
+    def proxy_url(self) -> str:
+        return self.proxy_urls[0]
+
+    @property
+    def api_url(self) -> str:
+        return self.api_urls[0]
+
+    @property
+    def deep_history_url(self) -> str:
+        return self.deep_history_urls[0]
+
+
+# Environment variables hold one URL, or several (comma-separated).
+def parse_urls(value: Optional[str], default: str) -> list[str]:
+    urls = [url.strip().rstrip("/") for url in (value or "").split(",") if url.strip()]
+    return urls or [default]
+
 
 CONFIGURATIONS = {
     "mainnet": Configuration(
         chain_id="1",
-        proxy_url=ENV_MAINNET_PROXY_URL or DEFAULT_MAINNET_PROXY_URL,
-        api_url=ENV_MAINNET_API_URL or DEFAULT_MAINNET_API_URL,
-        deep_history_url=ENV_MAINNET_DEEP_HISTORY_URL or DEFAULT_MAINNET_DEEP_HISTORY_URL,
+        proxy_urls=parse_urls(ENV_MAINNET_PROXY_URL, DEFAULT_MAINNET_PROXY_URL),
+        api_urls=parse_urls(ENV_MAINNET_API_URL, DEFAULT_MAINNET_API_URL),
+        deep_history_urls=parse_urls(ENV_MAINNET_DEEP_HISTORY_URL, DEFAULT_MAINNET_DEEP_HISTORY_URL),
         explorer_url="https://explorer.multiversx.com",
         legacy_delegation_contract="erd1qqqqqqqqqqqqqpgqxwakt2g7u9atsnr03gqcgmhcv38pt7mkd94q6shuwt",
         system_governance_contract="erd1qqqqqqqqqqqqqqqpqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqrlllsrujgla",
@@ -50,9 +70,9 @@ CONFIGURATIONS = {
     ),
     "devnet": Configuration(
         chain_id="D",
-        proxy_url=ENV_DEVNET_PROXY_URL or DEFAULT_DEVNET_PROXY_URL,
-        api_url=ENV_DEVNET_API_URL or DEFAULT_DEVNET_API_URL,
-        deep_history_url=ENV_DEVNET_DEEP_HISTORY_URL or DEFAULT_DEVNET_DEEP_HISTORY_URL,
+        proxy_urls=parse_urls(ENV_DEVNET_PROXY_URL, DEFAULT_DEVNET_PROXY_URL),
+        api_urls=parse_urls(ENV_DEVNET_API_URL, DEFAULT_DEVNET_API_URL),
+        deep_history_urls=parse_urls(ENV_DEVNET_DEEP_HISTORY_URL, DEFAULT_DEVNET_DEEP_HISTORY_URL),
         explorer_url="https://devnet-explorer.multiversx.com",
         legacy_delegation_contract="erd1qqqqqqqqqqqqqpgq97wezxw6l7lgg7k9rxvycrz66vn92ksh2tssxwf7ep",
         system_governance_contract="erd1qqqqqqqqqqqqqqqpqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqrlllsrujgla",
@@ -61,9 +81,9 @@ CONFIGURATIONS = {
     ),
     "testnet": Configuration(
         chain_id="T",
-        proxy_url=ENV_TESTNET_PROXY_URL or DEFAULT_TESTNET_PROXY_URL,
-        api_url=ENV_TESTNET_API_URL or DEFAULT_TESTNET_API_URL,
-        deep_history_url=ENV_TESTNET_DEEP_HISTORY_URL or DEFAULT_TESTNET_DEEP_HISTORY_URL,
+        proxy_urls=parse_urls(ENV_TESTNET_PROXY_URL, DEFAULT_TESTNET_PROXY_URL),
+        api_urls=parse_urls(ENV_TESTNET_API_URL, DEFAULT_TESTNET_API_URL),
+        deep_history_urls=parse_urls(ENV_TESTNET_DEEP_HISTORY_URL, DEFAULT_TESTNET_DEEP_HISTORY_URL),
         explorer_url="https://testnet-explorer.multiversx.com",
         legacy_delegation_contract="erd1qqqqqqqqqqqqqpgq97wezxw6l7lgg7k9rxvycrz66vn92ksh2tssxwf7ep",
         system_governance_contract="erd1qqqqqqqqqqqqqqqpqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqqrlllsrujgla",
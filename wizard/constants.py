@@ -1,18 +1,17 @@
 DEFAULT_GAS_PRICE = 1_000_000_000
 DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS = 8
-NUM_PARALLEL_GET_NONCE_REQUESTS = 4
-NUM_PARALLEL_GET_GUARDIAN_DATA_REQUESTS = 4
-NUM_PARALLEL_GET_TRANSACTION_REQUESTS = 4
+# Upper bounds: the actual number of concurrent requests is tuned at runtime, per host (see "throttling.py").
+NUM_PARALLEL_GET_NONCE_REQUESTS = 16
+NUM_PARALLEL_GET_GUARDIAN_DATA_REQUESTS = 16
+NUM_PARALLEL_GET_TRANSACTION_REQUESTS = 16
 NETWORK_PROVIDER_TIMEOUT_SECONDS = 30
 NETWORK_PROVIDER_NUM_RETRIES = 3
-NETWORK_PROVIDERS_RETRY_DELAY_IN_SECONDS = 5
 ACCOUNT_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS = 1000
 ACCOUNT_AWAITING_PATIENCE_IN_MILLISECONDS = 0
 TRANSACTION_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS = 6000
 TRANSACTION_AWAITING_PATIENCE_IN_MILLISECONDS = 8000
 MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_CLAIM_REWARDS = 50
 MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_REWARDS = 10_000
-MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_VOTE = 10
 MAX_NUM_CUSTOM_TOKENS_TO_FETCH = 10_000
 METACHAIN_ID = 4294967295
 ONE_QUINTILLION = 1000000000000000000
@@ -20,3 +19,71 @@ CONTRACT_RESULTS_CODE_OK_ENCODED = "QDZmNmI="
 COSIGNER_SERVICE_ID = "MultiversXTCSService"
 COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS = 10
 DELAY_TO_CAPTURE_ATTENTION_IN_SECONDS = 10
+# "None" stands for "number of CPUs".
+NUM_PARALLEL_SIGNING_PROCESSES = None
+MIN_NUM_TRANSACTIONS_FOR_PARALLEL_SIGNING = 256
+NETWORK_PROVIDER_CONNECTION_POOL_SIZE = 16
+NUM_PARALLEL_PREFETCH_REQUESTS = 8
+JSON_STREAMING_CHUNK_SIZE = 65536
+# Transactions with logs & smart contract results can only be fetched in small pages.
+VOTES_INDEX_PAGE_SIZE = 50
+# Pagination window of the API ("from" + "size" must not exceed this).
+API_MAX_PAGINATION_WINDOW = 10_000
+WIZARD_CACHE_FOLDER = "~/.cache/mx-bulk-ops-wizard"
+NUM_PARALLEL_VOTING_POWER_QUERIES = 8
+# Gas limits learned from completed transactions: used once enough samples are available, with a safety margin.
+GAS_PROFILE_MIN_NUM_SAMPLES = 3
+GAS_PROFILE_MAX_NUM_SAMPLES = 32
+GAS_PROFILE_SAFETY_MARGIN = 1.5
+NUM_PARALLEL_GAS_ESTIMATIONS = 8
+NUM_PARALLEL_SIMULATIONS = 8
+ACCOUNTS_SNAPSHOT_CHUNK_SIZE = 100
+PIPELINE_QUEUE_SIZE = 16
+NUM_PARALLEL_COSIGNING_REQUESTS = 2
+NUM_PARALLEL_SEND_REQUESTS = 2
+# Max. number of transactions in flight (sent, but not yet completed), when broadcasting a bundle.
+BUNDLE_BROADCAST_WINDOW = 1000
+# A transaction that, after this many rounds, is neither processed nor in the mempool is considered dropped (then, rebroadcasted).
+STUCK_TRANSACTION_DEADLINE_IN_ROUNDS = 5
+MAX_NUM_REBROADCASTS = 3
+HTTP_STATUS_TOO_MANY_REQUESTS = 429
+HTTP_STATUS_SERVER_ERROR = 500
+# Rate (requests per second) and concurrency of requests, per host: start low, then adjusted (AIMD) by observing latency, errors and throttling.
+THROTTLING_INITIAL_RATE = 50
+THROTTLING_MIN_RATE = 1
+THROTTLING_MAX_RATE = 1000
+THROTTLING_RATE_STEP = 5
+THROTTLING_INITIAL_CONCURRENCY = 4
+THROTTLING_MIN_CONCURRENCY = 1
+THROTTLING_MAX_CONCURRENCY = 16
+# Latency is considered degraded when its moving average exceeds the best observed latency by this factor.
+THROTTLING_LATENCY_TOLERANCE = 3
+THROTTLING_DECREASE_COOLDOWN_IN_SECONDS = 1
+THROTTLING_MAX_NUM_RETRIES = 5
+THROTTLING_BACKOFF_BASE_IN_SECONDS = 0.5
+THROTTLING_BACKOFF_MAX_IN_SECONDS = 30
+# When several endpoints are configured for a role (see "configuration.py"):
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN_IN_SECONDS = 30
+# Reads (GET requests) slower than this percentile of the recent ones are duplicated to another endpoint.
+HEDGE_READS = True
+HEDGING_LATENCY_PERCENTILE = 0.95
+HEDGING_NUM_SAMPLES = 256
+HEDGING_MIN_NUM_SAMPLES = 20
+HEDGING_NUM_WORKERS = 64
+# Fields actually read from the API responses (the API returns only these): smaller payloads, faster decoding.
+API_FIELDS_OF_CLAIM_REWARDS_TRANSACTIONS = ["txHash", "timestamp", "results"]
+API_FIELDS_OF_REWARD_TRANSACTIONS = ["txHash", "timestamp", "value"]
+API_FIELDS_OF_VOTE_TRANSACTIONS = ["sender", "timestamp", "logs", "results"]
+API_FIELDS_OF_TOKEN = ["name", "decimals"]
+API_FIELDS_OF_TOKENS = ["identifier", "name", "decimals"]
+# Results of GET requests reused for a short while, by route prefix (relative to the base URL; in seconds). Others are only shared while in flight.
+# Only for data that does not change within a run (e.g. not balances, not guardians).
+REQUEST_CACHE_TTL_RULES = [
+    ("network/epoch-start/", 3600),
+    ("network/config", 3600),
+    ("tokens/", 3600),
+]
+# Metadata (name, decimals) of tokens: fetched in bulk (several identifiers per request), kept in a bounded, persistent cache.
+CURRENCY_METADATA_BULK_SIZE = 100
+CURRENCY_METADATA_CACHE_MAX_SIZE = 4096
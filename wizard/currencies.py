@@ -1,41 +1,156 @@
-from functools import cache
+import atexit
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Optional
 
-from multiversx_sdk import ApiNetworkProvider, NetworkProviderConfig
+from multiversx_sdk import NetworkProviderConfig
 from multiversx_sdk.core.constants import \
     EGLD_IDENTIFIER_FOR_MULTI_ESDTNFT_TRANSFER
+from rich import print
 
 from wizard.configuration import Configuration
-from wizard.constants import NETWORK_PROVIDER_TIMEOUT_SECONDS
+from wizard.constants import (API_FIELDS_OF_TOKEN, API_FIELDS_OF_TOKENS,
+                              CURRENCY_METADATA_BULK_SIZE,
+                              CURRENCY_METADATA_CACHE_MAX_SIZE,
+                              NETWORK_PROVIDER_TIMEOUT_SECONDS,
+                              WIZARD_CACHE_FOLDER)
+from wizard.providers import MyApiNetworkProvider
+from wizard.utils import load_json_cache, save_json_cache, split_to_chunks
 
 
 class Currency:
+    __slots__ = ("token_identifier", "name", "decimals")
+
     def __init__(self, token_identifier: str, name: str, decimals: int) -> None:
         self.token_identifier = token_identifier
         self.name = name
         self.decimals = decimals
 
+    @classmethod
+    def new_from_dictionary(cls, data: dict[str, Any]):
+        return cls(data["identifier"], data.get("name", data["identifier"]), int(data.get("decimals", 0)))
+
+    def to_dictionary(self) -> dict[str, Any]:
+        return {
+            "identifier": self.token_identifier,
+            "name": self.name,
+            "decimals": self.decimals
+        }
+
+
+# Metadata of tokens does not change, thus it is kept across runs (least recently used entries are evicted first).
+class CurrencyMetadataCache:
+    def __init__(self, currencies: list[Currency]) -> None:
+        self.currencies: OrderedDict[str, Currency] = OrderedDict((currency.token_identifier, currency) for currency in currencies)
+        self.is_dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, file: Path) -> "CurrencyMetadataCache":
+        data = load_json_cache(file) or []
+
+        try:
+            return cls([Currency.new_from_dictionary(item) for item in data])
+        except (ValueError, KeyError, TypeError) as error:
+            # E.g. a file written by an older version. It's only a cache: start over.
+            print(f"[yellow]Ignoring unreadable cache[/yellow] {file}: {error}")
+            return cls([])
+
+    def save(self, file: Path):
+        with self._lock:
+            data = [currency.to_dictionary() for currency in self.currencies.values()]
+            self.is_dirty = False
+
+        save_json_cache(file, data)
+
+    def get(self, token_identifier: str) -> Optional[Currency]:
+        with self._lock:
+            currency = self.currencies.get(token_identifier)
+            if currency is not None:
+                self.currencies.move_to_end(token_identifier)
+            return currency
+
+    def put(self, currency: Currency):
+        with self._lock:
+            self.currencies[currency.token_identifier] = currency
+            self.currencies.move_to_end(currency.token_identifier)
+            self.is_dirty = True
+
+            while len(self.currencies) > CURRENCY_METADATA_CACHE_MAX_SIZE:
+                self.currencies.popitem(last=False)
+
 
 class CurrencyProvider:
     def __init__(self, configuration: Configuration) -> None:
         self.configuration = configuration
 
-        self.api_network_provider = ApiNetworkProvider(
+        self.api_network_provider = MyApiNetworkProvider(
             url=configuration.api_url,
             config=NetworkProviderConfig(requests_options={"timeout": NETWORK_PROVIDER_TIMEOUT_SECONDS})
         )
 
+        self.api_network_provider.use_endpoints(configuration.api_urls)
+
+        self.cache_path = get_currencies_cache_path(configuration.chain_id)
+        self.cache = CurrencyMetadataCache.load(self.cache_path)
+        # Metadata fetched outside "prefetch()" is saved on exit (once).
+        atexit.register(self.save_cache)
+
+    def prefetch(self, token_identifiers: Iterable[str]):
+        # Ideally, called with all the identifiers of an input file (or plan) upfront, so that formatting never waits for the network.
+        missing = sorted(set(
+            token_identifier for token_identifier in token_identifiers
+            if not is_native_currency(token_identifier) and self.cache.get(token_identifier) is None
+        ))
+
+        if not missing:
+            return
+
+        print(f"Fetching metadata of {len(missing)} tokens...")
+
+        for chunk in split_to_chunks(missing, CURRENCY_METADATA_BULK_SIZE):
+            data = self.api_network_provider.do_get_generic(url="tokens", url_parameters={
+                "identifiers": ",".join(chunk),
+                "fields": ",".join(API_FIELDS_OF_TOKENS),
+                "size": len(chunk)
+            })
+
+            for item in data:
+                self.cache.put(Currency.new_from_dictionary(item))
+
+        # E.g. collections (of SFTs, meta ESDTs) aren't listed in bulk: they are fetched one by one.
+        for token_identifier in missing:
+            if self.cache.get(token_identifier) is None:
+                self.cache.put(self._fetch_currency_metadata(token_identifier))
+
+        self.save_cache()
+
+    def save_cache(self):
+        if self.cache.is_dirty:
+            self.cache.save(self.cache_path)
+
     def get_currency_name(self, token_identifier: str) -> str:
         return self._get_currency_metadata(token_identifier).name
 
     def get_currency_num_decimals(self, token_identifier: str) -> int:
         return self._get_currency_metadata(token_identifier).decimals
 
-    @cache
     def _get_currency_metadata(self, token_identifier: str) -> Currency:
         if is_native_currency(token_identifier):
             return Currency(EGLD_IDENTIFIER_FOR_MULTI_ESDTNFT_TRANSFER, "EGLD", 18)
 
-        data = self.api_network_provider.do_get_generic(url=f"tokens/{token_identifier}")
+        currency = self.cache.get(token_identifier)
+        if currency is not None:
+            return currency
+
+        # Not prefetched.
+        currency = self._fetch_currency_metadata(token_identifier)
+        self.cache.put(currency)
+        return currency
+
+    def _fetch_currency_metadata(self, token_identifier: str) -> Currency:
+        data = self.api_network_provider.do_get_generic(url=f"tokens/{token_identifier}", url_parameters={"fields": ",".join(API_FIELDS_OF_TOKEN)})
         name = data.get("name", token_identifier)
         decimals = int(data.get("decimals", 0))
         return Currency(token_identifier, name, decimals)
@@ -56,3 +171,7 @@ class OnlyNativeCurrencyProvider:
 
 def is_native_currency(token_identifier: str) -> bool:
     return token_identifier == "" or token_identifier == EGLD_IDENTIFIER_FOR_MULTI_ESDTNFT_TRANSFER
+
+
+def get_currencies_cache_path(chain_id: str) -> Path:
+    return Path(WIZARD_CACHE_FOLDER).expanduser() / "currencies" / f"{chain_id}.json"
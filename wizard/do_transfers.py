@@ -5,17 +5,18 @@ import traceback
 from argparse import ArgumentParser
 from pathlib import Path
 
-from multiversx_sdk import Address
+from multiversx_sdk import Address, TokenTransfer
 from rich import print
 from rich.rule import Rule
 
 from wizard import errors, ux
-from wizard.accounts import AccountWrapper, load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DELAY_TO_CAPTURE_ATTENTION_IN_SECONDS
 from wizard.currencies import CurrencyProvider
 from wizard.entrypoint import MyEntrypoint
 from wizard.guardians import AuthApp
+from wizard.signing import defer_signing, sign_transactions
 from wizard.transactions import TransactionWrapper
 from wizard.transfers import MyTransfer
 from wizard.utils import format_amount
@@ -39,29 +40,31 @@ def _do_main(cli_args: list[str]):
     parser.add_argument("--receiver", required=True, help="the unique receiver")
     parser.add_argument("--auth", required=True, help="auth registration file")
 
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
     configuration = CONFIGURATIONS[network]
-    entrypoint = MyEntrypoint(configuration)
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
     currency_provider = CurrencyProvider(configuration)
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     infile = args.infile
     infile_path = Path(infile).expanduser().resolve()
     receiver = Address.new_from_bech32(args.receiver)
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
     accounts_wrappers_by_addresses: dict[str, AccountWrapper] = {
-        item.account.address.to_bech32(): item for item in accounts_wrappers
+        item.address.to_bech32(): item for item in accounts_wrappers
     }
 
     json_content = infile_path.read_text()
     data = json.loads(json_content)
     transfers = [MyTransfer.new_from_dictionary(item) for item in data]
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
-    transactions_wrappers: list[TransactionWrapper] = []
+    defer_signing(accounts_wrappers)
+    items: list[tuple[AccountWrapper, Address, TokenTransfer]] = []
 
     ux.show_message("Creating and signing transactions...")
 
@@ -69,8 +72,7 @@ def _do_main(cli_args: list[str]):
 
     for transfer in transfers:
         sender = accounts_wrappers_by_addresses[transfer.sender.to_bech32()]
-        transaction = entrypoint.transfer_funds(sender, receiver, transfer.token_transfer)
-        transactions_wrappers.append(TransactionWrapper(transaction, transfer.label))
+        items.append((sender, receiver, transfer.token_transfer))
 
         token_identifier = transfer.token_transfer.token.identifier
         if token_identifier not in amounts_by_token:
@@ -78,6 +80,12 @@ def _do_main(cli_args: list[str]):
 
         amounts_by_token[token_identifier] += transfer.token_transfer.amount
 
+    currency_provider.prefetch(amounts_by_token.keys())
+
+    transactions = entrypoint.transfer_funds_many(items)
+    transactions_wrappers = [TransactionWrapper(transaction, transfer.label) for transaction, transfer in zip(transactions, transfers)]
+
+    sign_transactions(accounts_wrappers, transactions_wrappers)
     display_amounts(amounts_by_token, currency_provider)
     ux.confirm_continuation(f"Ready to do transfers, by sending [green]{len(transactions_wrappers)}[/green] transactions?")
 
@@ -91,7 +99,10 @@ def _do_main(cli_args: list[str]):
 
     ux.confirm_continuation(f"[red]Proceed[/red] with the transfers?")
 
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
 
 
 def display_amounts(amounts_by_token: dict[str, int], currency_provider: CurrencyProvider):
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from wizard.constants import (CIRCUIT_BREAKER_COOLDOWN_IN_SECONDS,
+                              CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                              HEDGING_LATENCY_PERCENTILE,
+                              HEDGING_MIN_NUM_SAMPLES, HEDGING_NUM_SAMPLES)
+
+
+class Endpoint:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        # Moving average of the latency (the health score; lower is better).
+        self.latency: Optional[float] = None
+        self.num_consecutive_failures = 0
+        self.open_until = 0.0
+        self.num_requests = 0
+        self.num_failures = 0
+        # When broadcasting to all endpoints at once (see "send_transactions_to_all()").
+        self.num_broadcasts = 0
+        self.num_broadcast_errors = 0
+        self.num_accepted = 0
+        self.num_accepted_first = 0
+        self.broadcast_seconds = 0.0
+
+    def is_circuit_open(self, now: float) -> bool:
+        return now < self.open_until
+
+
+# Several (equivalent) endpoints for the same role (e.g. several proxies / observers).
+# Requests go to the healthiest endpoint first (lowest latency), then fail over to the next ones.
+# An endpoint that keeps failing is taken out of rotation for a while (circuit breaker); afterwards, it gets a new chance.
+class EndpointPool:
+    def __init__(self, urls: list[str]) -> None:
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.num_hedged = 0
+        self._latencies: deque[float] = deque(maxlen=HEDGING_NUM_SAMPLES)
+        self._lock = threading.Lock()
+
+    def get_ordered(self) -> list[Endpoint]:
+        now = time.monotonic()
+
+        with self._lock:
+            # Circuits open: last resort. Unknown latency: tried early (so that it gets a score).
+            return sorted(self.endpoints, key=lambda endpoint: (endpoint.is_circuit_open(now), endpoint.latency or 0))
+
+    def report(self, endpoint: Endpoint, latency: float, is_good: bool):
+        with self._lock:
+            endpoint.num_requests += 1
+
+            if is_good:
+                endpoint.num_consecutive_failures = 0
+                endpoint.open_until = 0
+                endpoint.latency = latency if endpoint.latency is None else 0.8 * endpoint.latency + 0.2 * latency
+                self._latencies.append(latency)
+                return
+
+            endpoint.num_failures += 1
+            endpoint.num_consecutive_failures += 1
+
+            if endpoint.num_consecutive_failures >= CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+                endpoint.open_until = time.monotonic() + CIRCUIT_BREAKER_COOLDOWN_IN_SECONDS
+
+    def report_broadcast(self, endpoint: Endpoint, num_accepted: int, num_accepted_first: int, latency: float, error: str = ""):
+        with self._lock:
+            endpoint.num_broadcasts += 1
+            endpoint.num_broadcast_errors += 1 if error else 0
+            endpoint.num_accepted += num_accepted
+            endpoint.num_accepted_first += num_accepted_first
+            endpoint.broadcast_seconds += latency
+
+    def on_hedged(self):
+        with self._lock:
+            self.num_hedged += 1
+
+    def get_hedging_delay(self) -> Optional[float]:
+        # A duplicate request is issued once the first one is slower than most of the recent (good) requests.
+        with self._lock:
+            if len(self._latencies) < HEDGING_MIN_NUM_SAMPLES:
+                return None
+
+            latencies = sorted(self._latencies)
+
+        index = min(len(latencies) - 1, int(len(latencies) * HEDGING_LATENCY_PERCENTILE))
+        return latencies[index]
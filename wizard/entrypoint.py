@@ -1,46 +1,67 @@
 import base64
+import copy
+import math
+import threading
 import time
-from datetime import datetime, timedelta, timezone
 from multiprocessing.dummy import Pool
-from typing import Any, Callable, Optional
-
-from multiversx_sdk import (AccountOnNetwork, Address, ApiNetworkProvider,
-                            AwaitingOptions, Message, NativeAuthClient,
-                            NativeAuthClientConfig, NetworkEntrypoint,
-                            NetworkProviderConfig, NetworkProviderError,
-                            ProxyNetworkProvider, Token, TokenTransfer,
-                            Transaction, TransactionOnNetwork, VoteType)
+from multiprocessing.pool import AsyncResult
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from multiversx_sdk import (Address, AwaitingOptions, Message,
+                            NativeAuthClient, NativeAuthClientConfig,
+                            NetworkProviderConfig, NetworkProviderError, Token,
+                            TokenTransfer, Transaction, TransactionComputer,
+                            TransactionOnNetwork, VoteType)
 from multiversx_sdk.abi import (AddressValue, BigUIntValue, BytesValue,
                                 StringValue, U64Value)
+from multiversx_sdk.gas_estimator.errors import GasLimitEstimationError
+from multiversx_sdk.smart_contracts.errors import SmartContractQueryError
 from rich import print
 
 from wizard import ux
-from wizard.accounts import AccountWrapper, IMyAccount
+from wizard.accounts import (AccountWrapper, IMyAccount, deduplicate_accounts,
+                             iterate_accounts)
+from wizard.addresses import address_from_bech32
+from wizard.bundles import BundleEntry, save_bundle
+from wizard.coalescing import REQUEST_COALESCER
 from wizard.configuration import Configuration
 from wizard.constants import (
     ACCOUNT_AWAITING_PATIENCE_IN_MILLISECONDS,
     ACCOUNT_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS,
-    CONTRACT_RESULTS_CODE_OK_ENCODED, COSIGNER_SERVICE_ID,
-    COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS,
+    ACCOUNTS_SNAPSHOT_CHUNK_SIZE, API_FIELDS_OF_CLAIM_REWARDS_TRANSACTIONS,
+    API_FIELDS_OF_REWARD_TRANSACTIONS, API_FIELDS_OF_VOTE_TRANSACTIONS,
+    API_MAX_PAGINATION_WINDOW, CONTRACT_RESULTS_CODE_OK_ENCODED,
+    COSIGNER_SERVICE_ID, COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS,
     DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS, MAX_NUM_CUSTOM_TOKENS_TO_FETCH,
-    MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_CLAIM_REWARDS,
-    MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_REWARDS,
-    MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_VOTE, METACHAIN_ID,
+    MAX_NUM_REBROADCASTS, MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_CLAIM_REWARDS,
+    MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_REWARDS, METACHAIN_ID,
     NETWORK_PROVIDER_NUM_RETRIES, NETWORK_PROVIDER_TIMEOUT_SECONDS,
-    NETWORK_PROVIDERS_RETRY_DELAY_IN_SECONDS,
+    NUM_PARALLEL_COSIGNING_REQUESTS, NUM_PARALLEL_GAS_ESTIMATIONS,
     NUM_PARALLEL_GET_GUARDIAN_DATA_REQUESTS, NUM_PARALLEL_GET_NONCE_REQUESTS,
-    NUM_PARALLEL_GET_TRANSACTION_REQUESTS,
+    NUM_PARALLEL_GET_TRANSACTION_REQUESTS, NUM_PARALLEL_PREFETCH_REQUESTS,
+    NUM_PARALLEL_SEND_REQUESTS, NUM_PARALLEL_SIMULATIONS,
+    NUM_PARALLEL_VOTING_POWER_QUERIES, STUCK_TRANSACTION_DEADLINE_IN_ROUNDS,
     TRANSACTION_AWAITING_PATIENCE_IN_MILLISECONDS,
-    TRANSACTION_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS)
+    TRANSACTION_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS,
+    VOTES_INDEX_PAGE_SIZE)
 from wizard.currencies import is_native_currency
-from wizard.errors import KnownError, TransientError
-from wizard.governance import OnChainVote
+from wizard.errors import KnownError, ProgrammingError, TransientError
+from wizard.gas_estimation import MyNetworkEntrypoint
+from wizard.gas_profiles import GasProfiles, get_gas_profiles_path
+from wizard.governance import (OnChainVote, VotesIndex, VotingChannel,
+                               VotingPower, get_votes_index_path)
 from wizard.guardians import (AuthApp, AuthRegistrationEntry, CosignerClient,
                               GuardianData)
+from wizard.nonces import NonceManager
+from wizard.pipeline import Pipeline, PipelineStage
+from wizard.providers import MyApiNetworkProvider, MyProxyNetworkProvider
 from wizard.rewards import ClaimableRewards, ReceivedRewards, RewardsType
+from wizard.signing import DeferredSigningAccount
+from wizard.throttling import get_backoff_delay
 from wizard.timecache import TimeCache
 from wizard.transactions import TransactionWrapper
-from wizard.utils import split_to_chunks
+from wizard.utils import encode_top_level, split_to_chunks
 
 
 class MyEntrypoint:
@@ -48,33 +69,46 @@ class MyEntrypoint:
         self,
         configuration: Configuration,
         use_gas_estimator: Optional[bool] = None,
-        gas_limit_multiplier: Optional[float] = None
+        gas_limit_multiplier: Optional[float] = None,
+        fan_out: bool = False
     ) -> None:
         self.configuration = configuration
+        # Broadcast through all the configured proxies at once (instead of a single one).
+        self.fan_out = fan_out
 
-        self.network_entrypoint = NetworkEntrypoint(
-            network_provider_url=configuration.proxy_url,
-            network_provider_kind="proxy",
-            chain_id=configuration.chain_id,
-            with_gas_limit_estimator=use_gas_estimator,
-            gas_limit_multiplier=gas_limit_multiplier
-        )
-
-        self.api_network_provider = ApiNetworkProvider(
+        self.api_network_provider = MyApiNetworkProvider(
             url=configuration.api_url,
             config=NetworkProviderConfig(requests_options={"timeout": NETWORK_PROVIDER_TIMEOUT_SECONDS})
         )
 
-        self.proxy_network_provider = ProxyNetworkProvider(
+        self.proxy_network_provider = MyProxyNetworkProvider(
             url=configuration.proxy_url,
             config=NetworkProviderConfig(requests_options={"timeout": NETWORK_PROVIDER_TIMEOUT_SECONDS})
         )
 
-        self.deep_history_proxy_network_provider = ProxyNetworkProvider(
+        self.deep_history_proxy_network_provider = MyProxyNetworkProvider(
             url=configuration.deep_history_url,
             config=NetworkProviderConfig(requests_options={"timeout": NETWORK_PROVIDER_TIMEOUT_SECONDS})
         )
 
+        self.api_network_provider.use_endpoints(configuration.api_urls)
+        self.proxy_network_provider.use_endpoints(configuration.proxy_urls)
+        self.deep_history_proxy_network_provider.use_endpoints(configuration.deep_history_urls)
+
+        self.network_entrypoint = MyNetworkEntrypoint(
+            network_provider=self.proxy_network_provider,
+            chain_id=configuration.chain_id,
+            with_gas_limit_estimator=use_gas_estimator,
+            gas_limit_multiplier=gas_limit_multiplier
+        )
+
+        # Controllers (and their factories) are created once, then reused for all transactions & queries.
+        self.account_controller = self.network_entrypoint.create_account_controller()
+        self.delegation_controller = self.network_entrypoint.create_delegation_controller()
+        self.governance_controller = self.network_entrypoint.create_governance_controller()
+        self.smart_contract_controller = self.network_entrypoint.create_smart_contract_controller()
+        self.transfers_controller = self.network_entrypoint.create_transfers_controller()
+
         self.account_awaiting_options = AwaitingOptions(
             polling_interval_in_milliseconds=ACCOUNT_AWAITING_POLLING_TIMEOUT_IN_MILLISECONDS,
             patience_in_milliseconds=ACCOUNT_AWAITING_PATIENCE_IN_MILLISECONDS
@@ -93,6 +127,13 @@ class MyEntrypoint:
         self.native_auth_client = NativeAuthClient(native_auth_config)
         self.cosigner = CosignerClient(configuration.cosigner_url)
         self.timecache = TimeCache()
+        self.nonce_manager = NonceManager()
+
+        self.gas_profiles_path = get_gas_profiles_path(configuration.chain_id)
+        self.gas_profiles = GasProfiles.load(self.gas_profiles_path)
+
+        self.votes_index_path = get_votes_index_path(configuration.chain_id)
+        self.votes_index: Optional[VotesIndex] = None
 
     def get_start_of_epoch_timestamp(self, epoch: int) -> int:
         url = f"network/epoch-start/{METACHAIN_ID}/by-epoch/{epoch}"
@@ -112,7 +153,7 @@ class MyEntrypoint:
         rewards: list[ClaimableRewards] = []
 
         for record in data_records:
-            staking_provider = Address.new_from_bech32(record.get("contract"))
+            staking_provider = address_from_bech32(record.get("contract"))
             amount = record.get("claimableRewards", 0)
             rewards.append(ClaimableRewards(staking_provider, int(amount)))
 
@@ -123,45 +164,129 @@ class MyEntrypoint:
         amount = data.get("claimableRewards", 0)
         return int(amount)
 
+    def load_accounts_and_prefetch(
+        self,
+        wallets_configuration_file: Path,
+        recall_nonces: bool = True,
+        recall_guardians: bool = True,
+        prefetch: Optional[Callable[[AccountWrapper], Any]] = None
+    ) -> list[AccountWrapper]:
+        # Network requests for the accounts loaded so far run in the background,
+        # while the remaining accounts are being loaded (e.g. keystores being decrypted).
+        print("Loading accounts (and prefetching data from the network)...")
+
+        wrappers: list[AccountWrapper] = []
+        pending: list[AsyncResult[Any]] = []
+
+        with Pool(NUM_PARALLEL_PREFETCH_REQUESTS) as pool:
+            for provider in [self.api_network_provider, self.proxy_network_provider]:
+                pending.append(pool.apply_async(provider.warm_up))
+
+            for wrapper in iterate_accounts(wallets_configuration_file):
+                wrappers.append(wrapper)
+
+                if recall_nonces:
+                    pending.append(pool.apply_async(self.recall_nonce, (wrapper,)))
+                if recall_guardians:
+                    pending.append(pool.apply_async(self.recall_guardian, (wrapper,)))
+                if prefetch:
+                    pending.append(pool.apply_async(prefetch, (wrapper,)))
+
+            print("Waiting for prefetched data...")
+
+            for item in pending:
+                item.get()
+
+        self.report_network_usage()
+        return deduplicate_accounts(wrappers)
+
     def recall_nonces(self, accounts_wrappers: list[AccountWrapper]):
         print("Recalling nonces...")
+        Pool(NUM_PARALLEL_GET_NONCE_REQUESTS).map(self.recall_nonce, accounts_wrappers)
+
+    def recall_nonce(self, wrapper: AccountWrapper):
+        account_nonce = self.network_entrypoint.recall_account_nonce(wrapper.account.address)
+        # Mempool not inspectable: we only rely on the account nonce.
+        pending_nonces = self.get_pending_nonces(wrapper.address) or []
+        self.nonce_manager.recall(wrapper, account_nonce, pending_nonces)
+
+        num_pending = sum(1 for nonce in pending_nonces if nonce >= account_nonce)
+        if num_pending:
+            gaps = self.nonce_manager.get_gaps(wrapper.address.to_bech32())
+            print(f"\t[yellow]{wrapper.address.to_bech32()}[/yellow]: {num_pending} transactions pending in the mempool, next nonce: {wrapper.account.nonce}, gaps: {gaps}")
+
+    def get_pending_nonces(self, address: Address) -> Optional[list[int]]:
+        transactions = self._get_pending_transactions(address, "nonce")
+        if transactions is None:
+            return None
+
+        return [int(fields.get("nonce", 0)) for fields in transactions]
+
+    def get_pending_cost(self, address: Address) -> Optional[int]:
+        # Upper bound of what the transactions pending in the mempool can take from the balance (max. fees and value).
+        transactions = self._get_pending_transactions(address, "nonce,gaslimit,gasprice,value")
+        if transactions is None:
+            return None
 
-        def recall_nonce(wrapper: AccountWrapper):
-            wrapper.account.nonce = self.network_entrypoint.recall_account_nonce(wrapper.account.address)
+        cost = 0
 
-        Pool(NUM_PARALLEL_GET_NONCE_REQUESTS).map(recall_nonce, accounts_wrappers)
+        for fields in transactions:
+            # Field names are lowercase in the request; tolerate both casings in the response.
+            gas_limit = int(fields.get("gasLimit", fields.get("gaslimit", 0)))
+            gas_price = int(fields.get("gasPrice", fields.get("gasprice", 0)))
+            cost += gas_limit * gas_price + int(fields.get("value", 0))
+
+        return cost
+
+    def _get_pending_transactions(self, address: Address, fields: str) -> Optional[list[dict[str, Any]]]:
+        try:
+            data = self.proxy_network_provider.do_get_generic("transaction/pool", {"by-sender": address.to_bech32(), "fields": fields})
+        except NetworkProviderError as error:
+            # Not all proxies expose the mempool: "None" means "unknown" (not "empty").
+            print(f"\t[yellow]Cannot inspect the mempool[/yellow] for {address.to_bech32()}: {error}")
+            return None
+
+        transactions = data.get("txPool", {}).get("transactions", []) or []
+        return [item.get("txFields", {}) for item in transactions]
 
     def recall_guardians(self, accounts: list[AccountWrapper]):
         print("Recalling guardians...")
+        Pool(NUM_PARALLEL_GET_GUARDIAN_DATA_REQUESTS).map(self.recall_guardian, accounts)
 
-        def recall_guardian(wrapper: AccountWrapper):
-            guardian_data = self.get_guardian_data(wrapper.account.address)
-            wrapper.guardian = Address.new_from_bech32(guardian_data.active_guardian) if guardian_data.is_guarded else None
-
-        Pool(NUM_PARALLEL_GET_GUARDIAN_DATA_REQUESTS).map(recall_guardian, accounts)
+    def recall_guardian(self, wrapper: AccountWrapper):
+        guardian_data = self.get_guardian_data(wrapper.account.address)
+        wrapper.guardian = address_from_bech32(guardian_data.active_guardian) if guardian_data.is_guarded else None
 
     def claim_rewards(self, delegator: AccountWrapper, staking_provider: Address, gas_price: int) -> Transaction:
-        controller = self.network_entrypoint.create_delegation_controller()
+        return self.claim_rewards_many([(delegator, staking_provider)], gas_price)[0]
+
+    def claim_rewards_many(self, items: list[tuple[AccountWrapper, Address]], gas_price: int) -> list[Transaction]:
+        controller = self.delegation_controller
+        transactions: list[Transaction] = []
+
+        for delegator, staking_provider in items:
+            transaction = controller.create_transaction_for_claiming_rewards(
+                sender=delegator.account,
+                nonce=self.nonce_manager.allocate(delegator),
+                delegation_contract=staking_provider,
+                gas_price=gas_price,
+                guardian=delegator.guardian
+            )
 
-        transaction = controller.create_transaction_for_claiming_rewards(
-            sender=delegator.account,
-            nonce=delegator.account.get_nonce_then_increment(),
-            delegation_contract=staking_provider,
-            gas_price=gas_price,
-            guardian=delegator.guardian
-        )
+            transactions.append(transaction)
 
-        return transaction
+        return transactions
 
     def claim_rewards_legacy(self, delegator: AccountWrapper, gas_price: int) -> Transaction:
-        legacy_delegation_contract = Address.new_from_bech32(self.configuration.legacy_delegation_contract)
+        legacy_delegation_contract = address_from_bech32(self.configuration.legacy_delegation_contract)
 
-        controller = self.network_entrypoint.create_smart_contract_controller()
+        controller = self.smart_contract_controller
         transaction = controller.create_transaction_for_execute(
             sender=delegator.account,
-            nonce=delegator.account.get_nonce_then_increment(),
+            nonce=self.nonce_manager.allocate(delegator),
             contract=legacy_delegation_contract,
-            gas_limit=20_000_000,
+            # Gas estimator might not work, thus we fall back to a hard-coded value (unless a tighter one has been learned).
+            gas_limit=self.gas_profiles.get_gas_limit(self.configuration.legacy_delegation_contract, "claimRewards", 20_000_000),
             function="claimRewards",
             gas_price=gas_price,
             guardian=delegator.guardian
@@ -179,7 +304,7 @@ class MyEntrypoint:
             "receiverShard": METACHAIN_ID,
             "after": after_timestamp,
             "size": size
-        })
+        }, API_FIELDS_OF_CLAIM_REWARDS_TRANSACTIONS)
 
         if len(transactions) == size:
             print(f"\tRetrieved {size} transactions. [red]There could be more![/red]")
@@ -208,7 +333,7 @@ class MyEntrypoint:
             "receiver": self.configuration.legacy_delegation_contract,
             "after": after_timestamp,
             "size": size
-        })
+        }, API_FIELDS_OF_CLAIM_REWARDS_TRANSACTIONS)
 
         if len(transactions) == size:
             print(f"\tRetrieved {size} transactions. [red]There could be more![/red]")
@@ -230,19 +355,18 @@ class MyEntrypoint:
     def get_received_staking_rewards(self, node_owner: Address, after_timestamp: int) -> list[ReceivedRewards]:
         url = f"accounts/{node_owner.to_bech32()}/transactions"
         size = MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_REWARDS
-        transactions = self._api_do_get(url, {
+        transactions = self._api_do_get_streamed(url, {
             "senderShard": METACHAIN_ID,
             "function": "reward",
             "after": after_timestamp,
             "size": size
-        })
-
-        if len(transactions) == size:
-            print(f"\tRetrieved {size} transactions. [red]There could be more![/red]")
+        }, API_FIELDS_OF_REWARD_TRANSACTIONS)
 
         rewards: list[ReceivedRewards] = []
+        num_transactions = 0
 
         for transaction in transactions:
+            num_transactions += 1
             transaction_hash = transaction.get("txHash")
             timestamp = transaction.get("timestamp")
             amount = int(transaction.get("value", 0))
@@ -250,48 +374,105 @@ class MyEntrypoint:
             if amount:
                 rewards.append(ReceivedRewards(RewardsType.Staking, transaction_hash, timestamp, amount))
 
+        if num_transactions == size:
+            print(f"\tRetrieved {size} transactions. [red]There could be more![/red]")
+
         return rewards
 
     def transfer_funds(self, sender: AccountWrapper, receiver: Address, transfer: TokenTransfer) -> Transaction:
-        controller = self.network_entrypoint.create_transfers_controller()
+        return self.transfer_funds_many([(sender, receiver, transfer)])[0]
+
+    def transfer_funds_many(self, items: list[tuple[AccountWrapper, Address, TokenTransfer]]) -> list[Transaction]:
+        controller = self.transfers_controller
+        transactions: list[Transaction] = []
+
+        for sender, receiver, transfer in items:
+            if is_native_currency(transfer.token.identifier):
+                transaction = controller.create_transaction_for_transfer(
+                    sender=sender.account,
+                    nonce=self.nonce_manager.allocate(sender),
+                    receiver=receiver,
+                    native_transfer_amount=transfer.amount,
+                    guardian=sender.guardian
+                )
+            else:
+                transaction = controller.create_transaction_for_transfer(
+                    sender=sender.account,
+                    nonce=self.nonce_manager.allocate(sender),
+                    receiver=receiver,
+                    token_transfers=[transfer],
+                    guardian=sender.guardian
+                )
+
+            transactions.append(transaction)
+
+        return transactions
 
-        if is_native_currency(transfer.token.identifier):
-            return controller.create_transaction_for_transfer(
-                sender=sender.account,
-                nonce=sender.account.get_nonce_then_increment(),
-                receiver=receiver,
-                native_transfer_amount=transfer.amount,
-                guardian=sender.guardian
+    def get_direct_voting_power(self, voter: Address):
+        controller = self.governance_controller
+        return controller.get_voting_power(voter)
+
+    def get_voting_powers(self, addresses: list[Address], direct: bool = True, via_legacy_delegation: bool = True) -> dict[str, VotingPower]:
+        print(f"Getting voting power of {len(addresses)} accounts...")
+
+        governance_controller = self.governance_controller
+        smart_contract_controller = self.smart_contract_controller
+        legacy_delegation_contract = address_from_bech32(self.configuration.legacy_delegation_contract)
+
+        powers: dict[str, VotingPower] = {address.to_bech32(): VotingPower() for address in addresses}
+
+        def query_direct(address: Address):
+            try:
+                powers[address.to_bech32()].direct = governance_controller.get_voting_power(address)
+            except SmartContractQueryError as error:
+                powers[address.to_bech32()].direct_error = str(error)
+
+        def query_via_legacy_delegation(address: Address):
+            [power_encoded] = smart_contract_controller.query(
+                contract=legacy_delegation_contract,
+                function="getVotingPower",
+                arguments=[AddressValue.new_from_address(address)],
             )
 
-        return controller.create_transaction_for_transfer(
-            sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
-            receiver=receiver,
-            token_transfers=[transfer],
-            guardian=sender.guardian
-        )
+            power = BigUIntValue()
+            power.decode_top_level(power_encoded)
+            powers[address.to_bech32()].via_legacy_delegation = power.value
 
-    def get_direct_voting_power(self, voter: Address):
-        controller = self.network_entrypoint.create_governance_controller()
-        return controller.get_voting_power(voter)
+        queries: list[tuple[Callable[[Address], None], Address]] = []
+
+        if direct:
+            queries.extend((query_direct, address) for address in addresses)
+        if via_legacy_delegation:
+            queries.extend((query_via_legacy_delegation, address) for address in addresses)
+
+        Pool(NUM_PARALLEL_VOTING_POWER_QUERIES).map(lambda query: query[0](query[1]), queries)
+        return powers
 
     def vote_directly(self, sender: AccountWrapper, proposal: int, vote: VoteType, gas_price: int) -> Transaction:
-        controller = self.network_entrypoint.create_governance_controller()
+        return self.vote_directly_many([sender], proposal, vote, gas_price)[0]
 
-        return controller.create_transaction_for_voting(
-            sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
-            proposal_nonce=proposal,
-            vote=vote,
-            gas_price=gas_price,
-            guardian=sender.guardian,
-        )
+    def vote_directly_many(self, senders: list[AccountWrapper], proposal: int, vote: VoteType, gas_price: int) -> list[Transaction]:
+        controller = self.governance_controller
+        transactions: list[Transaction] = []
+
+        for sender in senders:
+            transaction = controller.create_transaction_for_voting(
+                sender=sender.account,
+                nonce=self.nonce_manager.allocate(sender),
+                proposal_nonce=proposal,
+                vote=vote,
+                gas_price=gas_price,
+                guardian=sender.guardian,
+            )
+
+            transactions.append(transaction)
+
+        return transactions
 
     def get_voting_power_via_legacy_delegation(self, voter: Address) -> int:
-        legacy_delegation_contract = Address.new_from_bech32(self.configuration.legacy_delegation_contract)
+        legacy_delegation_contract = address_from_bech32(self.configuration.legacy_delegation_contract)
 
-        controller = self.network_entrypoint.create_smart_contract_controller()
+        controller = self.smart_contract_controller
         [power_encoded] = controller.query(
             contract=legacy_delegation_contract,
             function="getVotingPower",
@@ -302,99 +483,190 @@ class MyEntrypoint:
         power.decode_top_level(power_encoded)
         return power.value
 
-    def vote_via_legacy_delegation(self, sender: AccountWrapper, proposal: int, vote: VoteType, gas_price: int):
-        legacy_delegation_contract = Address.new_from_bech32(self.configuration.legacy_delegation_contract)
+    def vote_via_legacy_delegation(self, sender: AccountWrapper, proposal: int, vote: VoteType, gas_price: int) -> Transaction:
+        return self.vote_via_legacy_delegation_many([sender], proposal, vote, gas_price)[0]
 
-        controller = self.network_entrypoint.create_smart_contract_controller()
-        transaction = controller.create_transaction_for_execute(
-            sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
-            contract=legacy_delegation_contract,
-            function="delegateVote",
-            arguments=[U64Value(proposal), StringValue(vote.value)],
-            # Gas estimator might not work, thus we hard-code a value here.
-            gas_limit=75_000_000,
-            gas_price=gas_price,
-            guardian=sender.guardian
-        )
+    def vote_via_legacy_delegation_many(self, senders: list[AccountWrapper], proposal: int, vote: VoteType, gas_price: int) -> list[Transaction]:
+        legacy_delegation_contract = address_from_bech32(self.configuration.legacy_delegation_contract)
+        # Gas estimator might not work, thus we fall back to a hard-coded value (unless a tighter one has been learned).
+        gas_limit = self.gas_profiles.get_gas_limit(self.configuration.legacy_delegation_contract, "delegateVote", 75_000_000)
+        # Arguments are the same for all transactions, thus encoded only once.
+        arguments = [encode_top_level(U64Value(proposal)), encode_top_level(StringValue(vote.value))]
 
-        return transaction
+        controller = self.smart_contract_controller
+        transactions: list[Transaction] = []
+
+        for sender in senders:
+            transaction = controller.create_transaction_for_execute(
+                sender=sender.account,
+                nonce=self.nonce_manager.allocate(sender),
+                contract=legacy_delegation_contract,
+                function="delegateVote",
+                arguments=arguments,
+                gas_limit=gas_limit,
+                gas_price=gas_price,
+                guardian=sender.guardian
+            )
+
+            transactions.append(transaction)
+
+        return transactions
 
     def vote_via_liquid_staking(self, sender: AccountWrapper, contract: str, proposal: int, vote: VoteType, power: int, proof: bytes, gas_price: int) -> Transaction:
-        controller = self.network_entrypoint.create_smart_contract_controller()
+        return self.vote_via_liquid_staking_many([(sender, power, proof)], contract, proposal, vote, gas_price)[0]
 
-        transaction = controller.create_transaction_for_execute(
-            sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
-            contract=Address.new_from_bech32(contract),
-            # Gas estimator might not work, thus we hard-code a value here.
-            gas_limit=100_000_000,
-            function="delegate_vote",
-            arguments=[
-                U64Value(proposal),
-                StringValue(vote.value),
-                BigUIntValue(power),
-                BytesValue(proof)
-            ],
-            gas_price=gas_price,
-            guardian=sender.guardian
-        )
+    def vote_via_liquid_staking_many(self, items: list[tuple[AccountWrapper, int, bytes]], contract: str, proposal: int, vote: VoteType, gas_price: int) -> list[Transaction]:
+        contract_address = address_from_bech32(contract)
+        # Gas estimator might not work, thus we fall back to a hard-coded value (unless a tighter one has been learned).
+        gas_limit = self.gas_profiles.get_gas_limit(contract, "delegate_vote", 100_000_000)
+        # Proposal and vote are the same for all transactions, thus encoded only once.
+        proposal_encoded = encode_top_level(U64Value(proposal))
+        vote_encoded = encode_top_level(StringValue(vote.value))
 
-        return transaction
+        controller = self.smart_contract_controller
+        transactions: list[Transaction] = []
+
+        for sender, power, proof in items:
+            transaction = controller.create_transaction_for_execute(
+                sender=sender.account,
+                nonce=self.nonce_manager.allocate(sender),
+                contract=contract_address,
+                gas_limit=gas_limit,
+                function="delegate_vote",
+                arguments=[
+                    proposal_encoded,
+                    vote_encoded,
+                    encode_top_level(BigUIntValue(power)),
+                    encode_top_level(BytesValue(proof))
+                ],
+                gas_price=gas_price,
+                guardian=sender.guardian
+            )
+
+            transactions.append(transaction)
+
+        return transactions
 
     def get_direct_vote(self, voter: Address, proposal: int) -> Optional[OnChainVote]:
-        return self._get_past_vote(voter.to_bech32(), self.configuration.system_governance_contract, "vote", "vote", proposal)
+        return self._get_past_vote(voter.to_bech32(), self.configuration.system_governance_contract, proposal)
 
     def get_vote_via_legacy_delegation(self, voter: Address, proposal: int) -> Optional[OnChainVote]:
-        return self._get_past_vote(voter.to_bech32(), self.configuration.legacy_delegation_contract, "delegateVote", "delegateVote", proposal)
+        return self._get_past_vote(voter.to_bech32(), self.configuration.legacy_delegation_contract, proposal)
 
     def get_vote_via_liquid_staking(self, voter: Address, contract: str, proposal: int) -> Optional[OnChainVote]:
-        return self._get_past_vote(voter.to_bech32(), contract, "delegate_vote", "delegateVote", proposal)
+        return self._get_past_vote(voter.to_bech32(), contract, proposal)
 
-    def _get_past_vote(self, voter: str, contract: str, function: str, event_identifier: str, proposal: int) -> Optional[OnChainVote]:
-        url = f"accounts/{voter}/transactions"
-        size = MAX_NUM_TRANSACTIONS_TO_FETCH_OF_TYPE_VOTE
-        reasonably_recent_timestamp = int((datetime.now(timezone.utc) - timedelta(days=30)).timestamp())
+    def _get_past_vote(self, voter: str, contract: str, proposal: int) -> Optional[OnChainVote]:
+        if self.votes_index is None:
+            raise ProgrammingError("votes index not loaded (see 'load_votes_index()')")
 
-        transactions = self._api_do_get(url, {
-            "status": "success",
-            "receiver": contract,
-            "function": function,
-            "withLogs": "true",
-            "withScResults": "true",
-            "size": size,
-            "after": reasonably_recent_timestamp
-        })
+        return self.votes_index.get_vote(voter, contract, proposal)
 
-        if len(transactions) == size:
-            print(f"\tRetrieved {size} transactions. [red]There could be more![/red]")
+    def load_votes_index(self, channels: list[VotingChannel], after_timestamp: int = 0):
+        # Past votes are looked up in the (persisted) votes index, refreshed once, up front (the lookups themselves are local).
+        index = VotesIndex.load(self.votes_index_path)
 
-        for transaction in transactions:
-            timestamp = transaction.get("timestamp", 0)
+        for channel in channels:
+            self._refresh_votes_index_of_channel(index, channel, after_timestamp)
+
+        index.save(self.votes_index_path)
+        self.votes_index = index
+
+    def get_direct_voting_channel(self) -> VotingChannel:
+        return VotingChannel(self.configuration.system_governance_contract, "vote", "vote")
+
+    def get_legacy_delegation_voting_channel(self) -> VotingChannel:
+        return VotingChannel(self.configuration.legacy_delegation_contract, "delegateVote", "delegateVote")
+
+    def get_liquid_staking_voting_channel(self, contract: str) -> VotingChannel:
+        return VotingChannel(contract, "delegate_vote", "delegateVote")
+
+    def get_voting_channels(self) -> list[VotingChannel]:
+        channels = [self.get_direct_voting_channel(), self.get_legacy_delegation_voting_channel()]
+
+        for contract in self.configuration.liquid_staking_contracts:
+            channels.append(self.get_liquid_staking_voting_channel(contract))
+
+        return channels
+
+    def refresh_votes_index(self, index: VotesIndex, after_timestamp: int = 0):
+        for channel in self.get_voting_channels():
+            self._refresh_votes_index_of_channel(index, channel, after_timestamp)
+
+    def _refresh_votes_index_of_channel(self, index: VotesIndex, channel: VotingChannel, after_timestamp: int):
+        size = VOTES_INDEX_PAGE_SIZE
+        # Timestamps have a granularity of one second, thus we re-scan the last second (already known votes are simply re-learned).
+        after = max(index.get_cursor(channel.contract) - 1, after_timestamp)
+        offset = 0
+        num_transactions = 0
+
+        print(f"Scanning votes on [yellow]{channel.contract}[/yellow], after timestamp {after}...")
+
+        while True:
+            transactions = self._api_do_get("transactions", {
+                "status": "success",
+                "receiver": channel.contract,
+                "function": channel.function,
+                "withLogs": "true",
+                "withScResults": "true",
+                "order": "asc",
+                "after": after,
+                "from": offset,
+                "size": size
+            }, API_FIELDS_OF_VOTE_TRANSACTIONS)
+
+            for transaction in transactions:
+                for vote in self._extract_votes(transaction, channel.contract, channel.event_identifier):
+                    index.learn_vote(vote)
+
+                index.set_cursor(channel.contract, transaction.get("timestamp", 0))
 
-            all_events: list[Any] = []
-            all_events.extend(transaction.get("logs", {}).get("events", []))
+            num_transactions += len(transactions)
 
-            for result in transaction.get("results"):
-                all_events.extend(result.get("logs", {}).get("events", []))
+            if len(transactions) < size:
+                break
 
-            for event in all_events:
-                if event.get("identifier") != event_identifier:
-                    continue
+            offset += size
 
-                topics = event.get("topics", [])
+            # Pagination by offset is limited, thus we move the time window forward.
+            if offset + size > API_MAX_PAGINATION_WINDOW:
+                latest_timestamp = index.get_cursor(channel.contract)
+                if latest_timestamp - 1 <= after:
+                    raise TransientError(f"too many transactions within the same second, cannot paginate (contract = {channel.contract})")
 
-                event_proposal_base64 = topics[0]
-                event_proposal_bytes = base64.b64decode(event_proposal_base64)
-                event_proposal = U64Value()
-                event_proposal.decode_top_level(event_proposal_bytes)
-                event_vote_type_base64 = topics[1]
-                event_vote_type = VoteType(base64.b64decode(event_vote_type_base64).decode())
+                after = latest_timestamp - 1
+                offset = 0
 
-                if event_proposal.value == proposal:
-                    return OnChainVote(voter, proposal, contract, timestamp, event_vote_type)
+        print(f"\tScanned {num_transactions} transactions.")
 
-        return None
+    def _extract_votes(self, transaction: dict[str, Any], contract: str, event_identifier: str) -> list[OnChainVote]:
+        voter = transaction.get("sender", "")
+        timestamp = transaction.get("timestamp", 0)
+
+        all_events: list[Any] = []
+        all_events.extend(transaction.get("logs", {}).get("events", []))
+
+        for result in transaction.get("results", []):
+            all_events.extend(result.get("logs", {}).get("events", []))
+
+        votes: list[OnChainVote] = []
+
+        for event in all_events:
+            if event.get("identifier") != event_identifier:
+                continue
+
+            topics = event.get("topics", [])
+
+            event_proposal_base64 = topics[0]
+            event_proposal_bytes = base64.b64decode(event_proposal_base64)
+            event_proposal = U64Value()
+            event_proposal.decode_top_level(event_proposal_bytes)
+            event_vote_type_base64 = topics[1]
+            event_vote_type = VoteType(base64.b64decode(event_vote_type_base64).decode())
+
+            votes.append(OnChainVote(voter, event_proposal.value, contract, timestamp, event_vote_type))
+
+        return votes
 
     def get_guardian_data(self, address: Address):
         response = self.proxy_network_provider.do_get_generic(f"address/{address.to_bech32()}/guardian-data")
@@ -436,10 +708,10 @@ class MyEntrypoint:
         return access_token
 
     def set_guardian(self, sender: AccountWrapper, guardian: Address) -> Transaction:
-        controller = self.network_entrypoint.create_account_controller()
+        controller = self.account_controller
         transaction = controller.create_transaction_for_setting_guardian(
             sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
+            nonce=self.nonce_manager.allocate(sender),
             guardian_address=guardian,
             service_id=COSIGNER_SERVICE_ID,
             guardian=sender.guardian
@@ -448,10 +720,10 @@ class MyEntrypoint:
         return transaction
 
     def guard_account(self, sender: AccountWrapper) -> Transaction:
-        controller = self.network_entrypoint.create_account_controller()
+        controller = self.account_controller
         transaction = controller.create_transaction_for_guarding_account(
             sender=sender.account,
-            nonce=sender.account.get_nonce_then_increment(),
+            nonce=self.nonce_manager.allocate(sender),
         )
 
         return transaction
@@ -459,7 +731,7 @@ class MyEntrypoint:
     def get_custom_tokens(self, address: Address, identifier_or_collection: str) -> list[Token]:
         # For the moment, we ignore NFTs.
         # We have to perform this GET, so that we can observe all MetaESDTs (all nonces) held by the account, as well.
-        data_esdt_and_meta: list[dict[str, Any]] = self.api_network_provider.do_get_generic(
+        data_esdt_and_meta = self.api_network_provider.do_get_streamed(
             f"accounts/{address.to_bech32()}/tokens", {
                 "from": 0,
                 "size": MAX_NUM_CUSTOM_TOKENS_TO_FETCH,
@@ -501,7 +773,142 @@ class MyEntrypoint:
         balance = response.get("balance", 0)
         return balance
 
-    def send_multiple(self, auth_app: AuthApp, wrappers: list[TransactionWrapper], chunk_size: int = DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS):
+    def create_transactions_concurrently(
+        self,
+        accounts_wrappers: list[AccountWrapper],
+        create_transaction: Callable[[AccountWrapper], Transaction],
+    ) -> tuple[list[TransactionWrapper], dict[str, str]]:
+        # Transactions (at most one per account) are built concurrently, thus signing must be deferred (see "signing.py").
+        # This way, gas estimations (simulations) run ahead of signing, without interleaving signing devices (e.g. Ledger).
+        for wrapper in accounts_wrappers:
+            if not isinstance(wrapper.account, DeferredSigningAccount):
+                raise ProgrammingError("transactions can only be built concurrently if signing is deferred")
+
+        errors_by_address: dict[str, str] = {}
+
+        def create_one(wrapper: AccountWrapper) -> Optional[TransactionWrapper]:
+            nonce_state = self.nonce_manager.save_state(wrapper)
+
+            try:
+                transaction = create_transaction(wrapper)
+                return TransactionWrapper(transaction, wrapper.wallet_name)
+            except GasLimitEstimationError as error:
+                # Give the nonce back, since no transaction is created.
+                self.nonce_manager.restore_state(wrapper, nonce_state)
+                errors_by_address[wrapper.address.to_bech32()] = str(error.error)
+                return None
+
+        results = Pool(NUM_PARALLEL_GAS_ESTIMATIONS).map(create_one, accounts_wrappers)
+        transactions_wrappers = [item for item in results if item is not None]
+
+        estimator = self.network_entrypoint.gas_limit_estimator
+        print(f"Gas estimations: {estimator.num_misses} simulated, {estimator.num_hits} reused.")
+
+        return transactions_wrappers, errors_by_address
+
+    def get_accounts_snapshot(self, addresses: list[str]) -> dict[str, tuple[int, int]]:
+        # Nonce & balance of many accounts, fetched in bulk.
+        snapshot: dict[str, tuple[int, int]] = {}
+
+        for chunk in split_to_chunks(addresses, ACCOUNTS_SNAPSHOT_CHUNK_SIZE):
+            response = self.proxy_network_provider.do_post_generic("address/bulk", chunk)
+
+            for address, item in response.get("accounts", {}).items():
+                snapshot[address] = (int(item.get("nonce", 0)), int(item.get("balance", 0)))
+
+        return snapshot
+
+    def preflight(self, wrappers: list[TransactionWrapper]) -> list[TransactionWrapper]:
+        print(f"Pre-flight checks for {len(wrappers)} transactions...")
+
+        senders = list(dict.fromkeys(wrapper.transaction.sender.to_bech32() for wrapper in wrappers))
+        snapshot = self.get_accounts_snapshot(senders)
+        network_config = self.proxy_network_provider.get_network_config()
+        transaction_computer = TransactionComputer()
+
+        # All transactions are simulated against the current state. The ones further in line (nonce-wise) are simulated as if they were next
+        # (nonce overridden, signature not checked): the effects of the previous transactions of the sender are not taken into account.
+        def simulate(wrapper: TransactionWrapper) -> str:
+            account_nonce = snapshot.get(wrapper.transaction.sender.to_bech32(), (0, 0))[0]
+            return self._simulate_transaction(wrapper, account_nonce)
+
+        simulation_problems = Pool(NUM_PARALLEL_SIMULATIONS).map(simulate, wrappers)
+        problems: dict[str, str] = {wrapper.get_hash(): problem for wrapper, problem in zip(wrappers, simulation_problems) if problem}
+
+        print(f"Simulated {len(wrappers)} transactions, {len(problems)} would fail.")
+
+        # Transactions already pending in the mempool (e.g. of a previous run) will also take from the balances.
+        pending_costs = Pool(NUM_PARALLEL_GET_NONCE_REQUESTS).map(lambda sender: self.get_pending_cost(Address.new_from_bech32(sender)), senders)
+        pending_cost_by_sender: dict[str, Optional[int]] = dict(zip(senders, pending_costs))
+
+        if any(cost is None for cost in pending_costs):
+            print("\t[yellow]Warning:[/yellow] for some senders, the mempool cannot be inspected; the fees of their pending transactions (if any) are not accounted for.")
+
+        # Then, each sender must afford the fees (and the value) of all its transactions.
+        wrappers_sorted = sorted(wrappers, key=lambda wrapper: (wrapper.transaction.sender.to_bech32(), wrapper.transaction.nonce))
+        costs_by_sender: dict[str, int] = {}
+        doomed_senders: set[str] = set()
+
+        for wrapper in wrappers_sorted:
+            sender = wrapper.transaction.sender.to_bech32()
+            _, balance = snapshot.get(sender, (0, 0))
+            fee = transaction_computer.compute_transaction_fee(wrapper.transaction, network_config)
+            costs_by_sender[sender] = costs_by_sender.get(sender, pending_cost_by_sender.get(sender) or 0) + fee + wrapper.transaction.value
+
+            if costs_by_sender[sender] > balance:
+                problems.setdefault(wrapper.get_hash(), f"insufficient balance, {balance} < {costs_by_sender[sender]} (fees and value, cumulated, including pending transactions)")
+
+            # Subsequent transactions of a sender would be stuck (nonce gap), thus are dropped, as well.
+            if sender in doomed_senders:
+                problems.setdefault(wrapper.get_hash(), "a previous transaction of the sender would fail")
+            if wrapper.get_hash() in problems:
+                doomed_senders.add(sender)
+
+        viable: list[TransactionWrapper] = []
+
+        for wrapper in wrappers:
+            problem = problems.get(wrapper.get_hash())
+
+            if problem:
+                print(f"\t[red]Dropped[/red] {wrapper.get_hash()} ([yellow]{wrapper.label}[/yellow]): {problem}")
+            else:
+                viable.append(wrapper)
+
+        print(f"Pre-flight checks: {len(viable)} transactions will be sent, {len(wrappers) - len(viable)} dropped.")
+        return viable
+
+    def _simulate_transaction(self, wrapper: TransactionWrapper, account_nonce: int) -> str:
+        transaction = wrapper.transaction
+
+        if transaction.nonce > account_nonce:
+            # A copy: the actual transaction (already signed) must stay untouched.
+            transaction = copy.copy(transaction)
+            transaction.nonce = account_nonce
+
+        try:
+            simulated = self.proxy_network_provider.simulate_transaction(transaction, check_signature=False)
+        except NetworkProviderError as error:
+            # Can't tell, thus we don't drop the transaction.
+            print(f"\t[yellow]Cannot simulate[/yellow] {wrapper.get_hash()} ([yellow]{wrapper.label}[/yellow]): {error}")
+            return ""
+
+        if simulated.status.is_failed:
+            return f"simulation failed: {simulated.raw.get('failReason', '')}"
+
+        return ""
+
+    def send_multiple(
+        self,
+        auth_app: AuthApp,
+        wrappers: list[TransactionWrapper],
+        chunk_size: int = DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS,
+        preflight: bool = False
+    ):
+        self._check_signed(wrappers)
+
+        if preflight:
+            wrappers = self.preflight(wrappers)
+
         print("Cosigning transactions, if necessary...")
         self.guard_transactions(auth_app, wrappers)
 
@@ -515,17 +922,212 @@ class MyEntrypoint:
             for item in chunk:
                 print(f"\t{item.get_hash()} ([yellow]{item.label}[/yellow])")
 
-            num_sent, _ = self.network_entrypoint.send_transactions([item.transaction for item in chunk])
+            transactions = [item.transaction for item in chunk]
+            num_sent, hashes = self._send_transactions(transactions)
             print(f"Chunk {index}: sent {num_sent} transactions.")
-
-            if num_sent != len(chunk):
-                raise KnownError(f"sent {num_sent} transactions, instead of {len(chunk)}")
+            self._check_sent(transactions, hashes)
 
             self.await_processing_started(chunk)
 
         self.await_completed(wrappers)
+        self.report_network_usage()
+
+    def send_pipelined(self, auth_app: AuthApp, wrappers: list[TransactionWrapper], preflight: bool = False) -> list[TransactionOnNetwork]:
+        self._check_signed(wrappers)
+
+        if preflight:
+            wrappers = self.preflight(wrappers)
+
+        # Transactions flow through the stages grouped by sender (cosigning is per sender; nonces must be sent in order).
+        # This way, cosigning the transactions of a sender overlaps with sending the ones of another, and so on.
+        lock = threading.Lock()
+        groups: dict[str, list[TransactionWrapper]] = {}
+
+        for wrapper in wrappers:
+            groups.setdefault(wrapper.transaction.sender.to_bech32(), []).append(wrapper)
+
+        def cosign(group: list[TransactionWrapper]) -> list[TransactionWrapper]:
+            transactions = [wrapper.transaction for wrapper in group if wrapper.transaction.guardian is not None]
+            if transactions:
+                self._cosign_transactions_of_sender(auth_app, group[0].transaction.sender.to_bech32(), transactions)
+            return group
+
+        def send(group: list[TransactionWrapper]) -> list[TransactionWrapper]:
+            # Bounded requests (as in "send_multiple()"); chunks of a sender are sent in order (nonces).
+            # Before sending the next chunk, the previous one must start processing (per-sender mempool limits).
+            chunks: list[list[TransactionWrapper]] = list(split_to_chunks(group, DEFAULT_CHUNK_SIZE_OF_SEND_TRANSACTIONS))
+
+            for index, chunk in enumerate(chunks):
+                if index > 0:
+                    self.await_processing_started(chunks[index - 1])
+
+                transactions = [wrapper.transaction for wrapper in chunk]
+                _, hashes = self._send_transactions(transactions)
+
+                for wrapper, transaction_hash in zip(chunk, hashes):
+                    if transaction_hash:
+                        print(f"Sent: {wrapper.get_hash()} ([yellow]{wrapper.label}[/yellow])")
+
+                self._check_sent(transactions, hashes)
+
+            return group
+
+        def await_completed(group: list[TransactionWrapper]) -> list[TransactionOnNetwork]:
+            transactions_on_network: list[TransactionOnNetwork] = []
+
+            for wrapper in group:
+                self._await_nonce_passed(wrapper.transaction, wrapper.get_hash())
+                transaction_on_network = self.api_network_provider.await_transaction_completed(
+                    transaction_hash=wrapper.get_hash(),
+                    options=self.transaction_awaiting_options
+                )
+
+                print(f"Completed: {self.configuration.explorer_url}/transactions/{wrapper.get_hash()}")
+                transactions_on_network.append(transaction_on_network)
+
+            # Learned as groups complete (not lost if another group fails).
+            with lock:
+                self.gas_profiles.learn_from_transactions(transactions_on_network)
+
+            return transactions_on_network
+
+        pipeline = Pipeline([
+            PipelineStage("cosign", cosign, NUM_PARALLEL_COSIGNING_REQUESTS),
+            PipelineStage("send", send, NUM_PARALLEL_SEND_REQUESTS),
+            PipelineStage("await completion", await_completed, NUM_PARALLEL_GET_TRANSACTION_REQUESTS),
+        ])
+
+        print(f"Cosigning (if necessary), sending and awaiting {len(wrappers)} transactions, from {len(groups)} senders...")
+
+        try:
+            results = pipeline.run(groups.values())
+        finally:
+            self.gas_profiles.save(self.gas_profiles_path)
+
+        transactions_on_network = [item for group in results for item in group]
+
+        self.report_network_usage()
+        return transactions_on_network
+
+    def save_bundle(self, auth_app: AuthApp, wrappers: list[TransactionWrapper], path: Path, preflight: bool = False):
+        # Instead of sending, transactions are saved (cosigned, if necessary) into a bundle, to be broadcasted later (see "broadcast_bundle.py").
+        self._check_signed(wrappers)
+
+        if preflight:
+            wrappers = self.preflight(wrappers)
+
+        print("Cosigning transactions, if necessary...")
+        self.guard_transactions(auth_app, wrappers)
+
+        save_bundle(path, self.configuration.chain_id, wrappers)
+        ux.show_message(f"Bundle saved: {path} ({len(wrappers)} transactions)")
+
+    def broadcast_bundle(self, entries: Iterable[BundleEntry], window: int, chunk_size: int) -> list[tuple[BundleEntry, str]]:
+        # Entries are streamed: sent in chunks, then awaited, while the next chunks are being sent.
+        # The number of transactions in flight (sent, but not yet completed) is bounded by the window:
+        # a permit is taken for each transaction before sending, and given back once it's completed.
+        if window < 1:
+            raise KnownError(f"window must be positive: {window}")
+
+        chunk_size = min(chunk_size, window)
+        statuses: list[tuple[BundleEntry, str]] = []
+        lock = threading.Lock()
+        permits = threading.Semaphore(window)
+        failed = threading.Event()
+
+        def send(chunk: list[BundleEntry]) -> Optional[list[BundleEntry]]:
+            for _ in chunk:
+                permits.acquire()
+
+            if failed.is_set():
+                return None
+
+            transactions = [entry.transaction for entry in chunk]
+            num_sent, hashes = self._send_transactions(transactions)
+            print(f"Sent {num_sent} transactions (of {len(chunk)}).")
+            self._check_sent(transactions, hashes)
+
+            return chunk
+
+        def await_completed(chunk: list[BundleEntry]):
+            try:
+                await_completed_entries(chunk)
+            except BaseException:
+                # The remaining permits would never be given back (the pipeline is aborted): unblock the sender.
+                failed.set()
+                permits.release(window)
+                raise
+
+        def await_completed_entries(chunk: list[BundleEntry]):
+            for entry in chunk:
+                self._await_nonce_passed(entry.transaction, entry.hash)
+                transaction_on_network = self.api_network_provider.await_transaction_completed(
+                    transaction_hash=entry.hash,
+                    options=self.transaction_awaiting_options
+                )
+
+                status = transaction_on_network.status.status
+                color = "green" if transaction_on_network.status.is_successful else "red"
+                print(f"Completed ([{color}]{status}[/{color}]): {self.configuration.explorer_url}/transactions/{entry.hash} ([yellow]{entry.label}[/yellow])")
+
+                with lock:
+                    statuses.append((entry, status))
+                    self.gas_profiles.learn_from_transactions([transaction_on_network])
+
+                permits.release()
+
+        pipeline = Pipeline([
+            PipelineStage("send", send),
+            PipelineStage("await completion", await_completed, NUM_PARALLEL_GET_TRANSACTION_REQUESTS),
+        ], queue_size=max(1, window // chunk_size))
+
+        try:
+            pipeline.run(split_to_chunks(entries, chunk_size))
+        finally:
+            self.gas_profiles.save(self.gas_profiles_path)
+
+        self.report_network_usage()
+        return statuses
+
+    def _send_transactions(self, transactions: list[Transaction]) -> tuple[int, list[bytes]]:
+        if self.fan_out:
+            return self.proxy_network_provider.send_transactions_to_all(transactions)
+        return self.network_entrypoint.send_transactions(transactions)
+
+    def report_network_usage(self):
+        coalescer = REQUEST_COALESCER
+        print(f"Network requests (GET): {coalescer.num_requests}, saved {coalescer.get_num_saved()} ({coalescer.num_coalesced} coalesced while in flight, {coalescer.num_cache_hits} reused).")
+
+        endpoints = self.proxy_network_provider.endpoints
+        if not self.fan_out or endpoints is None:
+            return
+
+        print("Broadcasts, by proxy:")
+
+        for endpoint in endpoints.endpoints:
+            average_latency = endpoint.broadcast_seconds / endpoint.num_broadcasts if endpoint.num_broadcasts else 0
+            print(f"\t{endpoint.url}: accepted {endpoint.num_accepted} transactions ({endpoint.num_accepted_first} first), average latency {average_latency:.3f} s, errors {endpoint.num_broadcast_errors}")
+
+    def _check_signed(self, wrappers: list[TransactionWrapper]):
+        # E.g. signing was deferred (see "defer_signing()"), but "sign_transactions()" wasn't called.
+        unsigned = [wrapper for wrapper in wrappers if not wrapper.transaction.signature]
+        if unsigned:
+            raise ProgrammingError(f"{len(unsigned)} transactions are not signed, e.g. {unsigned[0].label} (nonce = {unsigned[0].transaction.nonce})")
+
+    def _check_sent(self, transactions: list[Transaction], hashes: list[bytes]):
+        # A rejected transaction leaves a nonce gap: the subsequent transactions of its sender are stuck in the mempool.
+        # When recalling nonces (e.g. on the next run), gaps found in the mempool are filled first.
+        rejected = [transaction for transaction, transaction_hash in zip(transactions, hashes) if not transaction_hash]
+
+        for transaction in rejected:
+            print(f"\t[red]Rejected[/red]: transaction with nonce {transaction.nonce}, from {transaction.sender.to_bech32()}")
+
+        if rejected:
+            raise KnownError(f"sent {len(transactions) - len(rejected)} transactions, instead of {len(transactions)} (nonce gaps will be filled on the next run)")
 
     def send_one_by_one(self, auth_app: AuthApp, wrappers: list[TransactionWrapper]):
+        self._check_signed(wrappers)
+
         print("Cosigning transactions, if necessary...")
         self.guard_transactions(auth_app, wrappers)
 
@@ -549,29 +1151,26 @@ class MyEntrypoint:
             sender = wrapper.transaction.sender.to_bech32()
             grouped_by_sender.setdefault(sender, []).append(wrapper.transaction)
 
-        # Signatures are applied inline.
         for sender, transactions in grouped_by_sender.items():
-            while True:
-                try:
-                    print(f"Attempt to co-sign transactions from {sender}...")
-                    code = auth_app.get_code(sender)
-                    self.cosigner.sign_multiple_transactions(code, transactions)
-                    break
-                except KnownError as error:
-                    print(f"Unexpected error: [red]{error}[/red], will retry in {COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS} seconds...")
-                    time.sleep(COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS)
+            self._cosign_transactions_of_sender(auth_app, sender, transactions)
+
+    def _cosign_transactions_of_sender(self, auth_app: AuthApp, sender: str, transactions: list[Transaction]):
+        # Signatures are applied inline.
+        while True:
+            try:
+                print(f"Attempt to co-sign transactions from {sender}...")
+                code = auth_app.get_code(sender)
+                self.cosigner.sign_multiple_transactions(code, transactions)
+                break
+            except KnownError as error:
+                print(f"Unexpected error: [red]{error}[/red], will retry in {COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS} seconds...")
+                time.sleep(COSIGNER_SIGN_TRANSACTIONS_RETRY_DELAY_IN_SECONDS)
 
     def await_processing_started(self, wrappers: list[TransactionWrapper]) -> list[TransactionOnNetwork]:
         print(f"Await processing started for {len(wrappers)} transactions...")
 
         def await_processing_started_one(wrapper: TransactionWrapper) -> TransactionOnNetwork:
-            condition: Callable[[AccountOnNetwork], bool] = lambda account: account.nonce > wrapper.transaction.nonce
-            self.proxy_network_provider.await_account_on_condition(
-                address=wrapper.transaction.sender,
-                condition=condition,
-                options=self.account_awaiting_options,
-            )
-
+            self._await_nonce_passed(wrapper.transaction, wrapper.get_hash())
             transaction_on_network = self.proxy_network_provider.get_transaction(wrapper.get_hash())
 
             print(f"Started: {self.configuration.explorer_url}/transactions/{wrapper.get_hash()}")
@@ -584,6 +1183,52 @@ class MyEntrypoint:
 
         return transactions_on_network
 
+    def _await_nonce_passed(self, transaction: Transaction, transaction_hash: str):
+        # Watchdog: a transaction that, within a deadline (a few rounds), is neither processed (the nonce of the sender has passed it)
+        # nor in the mempool, has been dropped. Then, the very same (signed) transaction is broadcasted again (same hash, thus idempotent).
+        deadline_seconds = self.get_round_duration_seconds() * STUCK_TRANSACTION_DEADLINE_IN_ROUNDS
+        timeout_seconds = max(self.account_awaiting_options.timeout_in_milliseconds / 1000, deadline_seconds * (MAX_NUM_REBROADCASTS + 1))
+        polling_seconds = self.account_awaiting_options.polling_interval_in_milliseconds / 1000
+
+        start = time.monotonic()
+        deadline = start + deadline_seconds
+        num_rebroadcasts = 0
+
+        while True:
+            account = self.proxy_network_provider.get_account(transaction.sender)
+            if account.nonce > transaction.nonce:
+                return
+
+            now = time.monotonic()
+            if now > start + timeout_seconds:
+                raise KnownError(f"transaction not processed in time: {transaction_hash}")
+
+            if now > deadline:
+                deadline = now + deadline_seconds
+                pending_nonces = self.get_pending_nonces(transaction.sender)
+
+                if pending_nonces is None:
+                    # Cannot tell whether the transaction has been dropped: simply wait (no rebroadcasts), as the awaiter would.
+                    deadline = math.inf
+                    timeout_seconds = self.account_awaiting_options.timeout_in_milliseconds / 1000
+                elif transaction.nonce not in pending_nonces:
+                    if num_rebroadcasts == MAX_NUM_REBROADCASTS:
+                        raise KnownError(f"transaction dropped, even after {num_rebroadcasts} rebroadcasts: {transaction_hash}")
+
+                    num_rebroadcasts += 1
+                    print(f"\t[yellow]Rebroadcasting[/yellow] (attempt {num_rebroadcasts}) {transaction_hash}: neither processed, nor in the mempool")
+
+                    try:
+                        self._send_transactions([transaction])
+                    except NetworkProviderError as error:
+                        print(f"\t[yellow]Cannot rebroadcast[/yellow] {transaction_hash}: {error}")
+
+            time.sleep(polling_seconds)
+
+    def get_round_duration_seconds(self) -> float:
+        round_duration = self.timecache.get("round_duration", lambda: (self.proxy_network_provider.get_network_config().round_duration, 3600))
+        return round_duration / 1000
+
     def await_completed(self, wrappers: list[TransactionWrapper]) -> list[TransactionOnNetwork]:
         def await_completed_one(wrapper: TransactionWrapper) -> TransactionOnNetwork:
             transaction_on_network = self.api_network_provider.await_transaction_completed(
@@ -601,9 +1246,39 @@ class MyEntrypoint:
             wrappers
         )
 
+        self.gas_profiles.learn_from_transactions(transactions_on_network)
+        self.gas_profiles.save(self.gas_profiles_path)
+
         return transactions_on_network
 
-    def _api_do_get(self, url: str, url_parameters: dict[str, Any]):
+    def _api_do_get_streamed(self, url: str, url_parameters: dict[str, Any], fields: Optional[list[str]] = None) -> Iterator[Any]:
+        # Elements are handed out as soon as they are decoded (see "do_get_streamed()").
+        if fields:
+            url_parameters = {**url_parameters, "fields": ",".join(fields)}
+
+        for attempt in range(NETWORK_PROVIDER_NUM_RETRIES):
+            num_items = 0
+
+            try:
+                for item in self.api_network_provider.do_get_streamed(url, url_parameters):
+                    num_items += 1
+                    yield item
+                return
+            except NetworkProviderError as error:
+                print(f"Attempt #{attempt}, [red]failed to get {error.url}[/red]")
+
+                # Once elements have been handed out, we cannot start over.
+                is_last_attempt = attempt == NETWORK_PROVIDER_NUM_RETRIES - 1
+                if num_items or is_last_attempt:
+                    raise TransientError("cannot get from API", error)
+
+                time.sleep(get_backoff_delay(attempt))
+
+    def _api_do_get(self, url: str, url_parameters: dict[str, Any], fields: Optional[list[str]] = None):
+        # Projection: the API only returns the fields actually read by the caller.
+        if fields:
+            url_parameters = {**url_parameters, "fields": ",".join(fields)}
+
         latest_error = None
 
         for attempt in range(NETWORK_PROVIDER_NUM_RETRIES):
@@ -616,6 +1291,6 @@ class MyEntrypoint:
 
                 is_last_attempt = attempt == NETWORK_PROVIDER_NUM_RETRIES - 1
                 if not is_last_attempt:
-                    time.sleep(NETWORK_PROVIDERS_RETRY_DELAY_IN_SECONDS)
+                    time.sleep(get_backoff_delay(attempt))
 
-        raise TransientError(f"cannot get from API", latest_error)
+        raise TransientError("cannot get from API", latest_error)
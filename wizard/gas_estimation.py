@@ -0,0 +1,92 @@
+import threading
+from typing import Any, Optional
+
+from multiversx_sdk import NetworkEntrypoint, ProxyNetworkProvider, Transaction
+from multiversx_sdk.gas_estimator.gas_limit_estimator import (
+    GasLimitEstimator, INetworkProvider)
+
+TransactionShape = tuple[Any, ...]
+
+
+# Transactions of the same shape (e.g. the same vote, from different accounts) are expected to consume the same amount of gas.
+def get_transaction_shape(transaction: Transaction) -> TransactionShape:
+    parts = transaction.data.decode().split("@") if transaction.data else [""]
+    function = parts[0]
+    arguments_lengths = tuple(len(part) for part in parts[1:])
+
+    return (
+        transaction.receiver.to_bech32(),
+        transaction.value > 0,
+        function,
+        arguments_lengths,
+        transaction.guardian is not None,
+        transaction.relayer is not None,
+    )
+
+
+# Simulates (estimates) each transaction shape only once. Concurrent requests for the same shape wait for a single simulation.
+# Errors are not cached: each transaction (account) gets its own attempt (and its own error).
+class CachingGasLimitEstimator(GasLimitEstimator):
+    def __init__(self, network_provider: INetworkProvider, gas_multiplier: Optional[float] = None):
+        super().__init__(network_provider, gas_multiplier)
+        self._cache: dict[TransactionShape, int] = {}
+        self._locks: dict[TransactionShape, threading.Lock] = {}
+        # Guards the cache, the per-shape locks and the counters (the simulations themselves run outside of it).
+        self._lock = threading.Lock()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def estimate_gas_limit(self, transaction: Transaction) -> int:
+        shape = get_transaction_shape(transaction)
+
+        gas_limit = self._get_cached(shape)
+        if gas_limit is not None:
+            return gas_limit
+
+        with self._get_lock(shape):
+            gas_limit = self._get_cached(shape)
+            if gas_limit is not None:
+                return gas_limit
+
+            with self._lock:
+                self.num_misses += 1
+
+            gas_limit = super().estimate_gas_limit(transaction)
+
+            with self._lock:
+                self._cache[shape] = gas_limit
+
+            return gas_limit
+
+    def _get_cached(self, shape: TransactionShape) -> Optional[int]:
+        with self._lock:
+            gas_limit = self._cache.get(shape)
+            if gas_limit is not None:
+                self.num_hits += 1
+            return gas_limit
+
+    def _get_lock(self, shape: TransactionShape) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(shape, threading.Lock())
+
+
+# All controllers & factories share one (caching) gas limit estimator.
+class MyNetworkEntrypoint(NetworkEntrypoint):
+    def __init__(
+        self,
+        network_provider: ProxyNetworkProvider,
+        chain_id: str,
+        with_gas_limit_estimator: Optional[bool] = None,
+        gas_limit_multiplier: Optional[float] = None
+    ) -> None:
+        super().__init__(
+            network_provider=network_provider,
+            chain_id=chain_id,
+            with_gas_limit_estimator=with_gas_limit_estimator,
+            gas_limit_multiplier=gas_limit_multiplier
+        )
+
+        self.gas_limit_estimator = CachingGasLimitEstimator(network_provider, gas_limit_multiplier)
+
+    def create_gas_limit_estimator(self) -> GasLimitEstimator:
+        return self.gas_limit_estimator
@@ -0,0 +1,85 @@
+import math
+from pathlib import Path
+from typing import Any
+
+from multiversx_sdk import TransactionOnNetwork
+from rich import print
+
+from wizard.constants import (GAS_PROFILE_MAX_NUM_SAMPLES,
+                              GAS_PROFILE_MIN_NUM_SAMPLES,
+                              GAS_PROFILE_SAFETY_MARGIN, WIZARD_CACHE_FOLDER)
+from wizard.utils import load_json_cache, save_json_cache
+
+
+# Gas used by past (completed) transactions, for a given contract & function.
+class GasProfile:
+    __slots__ = ("samples",)
+
+    def __init__(self, samples: list[int]) -> None:
+        self.samples = samples
+
+    def learn(self, gas_used: int):
+        self.samples.append(gas_used)
+        del self.samples[:-GAS_PROFILE_MAX_NUM_SAMPLES]
+
+    def is_reliable(self) -> bool:
+        return len(self.samples) >= GAS_PROFILE_MIN_NUM_SAMPLES
+
+    def propose_gas_limit(self) -> int:
+        return math.ceil(max(self.samples) * GAS_PROFILE_SAFETY_MARGIN)
+
+
+# Learns gas limits from completed transactions, so that (on later runs) tight limits are used instead of hard-coded ones.
+class GasProfiles:
+    def __init__(self, profiles: dict[str, GasProfile]) -> None:
+        self.profiles = profiles
+
+    @classmethod
+    def load(cls, file: Path) -> "GasProfiles":
+        data: dict[str, Any] = load_json_cache(file) or {}
+
+        try:
+            profiles = {key: GasProfile([int(sample) for sample in samples]) for key, samples in data.items()}
+        except (ValueError, TypeError, AttributeError) as error:
+            print(f"[yellow]Ignoring unreadable cache[/yellow] {file}: {error}")
+            profiles = {}
+
+        return cls(profiles)
+
+    def save(self, file: Path):
+        data = {key: profile.samples for key, profile in self.profiles.items()}
+        save_json_cache(file, data)
+
+    def get_gas_limit(self, contract: str, function: str, default: int) -> int:
+        profile = self.profiles.get(self._get_key(contract, function))
+
+        if profile is None or not profile.is_reliable():
+            return default
+
+        # Never go above the (known to work) default.
+        return min(profile.propose_gas_limit(), default)
+
+    def learn_from_transactions(self, transactions: list[TransactionOnNetwork]):
+        for transaction in transactions:
+            if not transaction.function:
+                continue
+
+            key = self._get_key(transaction.receiver.to_bech32(), transaction.function)
+
+            if not transaction.status.is_successful:
+                # A failed transaction (e.g. out of gas) invalidates what we have learned so far.
+                self.profiles.pop(key, None)
+                continue
+
+            gas_used = int(transaction.raw.get("gasUsed", 0))
+            if not gas_used:
+                continue
+
+            self.profiles.setdefault(key, GasProfile([])).learn(gas_used)
+
+    def _get_key(self, contract: str, function: str) -> str:
+        return f"{contract}/{function}"
+
+
+def get_gas_profiles_path(chain_id: str) -> Path:
+    return Path(WIZARD_CACHE_FOLDER).expanduser() / "gas" / f"{chain_id}.json"
@@ -0,0 +1,60 @@
+import math
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from multiversx_sdk import Address, TransactionStatus
+
+from wizard.constants import (GAS_PROFILE_MIN_NUM_SAMPLES,
+                              GAS_PROFILE_SAFETY_MARGIN)
+from wizard.gas_profiles import GasProfiles
+
+CONTRACT = Address(bytes([1]) * 32).to_bech32()
+
+
+# Only the fields read by "learn_from_transactions()".
+def create_transaction(gas_used: int, status: str = "success") -> Any:
+    return SimpleNamespace(
+        receiver=Address.new_from_bech32(CONTRACT),
+        function="vote",
+        status=TransactionStatus(status),
+        raw={"gasUsed": gas_used}
+    )
+
+
+def test_learn_then_propose_gas_limit():
+    profiles = GasProfiles({})
+    default = 10_000_000
+
+    profiles.learn_from_transactions([create_transaction(1_000_000)] * (GAS_PROFILE_MIN_NUM_SAMPLES - 1))
+    assert profiles.get_gas_limit(CONTRACT, "vote", default) == default
+
+    profiles.learn_from_transactions([create_transaction(2_000_000)])
+    assert profiles.get_gas_limit(CONTRACT, "vote", default) == math.ceil(2_000_000 * GAS_PROFILE_SAFETY_MARGIN)
+
+    # Never above the default.
+    assert profiles.get_gas_limit(CONTRACT, "vote", 1_000_000) == 1_000_000
+
+    # A failure invalidates the profile.
+    profiles.learn_from_transactions([create_transaction(2_000_000, "fail")])
+    assert profiles.get_gas_limit(CONTRACT, "vote", default) == default
+
+
+def test_save_then_load(tmp_path: Path):
+    file = tmp_path / "gas" / "D.json"
+    file.parent.mkdir()
+    profiles = GasProfiles({})
+    profiles.learn_from_transactions([create_transaction(1_000 + index) for index in range(GAS_PROFILE_MIN_NUM_SAMPLES)])
+    profiles.save(file)
+
+    loaded = GasProfiles.load(file)
+    assert loaded.get_gas_limit(CONTRACT, "vote", 10**9) == profiles.get_gas_limit(CONTRACT, "vote", 10**9)
+
+
+def test_load_unreadable_file(tmp_path: Path):
+    assert GasProfiles.load(tmp_path / "missing.json").profiles == {}
+
+    for content in ["{", "[1, 2]", '{"a": "b"}', '{"a": ["x"]}']:
+        file = tmp_path / "gas.json"
+        file.write_text(content)
+        assert GasProfiles.load(file).profiles == {}
@@ -1,12 +1,21 @@
 
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from multiversx_sdk import Address, VoteType
+from rich import print
+
+from wizard.addresses import address_from_bech32
+from wizard.constants import WIZARD_CACHE_FOLDER
+from wizard.proofs_index import (ProofsIndex, get_index_path,
+                                 is_index_up_to_date)
+from wizard.utils import iterate_json_array, load_json_cache, save_json_cache
 
 
 class GovernanceRecord:
+    __slots__ = ("address", "power", "proof")
+
     def __init__(self, address: Address, power: int, proof: bytes) -> None:
         self.address = address
         self.power = power
@@ -14,7 +23,7 @@ class GovernanceRecord:
 
     @classmethod
     def new_from_dictionary(cls, data: dict[str, Any]):
-        address = Address.new_from_bech32(data["address"])
+        address = address_from_bech32(data["address"])
         power = int(data["balance"])
         proof = bytes.fromhex(data["proof"])
 
@@ -24,16 +33,59 @@ class GovernanceRecord:
     def load_many_from_proofs_file(cls, proofs_file: Path):
         json_content = proofs_file.read_text()
         data = json.loads(json_content)
-        records = [GovernanceRecord.new_from_dictionary(item) for item in data]
 
+        # The input already holds the bech32 representation, no need to re-encode.
         records_by_adresses: dict[str, GovernanceRecord] = {
-            item.address.to_bech32(): item for item in records
+            item["address"]: GovernanceRecord.new_from_dictionary(item) for item in data
         }
 
         return records_by_adresses
 
+    @classmethod
+    def load_many_for_addresses(cls, proofs_file: Path, addresses: list[str]) -> dict[str, "GovernanceRecord"]:
+        # Prefer the compiled index (see "governance_proofs_compile.py"), if available and up-to-date.
+        index_file = get_index_path(proofs_file)
+
+        if index_file.is_file():
+            with ProofsIndex(index_file) as index:
+                if is_index_up_to_date(index, proofs_file):
+                    return cls._load_many_from_index(index, addresses)
+
+            print(f"[yellow]Index is stale, please recompile it: {index_file}[/yellow]")
+
+        return cls._load_many_from_proofs_file_streamed(proofs_file, addresses)
+
+    @classmethod
+    def _load_many_from_proofs_file_streamed(cls, proofs_file: Path, addresses: list[str]) -> dict[str, "GovernanceRecord"]:
+        # Records are parsed one by one; only the ones of interest are kept (and their proofs decoded).
+        wanted_addresses = set(addresses)
+        records_by_addresses: dict[str, GovernanceRecord] = {}
+
+        with open(proofs_file) as stream:
+            for item in iterate_json_array(stream):
+                if item["address"] in wanted_addresses:
+                    records_by_addresses[item["address"]] = cls.new_from_dictionary(item)
+
+        return records_by_addresses
+
+    @classmethod
+    def _load_many_from_index(cls, index: ProofsIndex, addresses: list[str]) -> dict[str, "GovernanceRecord"]:
+        records_by_addresses: dict[str, GovernanceRecord] = {}
+
+        for address in addresses:
+            address_object = address_from_bech32(address)
+            record = index.get(address_object.get_public_key())
+
+            if record is not None:
+                power, proof = record
+                records_by_addresses[address] = cls(address_object, power, proof)
+
+        return records_by_addresses
+
 
 class OnChainVote:
+    __slots__ = ("voter", "proposal", "contract", "timestamp", "vote_type")
+
     def __init__(self, voter: str, proposal: int, contract: str, timestamp: int, vote_type: VoteType) -> None:
         self.voter = voter
         self.proposal = proposal
@@ -41,6 +93,125 @@ class OnChainVote:
         self.timestamp = timestamp
         self.vote_type = vote_type
 
+    @classmethod
+    def new_from_dictionary(cls, data: dict[str, Any]):
+        voter = data["voter"]
+        proposal = int(data["proposal"])
+        contract = data["contract"]
+        timestamp = int(data["timestamp"])
+        vote_type = VoteType(data["vote"])
+
+        return cls(voter, proposal, contract, timestamp, vote_type)
+
+    def to_dictionary(self) -> dict[str, Any]:
+        return {
+            "voter": self.voter,
+            "proposal": self.proposal,
+            "contract": self.contract,
+            "timestamp": self.timestamp,
+            "vote": self.vote_type.value
+        }
+
+
+class VotingPower:
+    __slots__ = ("direct", "via_legacy_delegation", "direct_error")
+
+    def __init__(self, direct: int = 0, via_legacy_delegation: int = 0, direct_error: str = "") -> None:
+        self.direct = direct
+        self.via_legacy_delegation = via_legacy_delegation
+        # The system governance contract signals some conditions (e.g. "not enough stake") as query errors.
+        self.direct_error = direct_error
+
+
+# A way to vote: directly (system governance contract), via the legacy delegation contract, or via a liquid staking contract.
+class VotingChannel:
+    __slots__ = ("contract", "function", "event_identifier")
+
+    def __init__(self, contract: str, function: str, event_identifier: str) -> None:
+        self.contract = contract
+        self.function = function
+        self.event_identifier = event_identifier
+
+
+# One cell of the voting report: the status of an account, on a proposal, via a voting channel.
+class VotingReportEntry:
+    __slots__ = ("address", "wallet_name", "proposal", "channel", "contract", "power", "vote")
+
+    def __init__(self, address: str, wallet_name: str, proposal: int, channel: str, contract: str, power: int, vote: Optional[OnChainVote]) -> None:
+        self.address = address
+        self.wallet_name = wallet_name
+        self.proposal = proposal
+        self.channel = channel
+        self.contract = contract
+        self.power = power
+        self.vote = vote
+
+    def is_vote_missing(self) -> bool:
+        return bool(self.power) and self.vote is None
+
+    def to_dictionary(self) -> dict[str, Any]:
+        return {
+            "address": self.address,
+            "walletName": self.wallet_name,
+            "proposal": self.proposal,
+            "channel": self.channel,
+            "contract": self.contract,
+            "power": self.power,
+            "vote": self.vote.vote_type.value if self.vote else None,
+            "voteTimestamp": self.vote.timestamp if self.vote else None,
+            "missingVote": self.is_vote_missing()
+        }
+
+
+# Votes of all voters (on all proposals), as observed on the voting contracts.
+# Built once (scanning the transactions of the contracts, in pages), then refreshed incrementally.
+class VotesIndex:
+    def __init__(self, cursors: dict[str, int], votes: list[OnChainVote]) -> None:
+        # Per contract, the timestamp up to which transactions have been scanned.
+        self.cursors = cursors
+        self.votes: dict[tuple[str, str, int], OnChainVote] = {}
+
+        for vote in votes:
+            self.learn_vote(vote)
+
+    @classmethod
+    def load(cls, file: Path) -> "VotesIndex":
+        data = load_json_cache(file) or {}
+
+        try:
+            cursors = {contract: int(timestamp) for contract, timestamp in data.get("cursors", {}).items()}
+            votes = [OnChainVote.new_from_dictionary(item) for item in data.get("votes", [])]
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            # It's only a cache: it's rebuilt.
+            print(f"[yellow]Ignoring unreadable cache[/yellow] {file}: {error}")
+            return cls({}, [])
+
+        return cls(cursors, votes)
+
+    def save(self, file: Path):
+        data = {
+            "cursors": self.cursors,
+            "votes": [vote.to_dictionary() for vote in self.votes.values()]
+        }
+
+        save_json_cache(file, data)
+
+    def learn_vote(self, vote: OnChainVote):
+        self.votes[(vote.contract, vote.voter, vote.proposal)] = vote
+
+    def get_vote(self, voter: str, contract: str, proposal: int) -> Optional[OnChainVote]:
+        return self.votes.get((contract, voter, proposal))
+
+    def get_cursor(self, contract: str) -> int:
+        return self.cursors.get(contract, 0)
+
+    def set_cursor(self, contract: str, timestamp: int):
+        self.cursors[contract] = max(timestamp, self.get_cursor(contract))
+
+
+def get_votes_index_path(chain_id: str) -> Path:
+    return Path(WIZARD_CACHE_FOLDER).expanduser() / "votes" / f"{chain_id}.json"
+
 
 def convert_string_to_vote_type(input: str) -> VoteType:
     input = input.lower()
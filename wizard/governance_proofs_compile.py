@@ -0,0 +1,42 @@
+import sys
+import traceback
+from argparse import ArgumentParser
+from pathlib import Path
+
+from rich import print
+
+from wizard import errors, ux
+from wizard.proofs_index import (compile_proofs_index, get_index_path,
+                                 verify_proofs_index)
+
+
+def main(cli_args: list[str] = sys.argv[1:]):
+    try:
+        _do_main(cli_args)
+    except errors.KnownError as err:
+        ux.show_critical_error(traceback.format_exc())
+        ux.show_critical_error(err.get_pretty())
+        return 1
+
+
+def _do_main(cli_args: list[str]):
+    parser = ArgumentParser()
+    parser.add_argument("--infile", nargs="+", required=True, help="governance proofs file(s), e.g. 'governance_proofs/mainnet/erd1.../1.json'")
+    args = parser.parse_args(cli_args)
+
+    for infile in args.infile:
+        proofs_path = Path(infile).expanduser().resolve()
+        index_path = get_index_path(proofs_path)
+
+        print(f"Compiling [yellow]{proofs_path}[/yellow]...")
+        num_records = compile_proofs_index(proofs_path, index_path)
+
+        print(f"Verifying [yellow]{index_path}[/yellow]...")
+        verify_proofs_index(proofs_path, index_path)
+
+        ux.show_message(f"File saved: {index_path} ({num_records} records)")
+
+
+if __name__ == "__main__":
+    ret = main(sys.argv[1:])
+    sys.exit(ret)
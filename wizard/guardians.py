@@ -12,6 +12,8 @@ from wizard import errors
 
 
 class GuardianData:
+    __slots__ = ("is_guarded", "active_epoch", "active_guardian", "active_service", "pending_epoch", "pending_guardian", "pending_service")
+
     def __init__(self,
                  is_guarded: bool,
                  active_epoch: int,
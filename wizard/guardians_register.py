@@ -43,8 +43,7 @@ def _do_main(cli_args: list[str]):
     ux.show_message("Registering on cosigner service...")
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
 
         print(Rule())
@@ -9,7 +9,7 @@ from rich.prompt import Confirm
 from rich.rule import Rule
 
 from wizard import errors, ux
-from wizard.accounts import AccountWrapper, load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.entrypoint import MyEntrypoint
 from wizard.guardians import AuthApp
@@ -30,20 +30,20 @@ def _do_main(cli_args: list[str]):
     parser.add_argument("--network", choices=CONFIGURATIONS.keys(), required=True, help="network name")
     parser.add_argument("--wallets", required=True, help="path of the wallets configuration file")
     parser.add_argument("--auth", required=True, help="auth registration file")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
     configuration = CONFIGURATIONS[network]
-    entrypoint = MyEntrypoint(configuration)
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     auth_app = AuthApp.new_from_registration_file(Path(args.auth))
 
     accounts_wrappers_by_addresses: dict[str, AccountWrapper] = {
-        item.account.address.to_bech32(): item for item in accounts_wrappers
+        item.address.to_bech32(): item for item in accounts_wrappers
     }
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
     transactions_wrappers: list[TransactionWrapper] = []
 
     ux.show_message("Creating and signing 'set guardian' transactions for all auth registration entries...")
@@ -53,8 +53,7 @@ def _do_main(cli_args: list[str]):
         if not account_wrapper:
             raise errors.UsageError(f"account (wallet) not found for registration entry {entry.get_address()}")
 
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
 
         print(Rule())
@@ -97,7 +96,10 @@ def _do_main(cli_args: list[str]):
         transactions_wrappers.append(TransactionWrapper(transaction, label))
 
     ux.confirm_continuation(f"Ready to set guardians, by sending [green]{len(transactions_wrappers)}[/green] transactions?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle))
+    else:
+        entrypoint.send_multiple(auth_app, transactions_wrappers)
 
 
 if __name__ == "__main__":
@@ -37,8 +37,7 @@ def _do_main(cli_args: list[str]):
     ux.show_message(f"Getting guardians status...")
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
 
         print(address.to_bech32(), f"([yellow]{label}[/yellow])")
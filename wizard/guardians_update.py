@@ -8,7 +8,7 @@ from rich import print
 from rich.rule import Rule
 
 from wizard import errors, ux
-from wizard.accounts import AccountWrapper, load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.entrypoint import MyEntrypoint
 from wizard.guardians import AuthApp
@@ -29,21 +29,21 @@ def _do_main(cli_args: list[str]):
     parser.add_argument("--network", choices=CONFIGURATIONS.keys(), required=True, help="network name")
     parser.add_argument("--wallets", required=True, help="path of the wallets configuration file")
     parser.add_argument("--new-auth", required=True, help="auth registration file")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
     configuration = CONFIGURATIONS[network]
-    entrypoint = MyEntrypoint(configuration)
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    entrypoint = MyEntrypoint(configuration, fan_out=args.fan_out)
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     new_auth_app = AuthApp.new_from_registration_file(Path(args.new_auth))
     empty_auth_app = AuthApp([])
 
     accounts_wrappers_by_addresses: dict[str, AccountWrapper] = {
-        item.account.address.to_bech32(): item for item in accounts_wrappers
+        item.address.to_bech32(): item for item in accounts_wrappers
     }
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
     transactions_wrappers: list[TransactionWrapper] = []
 
     ux.show_message("Creating and signing 'set (update) guardian' transactions for all auth registration entries...")
@@ -53,8 +53,7 @@ def _do_main(cli_args: list[str]):
         if not account_wrapper:
             raise errors.UsageError(f"account (wallet) not found for registration entry {entry.get_address()}")
 
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
 
         print(Rule())
@@ -71,7 +70,10 @@ def _do_main(cli_args: list[str]):
         transactions_wrappers.append(TransactionWrapper(transaction, label))
 
     ux.confirm_continuation(f"Ready to update guardians, by sending [green]{len(transactions_wrappers)}[/green] transactions?")
-    entrypoint.send_multiple(empty_auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(empty_auth_app, transactions_wrappers, Path(args.bundle))
+    else:
+        entrypoint.send_multiple(empty_auth_app, transactions_wrappers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import threading
+
+from wizard.accounts import AccountWrapper
+
+
+class NonceState:
+    __slots__ = ("nonce", "gaps")
+
+    def __init__(self, nonce: int, gaps: list[int]) -> None:
+        self.nonce = nonce
+        self.gaps = gaps
+
+
+# Nonces are allocated taking into account the transactions still in the mempool (e.g. from a previous or a concurrent run).
+# New transactions first take the nonces missing in the mempool (gaps), so that the pending transactions beyond the gaps get unstuck.
+# Then, they take the nonces following the last pending transaction (instead of colliding with the pending ones).
+class NonceManager:
+    def __init__(self) -> None:
+        self._gaps: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def recall(self, wrapper: AccountWrapper, account_nonce: int, pending_nonces: list[int]):
+        address = wrapper.address.to_bech32()
+        pending = sorted(set(nonce for nonce in pending_nonces if nonce >= account_nonce))
+        next_nonce = pending[-1] + 1 if pending else account_nonce
+
+        pending_set = set(pending)
+        gaps = [nonce for nonce in range(account_nonce, next_nonce) if nonce not in pending_set]
+
+        with self._lock:
+            self._gaps[address] = gaps
+
+        wrapper.account.nonce = next_nonce
+
+    def allocate(self, wrapper: AccountWrapper) -> int:
+        with self._lock:
+            gaps = self._gaps.get(wrapper.address.to_bech32())
+            if gaps:
+                return gaps.pop(0)
+
+        return wrapper.account.get_nonce_then_increment()
+
+    def get_gaps(self, address: str) -> list[int]:
+        with self._lock:
+            return list(self._gaps.get(address, []))
+
+    def save_state(self, wrapper: AccountWrapper) -> NonceState:
+        return NonceState(wrapper.account.nonce, self.get_gaps(wrapper.address.to_bech32()))
+
+    def restore_state(self, wrapper: AccountWrapper, state: NonceState):
+        # E.g. a transaction could not be created, thus its nonce is given back (no gap is introduced).
+        with self._lock:
+            self._gaps[wrapper.address.to_bech32()] = list(state.gaps)
+
+        wrapper.account.nonce = state.nonce
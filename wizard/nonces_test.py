@@ -0,0 +1,47 @@
+from multiversx_sdk import Account
+from multiversx_sdk.wallet import UserSecretKey
+
+from wizard.accounts import AccountWrapper
+from wizard.nonces import NonceManager
+
+
+def create_wrapper() -> AccountWrapper:
+    return AccountWrapper("test", Account(UserSecretKey.generate()))
+
+
+def test_recall_without_pending_transactions():
+    manager = NonceManager()
+    wrapper = create_wrapper()
+
+    manager.recall(wrapper, 7, [])
+
+    assert manager.get_gaps(wrapper.address.to_bech32()) == []
+    assert [manager.allocate(wrapper) for _ in range(3)] == [7, 8, 9]
+
+
+def test_recall_fills_gaps_first():
+    manager = NonceManager()
+    wrapper = create_wrapper()
+
+    # Nonce 3 is already processed (stale); 5 and 7 are missing from the mempool.
+    manager.recall(wrapper, 4, [3, 4, 6, 8, 6])
+
+    assert manager.get_gaps(wrapper.address.to_bech32()) == [5, 7]
+    assert wrapper.account.nonce == 9
+    assert [manager.allocate(wrapper) for _ in range(4)] == [5, 7, 9, 10]
+
+
+def test_save_and_restore_state():
+    manager = NonceManager()
+    wrapper = create_wrapper()
+    manager.recall(wrapper, 0, [1, 3])
+
+    state = manager.save_state(wrapper)
+    assert [manager.allocate(wrapper) for _ in range(3)] == [0, 2, 4]
+
+    manager.restore_state(wrapper, state)
+    assert [manager.allocate(wrapper) for _ in range(3)] == [0, 2, 4]
+
+    # The saved state is not altered by allocations.
+    assert state.gaps == [0, 2]
+    assert state.nonce == 4
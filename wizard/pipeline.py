@@ -0,0 +1,140 @@
+import threading
+import time
+from queue import Queue
+from typing import Any, Callable, Iterable, Optional
+
+from rich import print
+
+from wizard.constants import PIPELINE_QUEUE_SIZE
+
+
+class PipelineStage:
+    def __init__(self, name: str, func: Callable[[Any], Any], num_workers: int = 1) -> None:
+        self.name = name
+        self.func = func
+        self.num_workers = num_workers
+
+        self.num_items = 0
+        # Time spent processing items (summed over workers).
+        self.busy_seconds = 0.0
+        # Time spent waiting for room in the queue of the next stage (backpressure).
+        self.blocked_seconds = 0.0
+        self.num_workers_done = 0
+        self.lock = threading.Lock()
+
+
+# Items flow through the stages, each one having its own workers; stages are connected by bounded queues.
+# A slow stage fills its input queue, which, in turn, blocks the previous stages (backpressure).
+class Pipeline:
+    def __init__(self, stages: list[PipelineStage], queue_size: int = PIPELINE_QUEUE_SIZE) -> None:
+        self.stages = stages
+        self.queue_size = queue_size
+        self._error: Optional[BaseException] = None
+        self._aborted = threading.Event()
+
+    def run(self, items: Iterable[Any]) -> list[Any]:
+        queues: list[Queue[Any]] = [Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: list[Any] = []
+        results_lock = threading.Lock()
+        threads: list[threading.Thread] = []
+
+        for index, stage in enumerate(self.stages):
+            input_queue = queues[index]
+            output_queue = queues[index + 1] if index + 1 < len(self.stages) else None
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+            for _ in range(stage.num_workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, input_queue, output_queue, next_stage, results, results_lock),
+                    daemon=True
+                )
+
+                thread.start()
+                threads.append(thread)
+
+        start = time.perf_counter()
+
+        for item in items:
+            if self._aborted.is_set():
+                break
+            queues[0].put(item)
+
+        for _ in range(self.stages[0].num_workers):
+            queues[0].put(_STOP)
+
+        for thread in threads:
+            thread.join()
+
+        self._report(time.perf_counter() - start)
+
+        if self._error is not None:
+            raise self._error
+
+        return results
+
+    def _work(
+        self,
+        stage: PipelineStage,
+        input_queue: Queue[Any],
+        output_queue: Optional[Queue[Any]],
+        next_stage: Optional[PipelineStage],
+        results: list[Any],
+        results_lock: threading.Lock
+    ):
+        while True:
+            item = input_queue.get()
+
+            if item is _STOP:
+                break
+
+            # After a failure, items are drained (not processed), so that no stage remains blocked.
+            if self._aborted.is_set():
+                continue
+
+            try:
+                start = time.perf_counter()
+                output = stage.func(item)
+                busy_seconds = time.perf_counter() - start
+            except BaseException as error:
+                self._abort(error)
+                continue
+
+            start = time.perf_counter()
+
+            if output_queue is None:
+                with results_lock:
+                    results.append(output)
+            elif output is not None:
+                output_queue.put(output)
+
+            blocked_seconds = time.perf_counter() - start
+
+            with stage.lock:
+                stage.num_items += 1
+                stage.busy_seconds += busy_seconds
+                stage.blocked_seconds += blocked_seconds
+
+        # The last worker of a stage to finish signals the end of the stream to the next stage.
+        with stage.lock:
+            stage.num_workers_done += 1
+            is_last_worker = stage.num_workers_done == stage.num_workers
+
+        if is_last_worker and output_queue is not None and next_stage is not None:
+            for _ in range(next_stage.num_workers):
+                output_queue.put(_STOP)
+
+    def _abort(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._aborted.set()
+
+    def _report(self, duration: float):
+        print(f"Pipeline finished in {duration:.1f} seconds:")
+
+        for stage in self.stages:
+            throughput = stage.num_items / duration if duration else 0
+            print(f"\t{stage.name}: {stage.num_items} items ({throughput:.1f} / second), busy {stage.busy_seconds:.1f} s, blocked by backpressure {stage.blocked_seconds:.1f} s (workers = {stage.num_workers})")
+
+
+_STOP = object()
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from wizard.pipeline import Pipeline, PipelineStage
+
+
+def test_run_passes_items_through_stages():
+    pipeline = Pipeline([
+        PipelineStage("double", lambda item: item * 2, 3),
+        PipelineStage("increment", lambda item: item + 1, 2),
+    ], queue_size=2)
+
+    results = pipeline.run(range(100))
+
+    assert sorted(results) == [item * 2 + 1 for item in range(100)]
+    assert [stage.num_items for stage in pipeline.stages] == [100, 100]
+
+
+def test_run_drops_none_outputs():
+    pipeline = Pipeline([
+        PipelineStage("filter", lambda item: item if item % 2 else None),
+        PipelineStage("identity", lambda item: item),
+    ])
+
+    assert sorted(pipeline.run(range(10))) == [1, 3, 5, 7, 9]
+
+
+def test_run_propagates_errors_and_aborts():
+    processed: list[int] = []
+    lock = threading.Lock()
+
+    def fail_on_five(item: int) -> int:
+        if item == 5:
+            raise ValueError("bad item")
+        return item
+
+    def collect(item: int) -> int:
+        with lock:
+            processed.append(item)
+        return item
+
+    pipeline = Pipeline([
+        PipelineStage("fail", fail_on_five),
+        PipelineStage("collect", collect, 2),
+    ], queue_size=1)
+
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run(range(10_000))
+
+    # The stream is not consumed any further, once aborted.
+    assert 5 not in processed
+    assert len(processed) < 100
@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from typing import Any, Callable, Hashable
+
+from rich import print
+
+from wizard.constants import NUM_PARALLEL_PREFETCH_REQUESTS
+from wizard.errors import ProgrammingError
+
+
+class PlannedRead:
+    __slots__ = ("key", "fetch", "dependencies")
+
+    def __init__(self, key: Hashable, fetch: Callable[..., Any], dependencies: tuple[Hashable, ...]) -> None:
+        self.key = key
+        self.fetch = fetch
+        self.dependencies = dependencies
+
+
+# A script declares the reads it needs (e.g. per account), along with their dependencies, then runs the plan.
+# Reads run concurrently, as soon as their dependencies are available.
+# Reads with the same key are declared (and executed) only once. Then, the script consumes the results (a table, by key), sequentially.
+class PrefetchPlan:
+    def __init__(self) -> None:
+        self.reads: dict[Hashable, PlannedRead] = {}
+
+    def add(self, key: Hashable, fetch: Callable[..., Any], dependencies: tuple[Hashable, ...] = ()) -> Hashable:
+        # "fetch" receives the results of the dependencies, in order.
+        if key not in self.reads:
+            self.reads[key] = PlannedRead(key, fetch, dependencies)
+        return key
+
+    def run(self, num_workers: int = NUM_PARALLEL_PREFETCH_REQUESTS) -> dict[Hashable, Any]:
+        start = time.perf_counter()
+        results: dict[Hashable, Any] = {}
+        num_missing_dependencies: dict[Hashable, int] = {}
+        dependents: dict[Hashable, list[PlannedRead]] = {}
+        ready: list[PlannedRead] = []
+
+        for read in self.reads.values():
+            for dependency in read.dependencies:
+                if dependency not in self.reads:
+                    raise ProgrammingError(f"unknown dependency: {dependency}")
+                dependents.setdefault(dependency, []).append(read)
+
+            num_missing_dependencies[read.key] = len(read.dependencies)
+            if not read.dependencies:
+                ready.append(read)
+
+        running: dict[Future[Any], PlannedRead] = {}
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            while ready or running:
+                for read in ready:
+                    # "fetch" receives the results of the dependencies (already available, by construction).
+                    arguments = [results[dependency] for dependency in read.dependencies]
+                    running[executor.submit(read.fetch, *arguments)] = read
+
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    read = running.pop(future)
+
+                    try:
+                        results[read.key] = future.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+                    for dependent in dependents.get(read.key, []):
+                        num_missing_dependencies[dependent.key] -= 1
+                        if num_missing_dependencies[dependent.key] == 0:
+                            ready.append(dependent)
+
+        if len(results) != len(self.reads):
+            raise ProgrammingError("circular dependencies in prefetch plan")
+
+        print(f"Prefetched {len(results)} reads in {time.perf_counter() - start:.1f} seconds.")
+        return results
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from wizard.errors import ProgrammingError
+from wizard.planner import PrefetchPlan
+
+
+def test_run_passes_results_of_dependencies():
+    plan = PrefetchPlan()
+    plan.add("a", lambda: 2)
+    plan.add("b", lambda: 3)
+    plan.add("product", lambda a, b: a * b, ("a", "b"))
+    plan.add("result", lambda product, a: product + a, ("product", "a"))
+
+    assert plan.run(num_workers=4) == {"a": 2, "b": 3, "product": 6, "result": 8}
+
+
+def test_add_deduplicates_by_key():
+    num_calls = 0
+    lock = threading.Lock()
+
+    def fetch():
+        nonlocal num_calls
+        with lock:
+            num_calls += 1
+        return num_calls
+
+    plan = PrefetchPlan()
+
+    for _ in range(5):
+        plan.add("x", fetch)
+
+    assert plan.run() == {"x": 1}
+    assert num_calls == 1
+
+
+def test_run_with_unknown_dependency():
+    plan = PrefetchPlan()
+    plan.add("a", lambda missing: missing, ("missing",))
+
+    with pytest.raises(ProgrammingError):
+        plan.run()
+
+
+def test_run_with_circular_dependencies():
+    plan = PrefetchPlan()
+    plan.add("root", lambda: 1)
+    plan.add("a", lambda b: b, ("b",))
+    plan.add("b", lambda a: a, ("a",))
+
+    with pytest.raises(ProgrammingError):
+        plan.run()
+
+
+def test_run_propagates_errors():
+    def fail():
+        raise ValueError("bad read")
+
+    plan = PrefetchPlan()
+    plan.add("a", fail)
+    plan.add("b", lambda a: a, ("a",))
+
+    with pytest.raises(ValueError, match="bad read"):
+        plan.run()
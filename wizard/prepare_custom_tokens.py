@@ -13,6 +13,7 @@ from wizard.configuration import CONFIGURATIONS
 from wizard.currencies import CurrencyProvider
 from wizard.entrypoint import MyEntrypoint
 from wizard.errors import UsageError
+from wizard.planner import PrefetchPlan
 from wizard.transfers import MyTransfer
 from wizard.utils import format_amount, format_time
 
@@ -54,28 +55,49 @@ def _do_main(cli_args: list[str]):
 
     print(f"After epoch: [yellow]{after_epoch}[/yellow]")
 
+    # All reads are declared (and fetched concurrently) first; then, accounts are handled one by one.
+    # The tokens of an account are only known once fetched, thus the balances are planned in a second step.
+    plan = PrefetchPlan()
+
+    for account_wrapper in accounts_wrappers:
+        address = account_wrapper.address
+        shard = AddressComputer().get_shard_of_address(address)
+
+        plan.add(("epochNonce", shard), lambda shard=shard: entrypoint.get_start_of_epoch_nonce(shard, after_epoch) if after_epoch else 0)
+        plan.add(("tokens", address.to_bech32()), lambda address=address: entrypoint.get_custom_tokens(address, token_identifier))
+
+    results = plan.run()
+    balances_plan = PrefetchPlan()
+
+    for account_wrapper in accounts_wrappers:
+        address = account_wrapper.address
+        after_block_nonce = results[("epochNonce", AddressComputer().get_shard_of_address(address))]
+
+        for token in results[("tokens", address.to_bech32())]:
+            balances_plan.add(
+                ("balance", address.to_bech32(), token.identifier, token.nonce),
+                lambda token=token, address=address, after_block_nonce=after_block_nonce: entrypoint.get_custom_token_balance(token, address, after_block_nonce)
+            )
+
+    results.update(balances_plan.run())
     all_transfers: list[MyTransfer] = []
 
     for account_wrapper in accounts_wrappers:
-        account = account_wrapper.account
-        address = account.address
+        address = account_wrapper.address
         label = account_wrapper.wallet_name
-        shard = AddressComputer().get_shard_of_address(address)
 
         print(address.to_bech32(), f"([yellow]{account_wrapper.wallet_name}[/yellow])")
 
-        after_block_nonce = entrypoint.get_start_of_epoch_nonce(shard, after_epoch) if after_epoch else 0
-        tokens = entrypoint.get_custom_tokens(address, token_identifier)
-
-        for token in tokens:
+        for token in results[("tokens", address.to_bech32())]:
             print(f"\t([yellow]{token.identifier}, {token.nonce}[/yellow])")
 
-            amount = entrypoint.get_custom_token_balance(token, address, after_block_nonce)
+            amount = results[("balance", address.to_bech32(), token.identifier, token.nonce)]
             if amount < threshold:
                 continue
 
             all_transfers.append(MyTransfer(address, label, TokenTransfer(token, amount)))
 
+    currency_provider.prefetch([token_identifier] + [item.token_transfer.token.identifier for item in all_transfers])
     total_amount = sum([item.token_transfer.amount for item in all_transfers])
     ux.show_message(f"Total amount: {format_amount(currency_provider, total_amount, token_identifier)}")
 
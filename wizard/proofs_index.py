@@ -0,0 +1,146 @@
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional
+
+from multiversx_sdk import Address
+
+from wizard.constants import JSON_STREAMING_CHUNK_SIZE
+from wizard.errors import KnownError
+
+# Layout of a compiled index:
+#   header: magic, number of records, size of the source file, SHA-256 of the source file
+#   entries (sorted by public key): public key, offset of the record, length of the record
+#   records: length of "power", "power" (big-endian), proof (raw bytes)
+INDEX_MAGIC = b"MXGPIDX1"
+INDEX_HEADER = struct.Struct(">8sIQ32s")
+INDEX_ENTRY = struct.Struct(">32sQI")
+INDEX_FILE_SUFFIX = ".index"
+
+
+def get_index_path(proofs_file: Path) -> Path:
+    return proofs_file.with_suffix(INDEX_FILE_SUFFIX)
+
+
+def compute_source_hash(proofs_file: Path) -> bytes:
+    hasher = hashlib.sha256()
+
+    with open(proofs_file, "rb") as stream:
+        while chunk := stream.read(JSON_STREAMING_CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.digest()
+
+
+def is_index_up_to_date(index: "ProofsIndex", proofs_file: Path) -> bool:
+    # The size is checked first (cheap); then, the content (an edit could preserve the size).
+    if index.source_size != proofs_file.stat().st_size:
+        return False
+
+    return index.source_hash == compute_source_hash(proofs_file)
+
+
+def compile_proofs_index(proofs_file: Path, index_file: Path) -> int:
+    source = proofs_file.read_bytes()
+    data = json.loads(source)
+    records: list[tuple[bytes, bytes]] = []
+
+    for item in data:
+        pubkey = Address.new_from_bech32(item["address"]).get_public_key()
+        power = int(item["balance"])
+        proof = bytes.fromhex(item["proof"])
+        power_bytes = power.to_bytes((power.bit_length() + 7) // 8, "big")
+        records.append((pubkey, bytes([len(power_bytes)]) + power_bytes + proof))
+
+    records.sort(key=lambda record: record[0])
+
+    for previous, current in zip(records, records[1:]):
+        if previous[0] == current[0]:
+            raise KnownError(f"duplicated address in proofs file: {Address(current[0]).to_bech32()}")
+
+    header = INDEX_HEADER.pack(INDEX_MAGIC, len(records), len(source), hashlib.sha256(source).digest())
+    offset = INDEX_HEADER.size + INDEX_ENTRY.size * len(records)
+    entries: list[bytes] = []
+
+    for pubkey, payload in records:
+        entries.append(INDEX_ENTRY.pack(pubkey, offset, len(payload)))
+        offset += len(payload)
+
+    temporary_file = index_file.with_suffix(index_file.suffix + ".tmp")
+    temporary_file.write_bytes(header + b"".join(entries) + b"".join(payload for _, payload in records))
+    temporary_file.replace(index_file)
+
+    return len(records)
+
+
+def verify_proofs_index(proofs_file: Path, index_file: Path):
+    source = proofs_file.read_bytes()
+    data = json.loads(source)
+
+    with ProofsIndex(index_file) as index:
+        if index.source_hash != hashlib.sha256(source).digest():
+            raise KnownError(f"index does not match the proofs file (hash): {index_file}")
+        if len(index) != len(data):
+            raise KnownError(f"index does not match the proofs file (number of records): {index_file}")
+
+        for item in data:
+            address = Address.new_from_bech32(item["address"])
+            record = index.get(address.get_public_key())
+
+            if record is None:
+                raise KnownError(f"index does not match the proofs file (missing address {item['address']}): {index_file}")
+            if record != (int(item["balance"]), bytes.fromhex(item["proof"])):
+                raise KnownError(f"index does not match the proofs file (bad record for {item['address']}): {index_file}")
+
+
+class ProofsIndex:
+    def __init__(self, index_file: Path) -> None:
+        self._file = open(index_file, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, num_records, source_size, source_hash = INDEX_HEADER.unpack_from(self._buffer, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise KnownError(f"not a governance proofs index: {index_file}")
+
+        self.num_records: int = num_records
+        self.source_size: int = source_size
+        self.source_hash: bytes = source_hash
+
+    def get(self, pubkey: bytes) -> Optional[tuple[int, bytes]]:
+        # Binary search over the (fixed-size) entries; only the matching record is decoded.
+        low, high = 0, self.num_records
+
+        while low < high:
+            middle = (low + high) // 2
+            entry_offset = INDEX_HEADER.size + middle * INDEX_ENTRY.size
+            entry_pubkey = self._buffer[entry_offset:entry_offset + 32]
+
+            if entry_pubkey < pubkey:
+                low = middle + 1
+            elif entry_pubkey > pubkey:
+                high = middle
+            else:
+                _, offset, length = INDEX_ENTRY.unpack_from(self._buffer, entry_offset)
+                payload = self._buffer[offset:offset + length]
+                power_length = payload[0]
+                power = int.from_bytes(payload[1:1 + power_length], "big")
+                proof = payload[1 + power_length:]
+                return power, proof
+
+        return None
+
+    def __len__(self) -> int:
+        return self.num_records
+
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> "ProofsIndex":
+        return self
+
+    def __exit__(self, *args: object):
+        self.close()
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pytest
+from multiversx_sdk import Address
+
+from wizard.errors import KnownError
+from wizard.proofs_index import (ProofsIndex, compile_proofs_index,
+                                 get_index_path, is_index_up_to_date,
+                                 verify_proofs_index)
+
+
+def create_address(index: int) -> str:
+    return Address(bytes([index]) * 32).to_bech32()
+
+
+def write_proofs(proofs_file: Path, items: list[dict[str, str]]):
+    proofs_file.write_text(json.dumps(items))
+
+
+def test_compile_then_lookup(tmp_path: Path):
+    proofs_file = tmp_path / "proofs.json"
+    index_file = get_index_path(proofs_file)
+    items = [{"address": create_address(index), "balance": str(index * 10**18), "proof": f"{index:02x}" * index} for index in range(200, 0, -7)]
+    write_proofs(proofs_file, items)
+
+    assert compile_proofs_index(proofs_file, index_file) == len(items)
+    verify_proofs_index(proofs_file, index_file)
+
+    with ProofsIndex(index_file) as index:
+        assert len(index) == len(items)
+
+        for item in items:
+            pubkey = Address.new_from_bech32(item["address"]).get_public_key()
+            assert index.get(pubkey) == (int(item["balance"]), bytes.fromhex(item["proof"]))
+
+        assert index.get(bytes([255]) * 32) is None
+        assert index.get(bytes([0]) * 32) is None
+
+
+def test_is_index_up_to_date(tmp_path: Path):
+    proofs_file = tmp_path / "proofs.json"
+    index_file = get_index_path(proofs_file)
+    write_proofs(proofs_file, [{"address": create_address(1), "balance": "1000", "proof": "abcd"}])
+    compile_proofs_index(proofs_file, index_file)
+
+    with ProofsIndex(index_file) as index:
+        assert is_index_up_to_date(index, proofs_file)
+
+        # Same size, different content.
+        write_proofs(proofs_file, [{"address": create_address(1), "balance": "2000", "proof": "abcd"}])
+        assert not is_index_up_to_date(index, proofs_file)
+
+        # Different size.
+        write_proofs(proofs_file, [{"address": create_address(1), "balance": "20000", "proof": "abcd"}])
+        assert not is_index_up_to_date(index, proofs_file)
+
+
+def test_compile_with_duplicated_address(tmp_path: Path):
+    proofs_file = tmp_path / "proofs.json"
+    write_proofs(proofs_file, [
+        {"address": create_address(1), "balance": "1", "proof": "00"},
+        {"address": create_address(1), "balance": "2", "proof": "01"},
+    ])
+
+    with pytest.raises(KnownError):
+        compile_proofs_index(proofs_file, get_index_path(proofs_file))
+
+
+def test_open_not_an_index(tmp_path: Path):
+    index_file = tmp_path / "proofs.index"
+    index_file.write_bytes(b"\x00" * 100)
+
+    with pytest.raises(KnownError):
+        ProofsIndex(index_file)
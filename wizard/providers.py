@@ -0,0 +1,322 @@
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+import requests
+import urllib3
+from multiversx_sdk import (ApiNetworkProvider, NetworkProviderConfig,
+                            NetworkProviderError, ProxyNetworkProvider,
+                            Transaction, TransactionComputer)
+from multiversx_sdk.network_providers.http_resources import \
+    transactions_from_send_multiple_response
+from multiversx_sdk.network_providers.shared import \
+    convert_boolean_query_params_to_lowercase
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from wizard.coalescing import REQUEST_COALESCER, get_request_cache_ttl
+from wizard.constants import (HEDGE_READS, HEDGING_NUM_WORKERS,
+                              HTTP_STATUS_SERVER_ERROR,
+                              HTTP_STATUS_TOO_MANY_REQUESTS,
+                              NETWORK_PROVIDER_CONNECTION_POOL_SIZE,
+                              THROTTLING_MAX_NUM_RETRIES)
+from wizard.endpoints import Endpoint, EndpointPool
+from wizard.errors import ProgrammingError
+from wizard.throttling import get_host_controller, parse_retry_after
+from wizard.utils import iterate_json_array_of_bytes
+
+
+# The SDK providers open a new session (thus, a new connection) for each request.
+# Here, connections are kept alive and reused (across threads), so that they can also be warmed up in advance.
+class PooledSessionMixin:
+    url: str
+    config: NetworkProviderConfig
+    endpoints: Optional[EndpointPool] = None
+
+    def _get_session(self) -> requests.Session:
+        session = getattr(self, "_session", None)
+        if session is not None:
+            return session
+
+        with _sessions_lock:
+            session = getattr(self, "_session", None)
+            if session is None:
+                session = self._create_session()
+                self._session = session
+
+        return session
+
+    def _create_session(self) -> requests.Session:
+        retry_strategy = Retry(
+            total=self.config.requests_retry_options.retries,
+            backoff_factor=self.config.requests_retry_options.backoff_factor,
+            status_forcelist=self.config.requests_retry_options.status_forcelist,
+        )
+
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=NETWORK_PROVIDER_CONNECTION_POOL_SIZE,
+            pool_maxsize=NETWORK_PROVIDER_CONNECTION_POOL_SIZE
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Ask for compressed responses, in all the encodings we can decode (e.g. brotli or zstd, if installed).
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return session
+
+    def warm_up(self):
+        # Any response will do, we are only interested in having an open connection in the pool.
+        urls = [endpoint.url for endpoint in self.endpoints.endpoints] if self.endpoints else [self.url]
+
+        for url in urls:
+            try:
+                self._get_session().head(url, **self.config.requests_options)
+            except requests.RequestException:
+                pass
+
+    def use_endpoints(self, urls: list[str]):
+        # With several (equivalent) endpoints, requests fail over, and reads are (optionally) hedged.
+        self.endpoints = EndpointPool(urls) if len(urls) > 1 else None
+
+    def _do_request(self, method: str, url: str, payload: Any = None, stream: bool = False) -> requests.Response:
+        endpoints = self.endpoints
+        if endpoints is None or not url.startswith(self.url):
+            return self._do_throttled_request(method, url, payload, stream)
+
+        path = url[len(self.url):]
+        ordered = endpoints.get_ordered()
+
+        # Streamed responses are not hedged (the losing response would hold its connection until fully read).
+        if method == "GET" and HEDGE_READS and not stream:
+            return self._do_hedged_request(endpoints, ordered, path)
+
+        return self._do_request_with_failover(endpoints, ordered, method, path, payload, stream)
+
+    def _do_hedged_request(self, endpoints: EndpointPool, ordered: list[Endpoint], path: str) -> requests.Response:
+        delay = endpoints.get_hedging_delay()
+        if delay is None:
+            return self._do_request_with_failover(endpoints, ordered, "GET", path)
+
+        executor = _get_hedging_executor()
+        primary = executor.submit(self._do_request_with_failover, endpoints, ordered, "GET", path)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        # The first request is slower than most: a duplicate goes to the next endpoint. The first response wins.
+        endpoints.on_hedged()
+        secondary = executor.submit(self._do_request_with_failover, endpoints, ordered[1:] + ordered[:1], "GET", path)
+        latest_error: Optional[BaseException] = None
+
+        for future in as_completed([primary, secondary]):
+            try:
+                return future.result()
+            except Exception as error:
+                latest_error = error
+
+        assert latest_error is not None
+        raise latest_error
+
+    def _do_request_with_failover(
+        self,
+        endpoints: EndpointPool,
+        ordered: list[Endpoint],
+        method: str,
+        path: str,
+        payload: Any = None,
+        stream: bool = False
+    ) -> requests.Response:
+        response: Optional[requests.Response] = None
+        latest_error: Optional[requests.RequestException] = None
+
+        for endpoint in ordered:
+            start = time.monotonic()
+
+            try:
+                response = self._do_throttled_request(method, endpoint.url + path, payload, stream)
+            except requests.RequestException as error:
+                endpoints.report(endpoint, time.monotonic() - start, False)
+                latest_error = error
+                continue
+
+            is_good = response.status_code < HTTP_STATUS_SERVER_ERROR and response.status_code != HTTP_STATUS_TOO_MANY_REQUESTS
+            endpoints.report(endpoint, time.monotonic() - start, is_good)
+
+            if is_good:
+                return response
+
+        if response is not None:
+            return response
+
+        assert latest_error is not None
+        raise latest_error
+
+    def _do_throttled_request(self, method: str, url: str, payload: Any = None, stream: bool = False) -> requests.Response:
+        # Requests are admitted by the controller of the host (rate & concurrency, see "throttling.py").
+        controller = get_host_controller(url)
+
+        for attempt in range(THROTTLING_MAX_NUM_RETRIES + 1):
+            controller.acquire()
+            start = time.monotonic()
+            is_good = False
+
+            try:
+                response = self._get_session().request(method, url, json=payload, stream=stream, **self.config.requests_options)
+                is_good = response.status_code < HTTP_STATUS_SERVER_ERROR and response.status_code != HTTP_STATUS_TOO_MANY_REQUESTS
+            finally:
+                controller.release(time.monotonic() - start, is_good)
+
+            if response.status_code != HTTP_STATUS_TOO_MANY_REQUESTS or attempt == THROTTLING_MAX_NUM_RETRIES:
+                return response
+
+            controller.on_throttled(parse_retry_after(response.headers.get("Retry-After")), attempt)
+
+        raise ProgrammingError("unreachable")
+
+    def _do_get(self, url: str) -> Any:
+        route = url[len(self.url):].lstrip("/") if url.startswith(self.url) else ""
+        return REQUEST_COALESCER.get(url, lambda: self._do_get_uncoalesced(url), get_request_cache_ttl(route))
+
+    def _do_get_uncoalesced(self, url: str) -> Any:
+        try:
+            response = self._do_request("GET", url)
+            response.raise_for_status()
+            parsed = response.json()
+            return self._get_data(parsed, url)
+        except requests.HTTPError as err:
+            error_data = self._extract_error_from_response(err.response)
+            raise NetworkProviderError(url, error_data)
+        except NetworkProviderError:
+            raise
+        except Exception as err:
+            raise NetworkProviderError(url, err)
+
+    def _do_post(self, url: str, payload: Any) -> Any:
+        try:
+            response = self._do_request("POST", url, payload)
+            response.raise_for_status()
+            parsed = response.json()
+            return self._get_data(parsed, url)
+        except requests.HTTPError as err:
+            error_data = self._extract_error_from_response(err.response)
+            raise NetworkProviderError(url, error_data)
+        except NetworkProviderError:
+            raise
+        except Exception as err:
+            raise NetworkProviderError(url, err)
+
+    if TYPE_CHECKING:
+        # Provided by the network providers of the SDK.
+        def _get_data(self, parsed: Any, url: str) -> Any:
+            ...
+
+        def _extract_error_from_response(self, response: Any) -> Any:
+            ...
+
+
+class MyApiNetworkProvider(PooledSessionMixin, ApiNetworkProvider):
+    def do_get_streamed(self, url: str, url_parameters: Optional[dict[str, Any]] = None) -> Iterator[Any]:
+        # For endpoints returning (large) JSON arrays: elements are decoded one by one, while the response is being received.
+        # Thus, memory stays flat, whatever the page size.
+        url = f"{self.url}/{url}"
+
+        if url_parameters is not None:
+            url_parameters = convert_boolean_query_params_to_lowercase(url_parameters)
+            url = f"{url}?{urllib.parse.urlencode(url_parameters)}"
+
+        try:
+            response = self._do_request("GET", url, stream=True)
+            response.raise_for_status()
+        except requests.HTTPError as err:
+            error_data = self._extract_error_from_response(err.response)
+            raise NetworkProviderError(url, error_data)
+        except Exception as err:
+            raise NetworkProviderError(url, err)
+
+        with response:
+            # Decompress (if necessary) on the fly.
+            response.raw.decode_content = True
+
+            try:
+                yield from iterate_json_array_of_bytes(response.raw)
+            except (requests.RequestException, urllib3.exceptions.HTTPError) as err:
+                raise NetworkProviderError(url, err)
+
+
+class MyProxyNetworkProvider(PooledSessionMixin, ProxyNetworkProvider):
+    def send_transactions_to_all(self, transactions: list[Transaction]) -> tuple[int, list[bytes]]:
+        # The same (signed) transactions are broadcasted through all endpoints (proxies) at once.
+        # A transaction counts as sent as soon as one endpoint accepts it. Slower endpoints complete in the background.
+        if self.endpoints is None:
+            return self.send_transactions(transactions)
+
+        endpoints = self.endpoints
+        transaction_computer = TransactionComputer()
+        hashes = [transaction_computer.compute_transaction_hash(transaction) for transaction in transactions]
+
+        # Duplicates (same hash) are broadcasted only once.
+        unique_hashes: set[bytes] = set()
+        unique_indices: list[int] = []
+
+        for index, transaction_hash in enumerate(hashes):
+            if transaction_hash not in unique_hashes:
+                unique_hashes.add(transaction_hash)
+                unique_indices.append(index)
+
+        payload = [transactions[index].to_dictionary() for index in unique_indices]
+
+        accepted: set[bytes] = set()
+        lock = threading.Lock()
+        all_accepted = threading.Event()
+        start = time.monotonic()
+
+        def send_to(endpoint: Endpoint):
+            url = f"{endpoint.url}/transaction/send-multiple"
+
+            try:
+                response = self._do_throttled_request("POST", url, payload)
+                response.raise_for_status()
+                data = self._get_data(response.json(), url)
+                _, accepted_hashes = transactions_from_send_multiple_response(data.to_dictionary(), len(payload))
+            except Exception as error:
+                endpoints.report_broadcast(endpoint, 0, 0, time.monotonic() - start, str(error))
+                return
+
+            with lock:
+                newly_accepted = set(item for item in accepted_hashes if item) - accepted
+                accepted.update(newly_accepted)
+                if len(accepted) == len(payload):
+                    all_accepted.set()
+
+            endpoints.report_broadcast(endpoint, len(accepted_hashes) - accepted_hashes.count(b""), len(newly_accepted), time.monotonic() - start)
+
+        executor = _get_hedging_executor()
+        futures = [executor.submit(send_to, endpoint) for endpoint in endpoints.endpoints]
+
+        for _ in as_completed(futures):
+            if all_accepted.is_set():
+                break
+
+        with lock:
+            result = [transaction_hash if transaction_hash in accepted else b"" for transaction_hash in hashes]
+
+        return len(result) - result.count(b""), result
+
+
+def _get_hedging_executor() -> ThreadPoolExecutor:
+    global _hedging_executor
+
+    with _sessions_lock:
+        if _hedging_executor is None:
+            _hedging_executor = ThreadPoolExecutor(max_workers=HEDGING_NUM_WORKERS)
+
+        return _hedging_executor
+
+
+_sessions_lock = threading.Lock()
+_hedging_executor: Optional[ThreadPoolExecutor] = None
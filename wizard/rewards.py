@@ -3,6 +3,7 @@ from typing import Any
 
 from multiversx_sdk import Address
 
+from wizard.addresses import address_from_bech32
 from wizard.utils import format_native_amount, format_time
 
 
@@ -14,12 +15,16 @@ class RewardsType(str, Enum):
 
 
 class ClaimableRewards:
+    __slots__ = ("staking_provider", "amount")
+
     def __init__(self, staking_provider: Address, amount: int) -> None:
         self.staking_provider = staking_provider
         self.amount = amount
 
 
 class ReceivedRewards:
+    __slots__ = ("type", "transaction_hash", "timestamp", "amount")
+
     def __init__(self, type: RewardsType, transaction_hash: str, timestamp: int, amount: int) -> None:
         self.type = type
         self.transaction_hash = transaction_hash
@@ -47,6 +52,8 @@ class ReceivedRewards:
 
 
 class ReceivedRewardsOfAccount:
+    __slots__ = ("address", "label", "rewards")
+
     def __init__(self, address: Address, label: str, rewards: list[ReceivedRewards]) -> None:
         self.address = address
         self.label = label
@@ -54,7 +61,7 @@ class ReceivedRewardsOfAccount:
 
     @classmethod
     def new_from_dictionary(cls, data: dict[str, Any]):
-        address = Address.new_from_bech32(data["address"])
+        address = address_from_bech32(data["address"])
         label = data["label"]
         rewards_raw = data["rewards"]
         rewards = [ReceivedRewards.new_from_dictionary(item) for item in rewards_raw]
@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from multiversx_sdk import Account, Address, Message, Transaction
+from multiversx_sdk.wallet import UserSecretKey
+from rich import print
+
+from wizard.accounts import AccountWrapper, IMyAccount
+from wizard.constants import (MIN_NUM_TRANSACTIONS_FOR_PARALLEL_SIGNING,
+                              NUM_PARALLEL_SIGNING_PROCESSES)
+from wizard.errors import ProgrammingError
+from wizard.transactions import TransactionWrapper
+
+
+# Stands in for an account while transactions are being built: controllers call "sign_transaction()" inline,
+# but here the signature is left empty. Signatures are applied afterwards, in bulk, by "sign_transactions()".
+class DeferredSigningAccount:
+    def __init__(self, inner: IMyAccount) -> None:
+        self.inner = inner
+
+    @property
+    def address(self) -> Address:
+        return self.inner.address
+
+    @property
+    def use_hash_signing(self) -> bool:
+        return self.inner.use_hash_signing
+
+    @property
+    def nonce(self) -> int:
+        return self.inner.nonce
+
+    @nonce.setter
+    def nonce(self, value: int):
+        self.inner.nonce = value
+
+    def get_nonce_then_increment(self) -> int:
+        return self.inner.get_nonce_then_increment()
+
+    def sign_transaction(self, transaction: Transaction) -> bytes:
+        return b""
+
+    def sign_message(self, message: Message) -> bytes:
+        return self.inner.sign_message(message)
+
+
+def defer_signing(accounts_wrappers: list[AccountWrapper]):
+    for wrapper in accounts_wrappers:
+        if not isinstance(wrapper.account, DeferredSigningAccount):
+            wrapper.account = DeferredSigningAccount(wrapper.account)
+
+
+def sign_transactions(
+    accounts_wrappers: list[AccountWrapper],
+    transactions_wrappers: list[TransactionWrapper],
+    num_processes: Optional[int] = NUM_PARALLEL_SIGNING_PROCESSES
+):
+    # Signatures are applied inline (on the given transactions).
+    # Transactions are grouped by sender, so that each secret key is passed to a worker process only once.
+    num_processes = num_processes or os.cpu_count() or 1
+    accounts_by_address: dict[str, IMyAccount] = {}
+
+    for wrapper in accounts_wrappers:
+        account = wrapper.account
+        if isinstance(account, DeferredSigningAccount):
+            account = account.inner
+
+        accounts_by_address[wrapper.address.to_bech32()] = account
+
+    indices_by_sender: dict[str, list[int]] = {}
+
+    for index, wrapper in enumerate(transactions_wrappers):
+        sender = wrapper.transaction.sender.to_bech32()
+        if sender not in accounts_by_address:
+            raise ProgrammingError(f"cannot sign transaction, unknown sender: {sender}")
+
+        indices_by_sender.setdefault(sender, []).append(index)
+
+    # Secret keys of regular accounts can be shipped to worker processes.
+    # Others (e.g. Ledger accounts) have to sign on the main process.
+    offloadable_senders: list[str] = []
+    inline_senders: list[str] = []
+
+    for sender in indices_by_sender:
+        if isinstance(accounts_by_address[sender], Account):
+            offloadable_senders.append(sender)
+        else:
+            inline_senders.append(sender)
+
+    tasks: list[tuple[bytes, list[Transaction]]] = []
+
+    for sender in offloadable_senders:
+        account = accounts_by_address[sender]
+        assert isinstance(account, Account)
+        transactions = [transactions_wrappers[index].transaction for index in indices_by_sender[sender]]
+        tasks.append((account.secret_key.get_bytes(), transactions))
+
+    num_offloadable = sum(len(transactions) for _, transactions in tasks)
+
+    if num_processes != 1 and num_offloadable >= MIN_NUM_TRANSACTIONS_FOR_PARALLEL_SIGNING:
+        print(f"Signing {num_offloadable} transactions, using a pool of worker processes...")
+
+        # Worker processes are spawned (not forked): forking while other threads are running (e.g. HTTP pools) could deadlock.
+        with ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(_sign_transactions_of_sender, tasks, chunksize=_get_chunk_size(len(tasks), num_processes)))
+    else:
+        print(f"Signing {num_offloadable} transactions...")
+        results = [_sign_transactions_of_sender(task) for task in tasks]
+
+    for sender, signatures in zip(offloadable_senders, results):
+        for index, signature in zip(indices_by_sender[sender], signatures):
+            transactions_wrappers[index].transaction.signature = signature
+
+    for sender in inline_senders:
+        account = accounts_by_address[sender]
+
+        for index in indices_by_sender[sender]:
+            transaction = transactions_wrappers[index].transaction
+            transaction.signature = account.sign_transaction(transaction)
+
+
+def _sign_transactions_of_sender(task: tuple[bytes, list[Transaction]]) -> list[bytes]:
+    secret_key_bytes, transactions = task
+    account = Account(UserSecretKey(secret_key_bytes))
+    return [account.sign_transaction(transaction) for transaction in transactions]
+
+
+def _get_chunk_size(num_tasks: int, num_processes: int) -> int:
+    # A few chunks per worker, to balance the load without paying the inter-process overhead for each sender.
+    return max(1, num_tasks // (num_processes * 4))
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+from wizard.constants import (THROTTLING_BACKOFF_BASE_IN_SECONDS,
+                              THROTTLING_BACKOFF_MAX_IN_SECONDS,
+                              THROTTLING_DECREASE_COOLDOWN_IN_SECONDS,
+                              THROTTLING_INITIAL_CONCURRENCY,
+                              THROTTLING_INITIAL_RATE,
+                              THROTTLING_LATENCY_TOLERANCE,
+                              THROTTLING_MAX_CONCURRENCY, THROTTLING_MAX_RATE,
+                              THROTTLING_MIN_CONCURRENCY, THROTTLING_MIN_RATE,
+                              THROTTLING_RATE_STEP)
+
+
+# Each host (e.g. API, proxy, a private gateway) gets its own controller, shared by all providers (and threads) talking to it.
+# - A token bucket bounds the rate of requests. On "429 Too Many Requests", the host is paused (honouring "Retry-After"), and the rate is halved.
+# - The concurrency limit is tuned by AIMD: increased by one after a window of good requests, halved on errors or when latency degrades.
+# Then, throughput climbs to what the host allows, and backs off automatically when the host pushes back.
+class HostController:
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.rate = float(THROTTLING_INITIAL_RATE)
+        self.concurrency_limit = THROTTLING_INITIAL_CONCURRENCY
+        self.num_in_flight = 0
+        self.num_throttled = 0
+
+        self._tokens = self.rate
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._baseline_latency: Optional[float] = None
+        self._average_latency: Optional[float] = None
+        self._num_good_in_window = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if self.num_in_flight >= self.concurrency_limit:
+                    # Woken up by "release()".
+                    self._condition.wait()
+                    continue
+
+                if now < self._paused_until:
+                    self._condition.wait(self._paused_until - now)
+                    continue
+
+                if self._tokens < 1:
+                    self._condition.wait((1 - self._tokens) / self.rate)
+                    continue
+
+                self._tokens -= 1
+                self.num_in_flight += 1
+                return
+
+    def release(self, latency: float, is_good: bool):
+        with self._condition:
+            self.num_in_flight -= 1
+
+            if is_good and not self._is_latency_degraded(latency):
+                self._num_good_in_window += 1
+
+                if self._num_good_in_window >= self.concurrency_limit:
+                    self._num_good_in_window = 0
+                    self.concurrency_limit = min(THROTTLING_MAX_CONCURRENCY, self.concurrency_limit + 1)
+                    self.rate = min(THROTTLING_MAX_RATE, self.rate + THROTTLING_RATE_STEP)
+            else:
+                self._decrease()
+
+            self._condition.notify_all()
+
+    def on_throttled(self, retry_after: Optional[float], attempt: int):
+        with self._condition:
+            self.num_throttled += 1
+            pause = retry_after if retry_after is not None else get_backoff_delay(attempt)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0
+            self.rate = max(THROTTLING_MIN_RATE, self.rate / 2)
+            self._decrease()
+
+    def _refill(self, now: float):
+        # The bucket holds (at most) one second worth of tokens.
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _is_latency_degraded(self, latency: float) -> bool:
+        if self._baseline_latency is None or latency < self._baseline_latency:
+            self._baseline_latency = latency
+
+        # Exponentially weighted moving average.
+        self._average_latency = latency if self._average_latency is None else 0.8 * self._average_latency + 0.2 * latency
+        return self._average_latency > self._baseline_latency * THROTTLING_LATENCY_TOLERANCE
+
+    def _decrease(self):
+        # Responses to the requests in flight (issued before the decrease) should not trigger further decreases.
+        now = time.monotonic()
+        if now - self._decreased_at < THROTTLING_DECREASE_COOLDOWN_IN_SECONDS:
+            return
+
+        self._decreased_at = now
+        self._num_good_in_window = 0
+        self.concurrency_limit = max(THROTTLING_MIN_CONCURRENCY, self.concurrency_limit // 2)
+
+
+def get_host_controller(url: str) -> HostController:
+    host = urlparse(url).netloc
+
+    with _controllers_lock:
+        controller = _controllers.get(host)
+        if controller is None:
+            controller = HostController(host)
+            _controllers[host] = controller
+
+        return controller
+
+
+# Exponential backoff, with "full jitter" (so that clients that failed at the same time do not retry at the same time).
+def get_backoff_delay(attempt: int) -> float:
+    ceiling = min(THROTTLING_BACKOFF_MAX_IN_SECONDS, THROTTLING_BACKOFF_BASE_IN_SECONDS * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+# "Retry-After" holds either a number of seconds, or an HTTP date.
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_controllers: dict[str, HostController] = {}
+_controllers_lock = threading.Lock()
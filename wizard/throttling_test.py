@@ -0,0 +1,31 @@
+import time
+from email.utils import formatdate
+
+from wizard.constants import (THROTTLING_BACKOFF_BASE_IN_SECONDS,
+                              THROTTLING_BACKOFF_MAX_IN_SECONDS)
+from wizard.throttling import get_backoff_delay, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("") is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-3") == 0
+
+
+def test_parse_retry_after_with_http_date():
+    in_one_minute = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+    assert in_one_minute is not None
+    assert 55 <= in_one_minute <= 60
+
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0
+
+
+def test_get_backoff_delay_bounds():
+    for attempt in range(12):
+        ceiling = min(THROTTLING_BACKOFF_MAX_IN_SECONDS, THROTTLING_BACKOFF_BASE_IN_SECONDS * 2 ** attempt)
+
+        for _ in range(100):
+            assert 0 <= get_backoff_delay(attempt) <= ceiling
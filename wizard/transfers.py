@@ -4,10 +4,13 @@ from multiversx_sdk import Address, Token, TokenTransfer
 from multiversx_sdk.core.constants import \
     EGLD_IDENTIFIER_FOR_MULTI_ESDTNFT_TRANSFER
 
+from wizard.addresses import address_from_bech32
 from wizard.utils import ICurrencyProvider, format_amount
 
 
 class MyTransfer:
+    __slots__ = ("sender", "label", "token_transfer")
+
     def __init__(self, sender: Address, label: str, token_transfer: TokenTransfer) -> None:
         self.sender = sender
         self.label = label
@@ -15,7 +18,7 @@ class MyTransfer:
 
     @classmethod
     def new_from_dictionary(cls, data: dict[str, Any]):
-        sender = Address.new_from_bech32(data["sender"])
+        sender = address_from_bech32(data["sender"])
         label = data["label"]
         amount = int(data["amount"])
         token_identifier = data.get("tokenIdentifier", EGLD_IDENTIFIER_FOR_MULTI_ESDTNFT_TRANSFER)
@@ -1,7 +1,28 @@
+import io
+import json
+import os
+import tempfile
 from datetime import datetime, timezone
-from typing import Any, Protocol
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, Protocol
 
-from wizard.constants import ONE_QUINTILLION
+from rich import print
+
+from wizard.constants import JSON_STREAMING_CHUNK_SIZE, ONE_QUINTILLION
+from wizard.errors import KnownError
+
+try:
+    # Optional dependency.
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+
+class ISingleValue(Protocol):
+    def encode_top_level(self, writer: io.BytesIO):
+        ...
 
 
 class ICurrencyProvider(Protocol):
@@ -12,9 +33,46 @@ class ICurrencyProvider(Protocol):
         ...
 
 
-def split_to_chunks(items: list[Any], chunk_size: int):
-    for i in range(0, len(items), chunk_size):
-        yield items[i:i + chunk_size]
+# Encodes a single (non-composite) argument of a contract call, bypassing the (generic, thus slower) serializer.
+def encode_top_level(value: ISingleValue) -> bytes:
+    writer = io.BytesIO()
+    value.encode_top_level(writer)
+    return writer.getvalue()
+
+
+# Caches (under the wizard cache folder) are shared by concurrent runs: they are replaced atomically, never left truncated.
+def save_json_cache(file: Path, data: Any):
+    file.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile("w", dir=file.parent, prefix=file.name, suffix=".tmp", delete=False) as temporary_file:
+        try:
+            json.dump(data, temporary_file, indent=4)
+        except BaseException:
+            temporary_file.close()
+            os.remove(temporary_file.name)
+            raise
+
+    os.replace(temporary_file.name, file)
+
+
+# Returns "None" if the cache is missing or unreadable (then, it's simply rebuilt).
+def load_json_cache(file: Path) -> Optional[Any]:
+    if not file.is_file():
+        return None
+
+    try:
+        return json.loads(file.read_text())
+    except (OSError, ValueError) as error:
+        print(f"[yellow]Ignoring unreadable cache[/yellow] {file}: {error}")
+        return None
+
+
+def split_to_chunks(items: Iterable[Any], chunk_size: int) -> Iterator[list[Any]]:
+    # Also works for (lazy) streams of items.
+    iterator = iter(items)
+
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
 
 
 def format_amount(currency_provider: ICurrencyProvider, amount: int, token_identifier: str = "") -> str:
@@ -31,3 +89,73 @@ def format_native_amount(amount: int) -> str:
 def format_time(timestamp: int) -> str:
     time = datetime.fromtimestamp(timestamp, timezone.utc)
     return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Parses the elements of a (top-level) JSON array one by one, without holding the whole document in memory.
+def iterate_json_array_of_bytes(stream: IO[bytes]) -> Iterator[Any]:
+    # If available, "ijson" (with its C backend) decodes faster.
+    if HAS_IJSON:
+        yield from ijson.items(stream, "item", use_float=True)
+        return
+
+    yield from iterate_json_array(io.TextIOWrapper(stream, encoding="utf-8"))
+
+
+def iterate_json_array(stream: IO[str], chunk_size: int = JSON_STREAMING_CHUNK_SIZE) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    is_eof = False
+    is_array_opened = False
+    needs_more = False
+
+    while True:
+        # Skip whitespace and separators.
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+
+        # Ensure there's something to look at. Also, an element ending right at the end of the buffer
+        # might be incomplete (e.g. a number), or might not be decodable yet: we read more in these cases.
+        if position == len(buffer) or needs_more:
+            if is_eof:
+                if position == len(buffer):
+                    raise KnownError("unexpected end of JSON array")
+            else:
+                more = stream.read(chunk_size)
+                is_eof = not more
+                buffer = buffer[position:] + more
+                position = 0
+                needs_more = False
+                continue
+
+        if not is_array_opened:
+            if buffer[position] != "[":
+                raise KnownError("JSON array expected")
+
+            is_array_opened = True
+            position += 1
+            continue
+
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if is_eof:
+                raise KnownError("bad JSON array", error)
+
+            needs_more = True
+            continue
+
+        # A scalar is complete only if followed by a delimiter (e.g. "12." + "5" must not be decoded as "12").
+        if end == len(buffer) or buffer[end] not in " \t\r\n,]":
+            if not is_eof:
+                needs_more = True
+                continue
+
+            if end < len(buffer):
+                raise KnownError(f"bad JSON array, unexpected character: {buffer[end]}")
+
+        yield item
+        position = end
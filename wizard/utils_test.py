@@ -0,0 +1,31 @@
+import io
+import json
+
+import pytest
+
+from wizard.errors import KnownError
+from wizard.utils import iterate_json_array
+
+
+def test_iterate_json_array_at_every_chunk_size():
+    documents = [
+        '["xxxxxxxxxx", 12.5, 7]',
+        '[-2.5]',
+        '[]',
+        ' [ 1 , -0.25e-3 , 1E+2, true, false, null, "a,]\\"b", {"x": [1, 2.5]}, [[]], 12345678901234567890 ] ',
+        '[{"address": "erd1", "balance": "1000", "proof": "abcd"}, {"address": "erd2", "balance": "2000", "proof": "ef01"}]',
+    ]
+
+    for document in documents:
+        expected = json.loads(document)
+
+        for chunk_size in range(1, len(document) + 1):
+            items = list(iterate_json_array(io.StringIO(document), chunk_size))
+            assert items == expected, f"chunk size: {chunk_size}, document: {document}"
+
+
+def test_iterate_json_array_with_bad_input():
+    for document in ['{"a": 1}', '[1, 2', '[12.]', '[1x]']:
+        for chunk_size in range(1, len(document) + 1):
+            with pytest.raises(KnownError):
+                list(iterate_json_array(io.StringIO(document), chunk_size))
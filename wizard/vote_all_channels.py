@@ -0,0 +1,160 @@
+import sys
+import traceback
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from multiversx_sdk import Transaction
+from multiversx_sdk.gas_estimator.errors import GasLimitEstimationError
+from rich import print
+
+from wizard import errors, ux
+from wizard.accounts import AccountWrapper
+from wizard.configuration import CONFIGURATIONS
+from wizard.constants import DEFAULT_GAS_PRICE
+from wizard.entrypoint import MyEntrypoint
+from wizard.governance import (GovernanceRecord, OnChainVote, VotesIndex,
+                               convert_string_to_vote_type,
+                               get_votes_index_path)
+from wizard.guardians import AuthApp
+from wizard.transactions import TransactionWrapper
+from wizard.utils import format_native_amount, format_time
+
+
+def main(cli_args: list[str] = sys.argv[1:]):
+    try:
+        _do_main(cli_args)
+    except errors.KnownError as err:
+        ux.show_critical_error(traceback.format_exc())
+        ux.show_critical_error(err.get_pretty())
+        return 1
+
+
+def _do_main(cli_args: List[str]):
+    parser = ArgumentParser()
+    parser.add_argument("--network", choices=CONFIGURATIONS.keys(), required=True, help="network name")
+    parser.add_argument("--wallets", required=True, help="path to wallets configuration file")
+    parser.add_argument("--auth", required=True, help="auth registration file")
+    parser.add_argument("--gas-price", type=int, default=DEFAULT_GAS_PRICE, help="min gas price")
+    parser.add_argument("--proposal", type=int, required=True, help="proposal nonce / id")
+    parser.add_argument("--vote", choices=["yes", "no", "abstain", "veto"], required=True, help="vote choice")
+    parser.add_argument("--votes-after-time", type=int, default=0, help="when building the votes index for the first time, scan votes after this timestamp")
+
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
+    args = parser.parse_args(cli_args)
+
+    network = args.network
+    configuration = CONFIGURATIONS[network]
+    entrypoint = MyEntrypoint(
+        configuration=configuration,
+        # Only used for direct votes; delegated votes have hard-coded gas limits.
+        use_gas_estimator=True,
+        gas_limit_multiplier=1.1,
+        fan_out=args.fan_out,
+    )
+
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
+    auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
+
+    proposal = args.proposal
+    vote = convert_string_to_vote_type(args.vote)
+    gas_price = args.gas_price
+
+    # Past votes (on all channels) are looked up in the (persisted) votes index, refreshed once.
+    votes_index_path = get_votes_index_path(configuration.chain_id)
+    votes_index = VotesIndex.load(votes_index_path)
+    entrypoint.refresh_votes_index(votes_index, args.votes_after_time)
+    votes_index.save(votes_index_path)
+
+    voting_powers = entrypoint.get_voting_powers([item.address for item in accounts_wrappers])
+    addresses = [item.address.to_bech32() for item in accounts_wrappers]
+    governance_records_for_liquid_staking_contracts: dict[str, dict[str, GovernanceRecord]] = {}
+
+    for contract in configuration.liquid_staking_contracts:
+        proofs_path = Path("governance_proofs") / network / contract / f"{proposal}.json"
+
+        if not proofs_path.is_file():
+            print(f"[yellow]No proofs file for {contract}, skipping this contract: {proofs_path}[/yellow]")
+            continue
+
+        governance_records_for_liquid_staking_contracts[contract] = GovernanceRecord.load_many_for_addresses(proofs_path, addresses)
+
+    ux.confirm_continuation(
+        f"Plan bulk votes (all channels) on proposal [green]{proposal}[/green] with choice [green]{vote.value.upper()}[/green]?"
+    )
+
+    transactions_wrappers: List[TransactionWrapper] = []
+
+    def plan_vote(account_wrapper: AccountWrapper, channel: str, power: int, previous_vote: Optional[OnChainVote], create_transaction: Callable[[], Transaction]):
+        print("\t", f"[blue]{channel}[/blue], voting power", format_native_amount(power))
+
+        if previous_vote:
+            print("\t\t", f"previous vote at {format_time(previous_vote.timestamp)}:", previous_vote.vote_type)
+            print("\t\t", "[red]has already voted![/red]")
+            return
+
+        # Nonces are allocated in sequence (for accounts voting via several channels).
+        # If a transaction cannot be created, its nonce is given back, so that no gaps are introduced.
+        nonce_state = entrypoint.nonce_manager.save_state(account_wrapper)
+
+        try:
+            transaction = create_transaction()
+        except GasLimitEstimationError as error:
+            entrypoint.nonce_manager.restore_state(account_wrapper, nonce_state)
+            print("\t\t", f"[red]{error.error}[/red]")
+            return
+
+        transactions_wrappers.append(TransactionWrapper(transaction, f"{account_wrapper.wallet_name} ({channel})"))
+
+    for account_wrapper in accounts_wrappers:
+        address = account_wrapper.address.to_bech32()
+        voting_power = voting_powers[address]
+
+        print(f"[yellow]{account_wrapper.wallet_name}[/yellow]", address)
+
+        if voting_power.direct_error:
+            print("\t", f"direct: [red]{voting_power.direct_error}[/red]")
+
+        if voting_power.direct:
+            plan_vote(
+                account_wrapper,
+                "direct",
+                voting_power.direct,
+                votes_index.get_vote(address, configuration.system_governance_contract, proposal),
+                lambda: entrypoint.vote_directly(account_wrapper, proposal, vote, gas_price),
+            )
+
+        if voting_power.via_legacy_delegation:
+            plan_vote(
+                account_wrapper,
+                "legacy delegation",
+                voting_power.via_legacy_delegation,
+                votes_index.get_vote(address, configuration.legacy_delegation_contract, proposal),
+                lambda: entrypoint.vote_via_legacy_delegation(account_wrapper, proposal, vote, gas_price),
+            )
+
+        for contract, records_by_addresses in governance_records_for_liquid_staking_contracts.items():
+            record = records_by_addresses.get(address)
+            if not record:
+                continue
+
+            plan_vote(
+                account_wrapper,
+                contract,
+                record.power,
+                votes_index.get_vote(address, contract, proposal),
+                lambda: entrypoint.vote_via_liquid_staking(account_wrapper, contract, proposal, vote, record.power, record.proof, gas_price),
+            )
+
+    ux.confirm_continuation(f"Ready to send [green]{len(transactions_wrappers)}[/green] transaction(s)?")
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
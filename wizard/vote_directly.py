@@ -5,18 +5,16 @@ from pathlib import Path
 from typing import List
 
 from multiversx_sdk import VoteType
-from multiversx_sdk.gas_estimator.errors import GasLimitEstimationError
-from multiversx_sdk.smart_contracts.errors import SmartContractQueryError
 from rich import print
 
 from wizard import errors, ux
-from wizard.accounts import load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DEFAULT_GAS_PRICE
 from wizard.entrypoint import MyEntrypoint
 from wizard.governance import convert_string_to_vote_type
 from wizard.guardians import AuthApp
-from wizard.transactions import TransactionWrapper
+from wizard.signing import defer_signing, sign_transactions
 from wizard.utils import format_time
 
 
@@ -37,7 +35,11 @@ def _do_main(cli_args: List[str]):
     parser.add_argument("--gas-price", type=int, default=DEFAULT_GAS_PRICE, help="min gas price")
     parser.add_argument("--proposal", type=int, required=True, help="proposal nonce / id")
     parser.add_argument("--vote", choices=["yes", "no", "abstain", "veto"], required=True, help="vote choice")
+    parser.add_argument("--votes-after-time", type=int, default=0, help="when building the votes index for the first time, scan votes after this timestamp")
 
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
@@ -46,16 +48,12 @@ def _do_main(cli_args: List[str]):
         configuration=configuration,
         use_gas_estimator=True,
         gas_limit_multiplier=1.1,
+        fan_out=args.fan_out,
     )
 
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
-
-    transactions_wrappers: List[TransactionWrapper] = []
-
     proposal = args.proposal
     vote = convert_string_to_vote_type(args.vote)
     gas_price = args.gas_price
@@ -64,40 +62,59 @@ def _do_main(cli_args: List[str]):
         f"Submit bulk votes on proposal [green]{proposal}[/green] with choice [green]{vote.value.upper()}[/green]?"
     )
 
+    entrypoint.load_votes_index([entrypoint.get_direct_voting_channel()], args.votes_after_time)
+
+    voting_powers = entrypoint.get_voting_powers([item.address for item in accounts_wrappers], via_legacy_delegation=False)
+    voters: List[AccountWrapper] = []
+
     for account_wrapper in accounts_wrappers:
-        address = account_wrapper.account.address
+        address = account_wrapper.address
 
         print(f"[yellow]{account_wrapper.wallet_name}[/yellow]", address.to_bech32())
 
-        try:
-            voting_power = entrypoint.get_direct_voting_power(address)
-            if not voting_power:
-                print(f"\t[red]has no voting power[/red]")
-                continue
-
-            print(f"\t[blue]has voting power[/blue]", voting_power)
-
-            previous_vote = entrypoint.get_direct_vote(address, proposal)
-            if previous_vote:
-                print(f"\tprevious vote at {format_time(previous_vote.timestamp)}:", previous_vote.vote_type)
-                print(f"\t[red]has already voted![/red]")
-                continue
-
-            tx = entrypoint.vote_directly(
-                sender=account_wrapper,
-                proposal=proposal,
-                vote=vote,
-                gas_price=gas_price,
-            )
-
-            transactions_wrappers.append(TransactionWrapper(tx, account_wrapper.wallet_name))
-        except SmartContractQueryError as error:
-            print(f"\t[red]{error}[/red]")
-        except GasLimitEstimationError as error:
-            print(f"\t[red]{error.error}[/red]")
+        voting_power_entry = voting_powers[address.to_bech32()]
+        if voting_power_entry.direct_error:
+            print(f"\t[red]{voting_power_entry.direct_error}[/red]")
+            continue
+
+        voting_power = voting_power_entry.direct
+        if not voting_power:
+            print(f"\t[red]has no voting power[/red]")
+            continue
+
+        print(f"\t[blue]has voting power[/blue]", voting_power)
+
+        previous_vote = entrypoint.get_direct_vote(address, proposal)
+        if previous_vote:
+            print(f"\tprevious vote at {format_time(previous_vote.timestamp)}:", previous_vote.vote_type)
+            print(f"\t[red]has already voted![/red]")
+            continue
+
+        voters.append(account_wrapper)
+
+    # Transactions are built (gas estimated) concurrently, then signed in bulk.
+    defer_signing(accounts_wrappers)
+
+    transactions_wrappers, errors_by_address = entrypoint.create_transactions_concurrently(
+        voters,
+        lambda account_wrapper: entrypoint.vote_directly(
+            sender=account_wrapper,
+            proposal=proposal,
+            vote=vote,
+            gas_price=gas_price,
+        )
+    )
+
+    for address, error in errors_by_address.items():
+        print(f"[red]Cannot vote[/red] ({address}): {error}")
+
+    sign_transactions(accounts_wrappers, transactions_wrappers)
 
     ux.confirm_continuation(f"Ready to send [green]{len(transactions_wrappers)}[/green] transaction(s)?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
     return 0
 
 
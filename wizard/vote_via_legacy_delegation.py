@@ -8,7 +8,7 @@ from multiversx_sdk import VoteType
 from rich import print
 
 from wizard import errors, ux
-from wizard.accounts import load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DEFAULT_GAS_PRICE
 from wizard.entrypoint import MyEntrypoint
@@ -35,7 +35,11 @@ def _do_main(cli_args: List[str]):
     parser.add_argument("--gas-price", type=int, default=DEFAULT_GAS_PRICE, help="min gas price")
     parser.add_argument("--proposal", type=int, required=True, help="proposal nonce / id")
     parser.add_argument("--vote", choices=["yes", "no", "abstain", "veto"], required=True, help="vote choice")
+    parser.add_argument("--votes-after-time", type=int, default=0, help="when building the votes index for the first time, scan votes after this timestamp")
 
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
@@ -44,15 +48,13 @@ def _do_main(cli_args: List[str]):
         configuration=configuration,
         # Gas estimator might not completely work in this context (on-chain governance via proxy contracts).
         use_gas_estimator=False,
+        fan_out=args.fan_out,
     )
 
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
-
-    transactions_wrappers: List[TransactionWrapper] = []
+    voters: List[AccountWrapper] = []
 
     proposal = args.proposal
     vote = convert_string_to_vote_type(args.vote)
@@ -62,12 +64,16 @@ def _do_main(cli_args: List[str]):
         f"Submit bulk votes on proposal [green]{proposal}[/green] with choice [green]{vote.value.upper()}[/green]?"
     )
 
+    entrypoint.load_votes_index([entrypoint.get_legacy_delegation_voting_channel()], args.votes_after_time)
+
+    voting_powers = entrypoint.get_voting_powers([item.address for item in accounts_wrappers], direct=False)
+
     for account_wrapper in accounts_wrappers:
-        address = account_wrapper.account.address
+        address = account_wrapper.address
 
         print(f"[yellow]{account_wrapper.wallet_name}[/yellow]", address.to_bech32())
 
-        voting_power = entrypoint.get_voting_power_via_legacy_delegation(address)
+        voting_power = voting_powers[address.to_bech32()].via_legacy_delegation
         if not voting_power:
             print(f"\t[red]has no voting power[/red]")
             continue
@@ -80,17 +86,16 @@ def _do_main(cli_args: List[str]):
             print(f"\t[red]has already voted![/red]")
             continue
 
-        tx = entrypoint.vote_via_legacy_delegation(
-            sender=account_wrapper,
-            proposal=proposal,
-            vote=vote,
-            gas_price=gas_price,
-        )
+        voters.append(account_wrapper)
 
-        transactions_wrappers.append(TransactionWrapper(tx, account_wrapper.wallet_name))
+    transactions = entrypoint.vote_via_legacy_delegation_many(voters, proposal, vote, gas_price)
+    transactions_wrappers = [TransactionWrapper(transaction, voter.wallet_name) for transaction, voter in zip(transactions, voters)]
 
     ux.confirm_continuation(f"Ready to send [green]{len(transactions_wrappers)}[/green] transaction(s)?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
     return 0
 
 
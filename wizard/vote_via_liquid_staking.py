@@ -8,7 +8,7 @@ from multiversx_sdk import VoteType
 from rich import print
 
 from wizard import errors, ux
-from wizard.accounts import load_accounts
+from wizard.accounts import AccountWrapper
 from wizard.configuration import CONFIGURATIONS
 from wizard.constants import DEFAULT_GAS_PRICE
 from wizard.entrypoint import MyEntrypoint
@@ -36,7 +36,11 @@ def _do_main(cli_args: List[str]):
     parser.add_argument("--contract", required=True, help="contract address")
     parser.add_argument("--proposal", type=int, required=True, help="proposal nonce / id")
     parser.add_argument("--vote", choices=["yes", "no", "abstain", "veto"], required=True, help="vote choice")
+    parser.add_argument("--votes-after-time", type=int, default=0, help="when building the votes index for the first time, scan votes after this timestamp")
 
+    parser.add_argument("--preflight", action="store_true", default=False, help="simulate transactions & check balances before sending; drop the ones that would fail")
+    parser.add_argument("--bundle", help="instead of sending, save the signed transactions into a bundle (see 'broadcast_bundle.py')")
+    parser.add_argument("--fan-out", action="store_true", default=False, help="broadcast through all the configured proxies at once (see README)")
     args = parser.parse_args(cli_args)
 
     network = args.network
@@ -45,9 +49,10 @@ def _do_main(cli_args: List[str]):
         configuration=configuration,
         # Gas estimator might not completely work in this context (on-chain governance via proxy contracts).
         use_gas_estimator=False,
+        fan_out=args.fan_out,
     )
 
-    accounts_wrappers = load_accounts(Path(args.wallets))
+    accounts_wrappers = entrypoint.load_accounts_and_prefetch(Path(args.wallets))
     auth_app = AuthApp.new_from_registration_file(Path(args.auth)) if args.auth else AuthApp([])
 
     contract = args.contract
@@ -56,19 +61,19 @@ def _do_main(cli_args: List[str]):
     gas_price = args.gas_price
 
     proofs_path = Path("governance_proofs") / network / contract / f"{proposal}.json"
-    governance_records_by_adresses = GovernanceRecord.load_many_from_proofs_file(proofs_path)
+    addresses = [item.address.to_bech32() for item in accounts_wrappers]
+    governance_records_by_adresses = GovernanceRecord.load_many_for_addresses(proofs_path, addresses)
 
-    entrypoint.recall_nonces(accounts_wrappers)
-    entrypoint.recall_guardians(accounts_wrappers)
-
-    transactions_wrappers: List[TransactionWrapper] = []
+    votes: List[tuple[AccountWrapper, int, bytes]] = []
 
     ux.confirm_continuation(
         f"Submit bulk votes on proposal [green]{proposal}[/green] with choice [green]{vote.value.upper()}[/green]?"
     )
 
+    entrypoint.load_votes_index([entrypoint.get_liquid_staking_voting_channel(contract)], args.votes_after_time)
+
     for account_wrapper in accounts_wrappers:
-        address = account_wrapper.account.address
+        address = account_wrapper.address
 
         print(f"[yellow]{account_wrapper.wallet_name}[/yellow]", address.to_bech32())
 
@@ -85,20 +90,16 @@ def _do_main(cli_args: List[str]):
             print(f"\t[red]has already voted![/red]")
             continue
 
-        tx = entrypoint.vote_via_liquid_staking(
-            sender=account_wrapper,
-            contract=contract,
-            proposal=proposal,
-            vote=vote,
-            power=record.power,
-            proof=record.proof,
-            gas_price=gas_price,
-        )
+        votes.append((account_wrapper, record.power, record.proof))
 
-        transactions_wrappers.append(TransactionWrapper(tx, account_wrapper.wallet_name))
+    transactions = entrypoint.vote_via_liquid_staking_many(votes, contract, proposal, vote, gas_price)
+    transactions_wrappers = [TransactionWrapper(transaction, voter.wallet_name) for transaction, (voter, _, _) in zip(transactions, votes)]
 
     ux.confirm_continuation(f"Ready to send [green]{len(transactions_wrappers)}[/green] transaction(s)?")
-    entrypoint.send_multiple(auth_app, transactions_wrappers)
+    if args.bundle:
+        entrypoint.save_bundle(auth_app, transactions_wrappers, Path(args.bundle), preflight=args.preflight)
+    else:
+        entrypoint.send_pipelined(auth_app, transactions_wrappers, preflight=args.preflight)
     return 0
 
 
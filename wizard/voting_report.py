@@ -1,16 +1,18 @@
+import json
 import sys
 import traceback
 from argparse import ArgumentParser
 from pathlib import Path
 
-from multiversx_sdk.smart_contracts.errors import SmartContractQueryError
 from rich import print
 
 from wizard import errors, ux
 from wizard.accounts import load_accounts
 from wizard.configuration import CONFIGURATIONS
 from wizard.entrypoint import MyEntrypoint
-from wizard.governance import GovernanceRecord
+from wizard.errors import UsageError
+from wizard.governance import (GovernanceRecord, VotesIndex, VotingReportEntry,
+                               get_votes_index_path)
 from wizard.utils import format_time
 
 
@@ -27,7 +29,9 @@ def _do_main(cli_args: list[str]):
     parser = ArgumentParser()
     parser.add_argument("--network", choices=CONFIGURATIONS.keys(), required=True, help="network name")
     parser.add_argument("--wallets", required=True, help="path of the wallets configuration file")
-    parser.add_argument("--proposal", type=int, required=True, help="proposal nonce / id")
+    parser.add_argument("--proposal", type=int, nargs="+", required=True, help="proposal nonce(s) / id(s)")
+    parser.add_argument("--votes-after-time", type=int, default=0, help="when building the votes index for the first time, scan votes after this timestamp")
+    parser.add_argument("--outfile", help="where to save the report (address x proposal x channel), as JSON")
 
     args = parser.parse_args(cli_args)
 
@@ -35,55 +39,85 @@ def _do_main(cli_args: list[str]):
     configuration = CONFIGURATIONS[network]
     entrypoint = MyEntrypoint(configuration)
     accounts_wrappers = load_accounts(Path(args.wallets))
-    proposal = args.proposal
+    proposals: list[int] = args.proposal
 
-    governance_records_for_liquid_staking_contracts: dict[str, dict[str, GovernanceRecord]] = {}
+    outfile_path = Path(args.outfile).expanduser().resolve() if args.outfile else None
+    if outfile_path and outfile_path.exists():
+        raise UsageError("'output file' should not be an existing file")
 
-    # Load governance records
-    for contract in configuration.liquid_staking_contracts:
-        proofs_path = Path("governance_proofs") / network / contract / f"{proposal}.json"
-        governance_records_for_liquid_staking_contracts[contract] = GovernanceRecord.load_many_from_proofs_file(proofs_path)
+    # Votes are looked up in a (persisted) index, refreshed on each run (once, for all proposals).
+    votes_index_path = get_votes_index_path(configuration.chain_id)
+    votes_index = VotesIndex.load(votes_index_path)
+    entrypoint.refresh_votes_index(votes_index, args.votes_after_time)
+    votes_index.save(votes_index_path)
 
-    for account_wrapper in accounts_wrappers:
-        address = account_wrapper.account.address
+    # Voting power (direct & via legacy delegation) is fetched for all accounts at once (and for all proposals).
+    voting_powers = entrypoint.get_voting_powers([item.address for item in accounts_wrappers])
+
+    # Load governance records (per liquid staking contract, per proposal)
+    governance_records: dict[tuple[str, int], dict[str, GovernanceRecord]] = {}
+    addresses = [item.address.to_bech32() for item in accounts_wrappers]
+
+    for proposal in proposals:
+        for contract in configuration.liquid_staking_contracts:
+            proofs_path = Path("governance_proofs") / network / contract / f"{proposal}.json"
+
+            if not proofs_path.is_file():
+                print(f"[yellow]No proofs file for {contract}, proposal {proposal}: {proofs_path}[/yellow]")
+                continue
 
-        print(f"[yellow]{account_wrapper.wallet_name}[/yellow]", address.to_bech32())
+            governance_records[(contract, proposal)] = GovernanceRecord.load_many_for_addresses(proofs_path, addresses)
 
-        try:
-            direct_voting_power = entrypoint.get_direct_voting_power(address)
-        except SmartContractQueryError:
-            direct_voting_power = 0
+    entries: list[VotingReportEntry] = []
 
-        voting_power_via_legacy_delegation = entrypoint.get_voting_power_via_legacy_delegation(address)
+    for account_wrapper in accounts_wrappers:
+        address = account_wrapper.address.to_bech32()
+        wallet_name = account_wrapper.wallet_name
 
-        previous_direct_vote = entrypoint.get_direct_vote(address, proposal)
-        previous_vote_via_legacy_delegation = entrypoint.get_vote_via_legacy_delegation(address, proposal)
+        print(f"[yellow]{wallet_name}[/yellow]", address)
+
+        # Query errors of the governance contract stand for "no voting power".
+        direct_voting_power = voting_powers[address].direct
+        voting_power_via_legacy_delegation = voting_powers[address].via_legacy_delegation
 
         print("\t", "direct voting power", direct_voting_power)
         print("\t", "voting power via legacy delegation", voting_power_via_legacy_delegation)
 
-        if previous_direct_vote:
-            print("\t", f"previous direct vote on {format_time(previous_direct_vote.timestamp)}:", previous_direct_vote.vote_type)
-        if previous_vote_via_legacy_delegation:
-            print("\t", f"previous delegated vote (legacy delegation) on {format_time(previous_vote_via_legacy_delegation.timestamp)}:", previous_vote_via_legacy_delegation.vote_type)
+        for proposal in proposals:
+            print("\t", f"[blue]proposal {proposal}[/blue]")
 
-        if direct_voting_power and not previous_direct_vote:
-            print("\t", "[red]missing direct vote![/red]")
-        if voting_power_via_legacy_delegation and not previous_vote_via_legacy_delegation:
-            print("\t", "[red]missing delegated vote (legacy delegation)![/red]")
+            account_entries = [
+                VotingReportEntry(address, wallet_name, proposal, "direct", configuration.system_governance_contract, direct_voting_power,
+                                  votes_index.get_vote(address, configuration.system_governance_contract, proposal)),
+                VotingReportEntry(address, wallet_name, proposal, "legacy delegation", configuration.legacy_delegation_contract, voting_power_via_legacy_delegation,
+                                  votes_index.get_vote(address, configuration.legacy_delegation_contract, proposal)),
+            ]
 
-        for contract in configuration.liquid_staking_contracts:
-            record = governance_records_for_liquid_staking_contracts[contract].get(address.to_bech32())
-            previous_vote = entrypoint.get_vote_via_liquid_staking(address, contract, proposal)
+            for contract in configuration.liquid_staking_contracts:
+                records = governance_records.get((contract, proposal), {})
+                record = records.get(address)
+                power = record.power if record else 0
+                account_entries.append(VotingReportEntry(address, wallet_name, proposal, contract, contract, power, votes_index.get_vote(address, contract, proposal)))
+
+            for entry in account_entries:
+                if entry.power and entry.channel == entry.contract:
+                    print("\t\t", f"voting power via {entry.contract}", entry.power)
+
+                if entry.vote:
+                    print("\t\t", f"previous vote ({entry.channel}) on {format_time(entry.vote.timestamp)}:", entry.vote.vote_type)
+
+                if entry.is_vote_missing():
+                    print("\t\t", f"[red]missing vote ({entry.channel})![/red]")
 
-            if record:
-                print("\t", f"voting power via {contract}", record.power)
+            entries.extend(account_entries)
 
-            if previous_vote:
-                print("\t", f"previous delegated vote ({contract}) on {format_time(previous_vote.timestamp)}:", previous_vote.vote_type)
+    num_missing_votes = sum(1 for entry in entries if entry.is_vote_missing())
+    print(f"Missing votes: [red]{num_missing_votes}[/red]")
 
-            if record and not previous_vote:
-                print("\t", f"[red]missing delegated vote ({contract})![/red]")
+    if outfile_path:
+        outfile_path.parent.mkdir(parents=True, exist_ok=True)
+        outfile_path.write_text(json.dumps([entry.to_dictionary() for entry in entries], indent=4))
+        ux.show_message(f"File saved: {outfile_path}")
 
 
 if __name__ == "__main__":